@@ -0,0 +1,134 @@
+"""
+压缩存储 (storage_codec.py) 的对比：对每种压缩方式和级别，测量
+- 词库库文件 (词库 目录中的全部文件)：总大小、压缩写入耗时、边解压边解析的耗时 (解析缓存未命中)
+  和导入耗时 (解析缓存命中，只需计算文件摘要)；
+- 进度快照 (7-SAT，按比例设置学习状态)：大小、写入耗时 (VocabModel._write_snapshot) 和启动时的加载耗时。
+同时检查每种方式解析出的词条和加载的进度与未压缩时一致。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_compression.py [已学习比例，默认 0.3]
+测试在临时目录中进行，不会改动 data 目录。
+"""
+import contextlib, csv, io, os, random, shutil, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import storage_codec  # noqa: E402
+from vocab_model import VocabModel, _file_digest  # noqa: E402
+
+# (压缩方式, 级别)
+CONFIGS = [("none", None), ("gzip", 1), ("gzip", 6), ("gzip", 9), ("bz2", 9), ("lzma", 0), ("lzma", 1),
+           ("lzma", 6)]
+PROGRESS_WORDLIST = "7-SAT-顺序.json"
+REPEAT = 5
+
+
+def best_of(fn):
+    """重复执行 fn，返回最短耗时 (毫秒)。"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def quiet(fn, *args, **kwargs):
+    """运行 fn 时不输出 print 的内容。"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def entries_of(words):
+    return [(w.word, w.definition, w.pos, w.example) for w in words]
+
+
+def states_of(words):
+    return [(w.stage, w.attempts, w.flags) for w in words]
+
+
+def bench_wordlists(model, names, codec, level):
+    """返回 (总字节数, 写入 ms, 解析 ms, 导入 ms, 解析出的词条)。"""
+    size = write = parse = load = 0
+    parsed = {}
+    for name in names:
+        src = os.path.join(ROOT, "词库", name)
+        path = os.path.join("data", "library", name)
+        write += best_of(lambda: storage_codec.compress_file(src, path, codec, level))
+        size += os.path.getsize(path)
+        kind = "json" if name.endswith(".json") else "csv"
+
+        def parse_file():
+            # 与 VocabModel._parse_wordlist_file 在解析缓存未命中时相同
+            if kind == "json":
+                with storage_codec.open_text(path) as f:
+                    return model._parse_json_stream(f)
+            with storage_codec.open_text(path, newline="") as f:
+                return model._parse_csv_rows(csv.reader(f))
+
+        parse += best_of(parse_file)
+        parsed[name] = entries_of(parse_file())
+        model.cache_parsed_wordlist(path, parsed[name], name)
+        load += best_of(lambda: quiet(model._parse_wordlist_file, path, kind, _file_digest(path)))
+    return size, write, parse, load, parsed
+
+
+def bench_progress(ratio, codec, level):
+    """返回 (快照字节数, 写入 ms, 加载 ms, 加载的状态)。"""
+    model = VocabModel()
+    model.settings.update(async_save=False, progress_codec=codec)
+    quiet(model.load_words_from_json, os.path.join(ROOT, "词库", PROGRESS_WORDLIST))
+    rng = random.Random(0)
+    for w in rng.sample(model.words, int(len(model.words) * ratio)):
+        w.stage = rng.randint(1, 4)
+        w.attempts = rng.randint(1, 12)
+        w.learned = w.stage == 4
+        w.due = 1_700_000_000 + rng.randrange(10 ** 7) if w.learned else 0
+    default_level = storage_codec.LEVELS.get(codec)
+    if level is not None:
+        storage_codec.LEVELS[codec] = level
+    try:
+        write = best_of(lambda: model._write_snapshot(model.progress_path))
+    finally:
+        if default_level is not None:
+            storage_codec.LEVELS[codec] = default_level
+    load = best_of(lambda: quiet(VocabModel().load_progress))
+    loaded = quiet(VocabModel().load_progress)
+    assert states_of(loaded) == states_of(model.words), "加载的进度与保存的不一致"
+    return os.path.getsize(model.progress_path), write, load
+
+
+def main():
+    ratio = float(sys.argv[1]) if len(sys.argv) > 1 else 0.3
+    names = sorted(os.listdir(os.path.join(ROOT, "词库")))
+    workdir = tempfile.mkdtemp(prefix="learnword-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    os.makedirs(os.path.join("data", "library"))
+    try:
+        model = VocabModel()
+        rows = []
+        expected = None
+        for codec, level in CONFIGS:
+            size, write, parse, load, parsed = bench_wordlists(model, names, codec, level)
+            if expected is None:
+                expected = parsed
+            assert parsed == expected, f"{codec} 解析出的词条与未压缩时不一致"
+            progress = bench_progress(ratio, codec, level)
+            rows.append((codec if level is None else f"{codec}-{level}", size, write, parse, load) + progress)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    base = rows[0]
+    print(f"词库: {len(names)} 个文件；进度快照: {PROGRESS_WORDLIST}，已设置学习状态的单词比例 {ratio:.0%}；"
+          f"每项取 {REPEAT} 次中的最短耗时")
+    print(f"{'压缩方式':<10}{'词库 KB':>10}{'比例':>7}{'写入 ms':>9}{'解析 ms':>9}{'导入 ms':>9}"
+          f"{'快照 KB':>9}{'比例':>7}{'写入 ms':>9}{'加载 ms':>9}")
+    for name, size, write, parse, load, psize, pwrite, pload in rows:
+        print(f"{name:<10}{size / 1024:>10.0f}{size / base[1]:>7.0%}{write:>9.1f}{parse:>9.1f}{load:>9.1f}"
+              f"{psize / 1024:>9.1f}{psize / base[5]:>7.0%}{pwrite:>9.1f}{pload:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+词库增量更新 (wordlist_patch.py、library.install 的补丁路径、VocabModel.update_wordlist) 的测试：
+用本地 HTTP 服务器提供词库、更新清单中发布的版本号和补丁，模拟上游两次修订词库 (删除、修改、新增、移动词条)，检查
+- 落后两个版本的本地词库依次应用两个补丁完成更新，只下载补丁，结果与新版本文件解析出的词条一致；
+- 当前词库的学习进度按单词 id 保留 (删除的单词丢弃，新增的单词为默认状态)，重新启动后进度依然正确；
+- 更新后导入新版本时直接命中解析缓存；补丁损坏时退回完整下载。
+并与完整下载 + 解析新版本对比下载量和耗时。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_delta.py [每个版本修改的词条数，默认 200] [每个连接的限速 KB/s，默认 2048]
+测试在临时目录中进行，不会改动 data 目录。
+"""
+import contextlib, hashlib, io, json, os, random, shutil, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import library  # noqa: E402
+import storage_codec  # noqa: E402
+import wordlist_cache  # noqa: E402
+from downloader import file_sha256  # noqa: E402
+from vocab_model import VocabModel, assign_word_ids  # noqa: E402
+from local_server import start_server  # noqa: E402
+
+NAME = "7-SAT-顺序.json"
+
+
+def quiet(fn, *args, **kwargs):
+    """运行 fn 时不输出 print 的内容。"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def revise(items, edits, rng):
+    """模拟上游修订词库：删除、修改、新增和移动约 edits 个元素。"""
+    items = list(items)
+    for _ in range(edits // 4):
+        items.pop(rng.randrange(len(items)))
+    for _ in range(edits // 4):
+        i = rng.randrange(len(items))
+        items[i] = dict(items[i], translations=[{"translation": f"修订释义 {rng.random():.6f}", "type": "n"}])
+    for _ in range(edits // 4):
+        items.insert(rng.randrange(len(items)), {"word": f"newword{rng.randrange(10 ** 9)}",
+                                                  "translations": [{"translation": "新增单词", "type": "adj"}]})
+    for _ in range(edits // 4):
+        items.insert(rng.randrange(len(items)), items.pop(rng.randrange(len(items))))
+    return items
+
+
+def entries_of(words):
+    return [(w.word, w.definition, w.pos, w.example) for w in words]
+
+
+def states_by_id(model):
+    ids = model.dictionary.ids
+    return {wid: (w.stage, w.attempts, w.flags, w.due) for wid, w in zip(ids, model.words)
+            if w.stage != 1 or w.attempts or w.flags or w.due}
+
+
+def main():
+    edits = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rate = int(sys.argv[2]) * 1024 if len(sys.argv) > 2 else 2048 * 1024
+    rng = random.Random(2024)
+    tmp = tempfile.mkdtemp(prefix="learnword-bench-")
+    remote = os.path.join(tmp, "remote")
+    os.makedirs(remote)
+    remote_path = os.path.join(remote, NAME)
+    manifest_path = os.path.join(remote, "update_manifest.json")
+    shutil.copy(os.path.join(ROOT, "词库", NAME), remote_path)
+    shutil.copy(os.path.join(ROOT, "update_manifest.json"), manifest_path)
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    server = start_server(remote, rate)
+    base_url = server.url("")
+
+    def published():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return library.catalog_entries(json.load(f)["wordlists"])[NAME]
+
+    try:
+        # 版本 1：同步到本地词库库，导入并学习一部分单词
+        quiet(library.publish, remote, manifest_path)
+        model = VocabModel()
+        model.settings["async_save"] = False
+        assert quiet(library.install, model, NAME, published(), base_url) == "downloaded"
+        quiet(model.load_words_from_json, library.library_path(NAME))
+        for i, w in enumerate(model.words):
+            if i % 5 == 0:
+                w.stage, w.attempts, w.learned, w.due = 4, i % 7 + 1, True, 1_700_000_000 + i
+        quiet(model.save_progress)
+        before = states_by_id(model)
+        print(f"{NAME}: {len(model.words)} 个单词，已学习 {len(before)} 个，每个连接限速 {rate // 1024} KB/s")
+
+        # 上游发布版本 2、3，每个版本一个补丁
+        publisher = VocabModel()
+        old_path = os.path.join(tmp, "old.json")
+        for _ in range(2):
+            shutil.copy(remote_path, old_path)
+            with open(old_path, "r", encoding="utf-8") as f:
+                items = revise(json.load(f), edits, rng)
+            with open(remote_path, "w", encoding="utf-8") as f:
+                json.dump(items, f, ensure_ascii=False, separators=(",", ":"))
+            patch = quiet(library.publish_patch, publisher, old_path, remote_path, manifest_path)
+            print(f"发布 v{patch['to']['version']}: 删除或移动 {len(patch['removed'])}，修改 {len(patch['changed'])}，"
+                  f"新增或移动 {len(patch['added'])}")
+        info = published()
+        patch_bytes = sum(p["size"] for p in info["patches"])
+        expected = entries_of(quiet(publisher.parse_wordlist_file, remote_path, NAME))
+
+        # 对比：完整下载并解析新版本 (空的解析缓存)
+        library.LIBRARY_DIR, wordlist_cache.CACHE_DIR = os.path.join("data", "full"), os.path.join("data", "cache_full")
+        sent = server.stats["bytes"]
+        start = time.perf_counter()
+        assert quiet(library.install, VocabModel(), NAME, info, base_url) == "downloaded"
+        full_time = time.perf_counter() - start
+        full_bytes = server.stats["bytes"] - sent
+        library.LIBRARY_DIR, wordlist_cache.CACHE_DIR = os.path.join("data", "library"), os.path.join("data", "cache")
+
+        # 增量更新：v1 -> v2 -> v3
+        sent = server.stats["bytes"]
+        start = time.perf_counter()
+        result = quiet(library.install, model, NAME, info, base_url)
+        patch_time = time.perf_counter() - start
+        assert result == "patched", result
+        assert server.stats["bytes"] - sent == patch_bytes
+        print(f"完整下载 + 解析: {full_bytes / 1024:.0f} KB，{full_time * 1000:.0f} ms")
+        print(f"增量更新 (2 个补丁): {patch_bytes / 1024:.1f} KB，{patch_time * 1000:.0f} ms")
+
+        # 更新后的文件按解析规则与新版本一致 (清空缓存重新解析)，导入时直接命中解析缓存
+        path = library.library_path(NAME)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            start = time.perf_counter()
+            model.update_wordlist(path)
+            update_time = time.perf_counter() - start
+        assert "词库缓存命中" in output.getvalue(), output.getvalue()
+        assert entries_of(model.words) == expected
+        shutil.rmtree(wordlist_cache.CACHE_DIR)
+        assert entries_of(quiet(VocabModel().parse_wordlist_file, path, NAME)) == expected
+        print(f"当前词库更新到新版本 (保留进度): {update_time * 1000:.0f} ms")
+
+        # 学习进度：仍然存在的单词保留状态，删除的丢弃，新增的为默认状态
+        after = states_by_id(model)
+        new_ids = set(assign_word_ids(e[0] for e in expected))
+        assert after == {wid: s for wid, s in before.items() if wid in new_ids}
+        print(f"学习进度: 保留 {len(after)} 个，随删除的单词丢弃 {len(before) - len(after)} 个")
+        quiet(model.save_progress)
+        reloaded = VocabModel()
+        assert quiet(reloaded.load_all_data, allow_network=False) and reloaded.startup_source == "progress"
+        assert entries_of(reloaded.words) == expected and states_by_id(reloaded) == after
+        print("重新启动后: 词库和学习进度一致")
+
+        # 已是最新版本：不访问网络；补丁损坏：退回完整下载
+        requests_before = server.stats["requests"]
+        assert quiet(library.install, model, NAME, info, base_url) == "unchanged"
+        assert server.stats["requests"] == requests_before
+        shutil.copy(remote_path, old_path)
+        with open(old_path, "r", encoding="utf-8") as f:
+            items = revise(json.load(f), edits, rng)
+        with open(remote_path, "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False, separators=(",", ":"))
+        quiet(library.publish_patch, publisher, old_path, remote_path, manifest_path)
+        info = published()
+        with open(os.path.join(remote, info["patches"][-1]["file"]), "ab") as f:
+            f.write(b" ")
+        result = quiet(library.install, model, NAME, info, base_url)
+        with open(path, "rb") as f:
+            stored = hashlib.sha256(storage_codec.decompress(f.read())).hexdigest()
+        assert result == "downloaded" and stored == file_sha256(remote_path), result
+        assert library.load_manifest()[NAME]["version"] == info["version"]
+        print(f"补丁损坏: 退回完整下载 ({result})")
+    finally:
+        server.shutdown()
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+词库下载 (downloader.py) 的基准测试：在本地启动一个 HTTP 服务器代替 GitHub，比较
+旧的整体下载 (requests.get -> response.text -> load_words_from_json_content) 和
+流式下载到临时文件再流式导入 (download_to_file -> load_words_from_download) 的耗时与峰值内存，
+并检查两者导入的单词一致、进度回调正常、限速下载中途取消能及时停止并删除临时文件。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_download.py [词库文件名，默认 7-SAT-顺序.json] [取消测试的限速 KB/s，默认 256]
+测试在临时目录中进行，不会改动 data 目录。
+"""
+import os, shutil, sys, tempfile, threading, time, tracemalloc
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+from downloader import download_to_file, DownloadCancelled, CHUNK_SIZE  # noqa: E402
+from vocab_model import VocabModel  # noqa: E402
+from local_server import start_server  # noqa: E402
+
+
+def measure(fn):
+    """返回 (结果, 耗时秒, 峰值内存 MB)。"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "7-SAT-顺序.json"
+    rate = int(sys.argv[2]) * 1024 if len(sys.argv) > 2 else 256 * 1024
+    directory = os.path.join(ROOT, "词库")
+    size = os.path.getsize(os.path.join(directory, filename))
+
+    tmp = tempfile.mkdtemp(prefix="learnword-bench-")
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    server = start_server(directory)
+    url = server.url(quote(filename))
+    try:
+        print(f"词库: {filename} ({size / 1024:.0f} KB)")
+
+        def whole():
+            model = VocabModel()
+            response = requests.get(url, timeout=15)
+            response.raise_for_status()
+            return model.load_words_from_json_content(response.text)
+
+        updates = []
+
+        def streamed():
+            model = VocabModel()
+            path = download_to_file(url, progress=lambda received, total: updates.append((received, total)))
+            return model.load_words_from_download(path, filename)
+
+        # 两种方式各运行两次：第一次解析词库，第二次命中解析缓存
+        for label, fn in (("整体下载", whole), ("流式下载", streamed)):
+            for run in ("首次", "缓存命中"):
+                if run == "首次":
+                    shutil.rmtree(os.path.join("data", "cache"), ignore_errors=True)
+                words, elapsed, peak = measure(fn)
+                print(f"{label} ({run}): {len(words)} 个单词，用时 {elapsed * 1000:.0f} ms，峰值内存 {peak:.1f} MB")
+
+        expected = [(w.word, w.definition, w.pos) for w in VocabModel().load_words_from_json(os.path.join(directory, filename))]
+        assert [(w.word, w.definition, w.pos) for w in words] == expected, "流式导入的单词与直接导入不一致"
+        assert updates[-1] == (size, size), f"进度回调的最终值不正确: {updates[-1]}"
+        print(f"进度回调: 每次下载 {len(updates) // 2} 次 (每块 {CHUNK_SIZE // 1024} KB)，导入结果一致")
+        leftovers = [n for n in os.listdir("data") if n.endswith(".part")]
+        assert not leftovers, f"临时文件未清理: {leftovers}"
+
+        # 限速下载，接收到约四分之一后取消
+        slow = start_server(directory, rate)
+        slow_url = slow.url(quote(filename))
+        cancel = threading.Event()
+        cancelled_at = []
+
+        def progress(received, total):
+            if received >= size // 4 and not cancel.is_set():
+                cancel.set()
+                cancelled_at.append(time.perf_counter())
+
+        try:
+            download_to_file(slow_url, progress=progress, cancel_event=cancel)
+            raise AssertionError("取消后下载仍然完成")
+        except DownloadCancelled:
+            stopped = (time.perf_counter() - cancelled_at[0]) * 1000
+        finally:
+            slow.shutdown()
+        leftovers = [n for n in os.listdir("data") if n.endswith(".part")]
+        assert not leftovers, f"取消后临时文件未清理: {leftovers}"
+        print(f"取消 (限速 {rate // 1024} KB/s): 取消后 {stopped:.0f} ms 停止，临时文件已删除")
+    finally:
+        server.shutdown()
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+共享网络层 (http_client.py) 的测试：用本地 HTTP 服务器代替 GitHub，模拟多次启动程序时获取
+update_manifest.json 和 announcement.json，检查
+- 首次启动完整下载，再次启动时不再完整下载 (公告缓存未过期不访问网络，更新清单由 304 重新验证)；
+- 远程文件变化后重新下载；服务器不可用时使用缓存的旧内容；
+- 共享连接池下多次请求复用连接 (与每次直接 requests.get 对比连接数和耗时)。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_http_cache.py [连续请求次数，默认 50]
+测试在临时目录中进行，不会改动 data 目录。
+"""
+import json, os, shutil, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+import http_client  # noqa: E402
+from local_server import start_server  # noqa: E402
+
+FILES = ("update_manifest.json", "announcement.json")
+
+
+def launch(server):
+    """模拟一次启动：重置连接池和统计，按程序中的方式获取更新清单和公告，返回 (统计, 服务器收到的请求数)。"""
+    http_client._session = None
+    for key in http_client.stats:
+        http_client.stats[key] = 0
+    before = server.stats["requests"]
+    manifest = http_client.fetch(server.url("update_manifest.json"), timeout=5)
+    announcement = http_client.fetch(server.url("announcement.json"), max_age=http_client.ANNOUNCEMENT_MAX_AGE, timeout=5)
+    manifest.json(), announcement.json()
+    return dict(http_client.stats), server.stats["requests"] - before
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    tmp = tempfile.mkdtemp(prefix="learnword-bench-")
+    remote = os.path.join(tmp, "remote")
+    os.makedirs(remote)
+    for name in FILES:
+        shutil.copy(os.path.join(ROOT, name), remote)
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    server = start_server(remote)
+    try:
+        stats, requests_sent = launch(server)
+        print(f"首次启动: {stats}，服务器收到 {requests_sent} 个请求")
+        assert stats["full"] == 2
+
+        stats, requests_sent = launch(server)
+        print(f"再次启动: {stats}，服务器收到 {requests_sent} 个请求")
+        assert stats["full"] == 0 and stats["not_modified"] == 1 and stats["fresh"] == 1
+
+        # 公告缓存过期后：两者都只发送条件请求
+        http_client_meta = [p for p in os.listdir(http_client.CACHE_DIR) if p.endswith(".json")]
+        for name in http_client_meta:
+            path = os.path.join(http_client.CACHE_DIR, name)
+            with open(path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["fetched"] -= http_client.ANNOUNCEMENT_MAX_AGE
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        stats, requests_sent = launch(server)
+        print(f"缓存过期后启动: {stats}，服务器收到 {requests_sent} 个请求")
+        assert stats["full"] == 0 and stats["not_modified"] == 2
+
+        # 远程更新清单发生变化：重新下载并更新缓存
+        path = os.path.join(remote, "update_manifest.json")
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["_bench"] = time.time()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        stats, _ = launch(server)
+        print(f"清单更新后启动: {stats}")
+        assert stats["full"] == 1
+        assert http_client.fetch(server.url("update_manifest.json")).json() == manifest
+
+        # 连接复用：连续请求同一文件
+        for label, get in (("requests.get", lambda url: requests.get(url, timeout=5).content),
+                           ("共享连接池", lambda url: http_client.get_session().get(url, timeout=5).content)):
+            connections = server.stats["connections"]
+            start = time.perf_counter()
+            for _ in range(repeat):
+                get(server.url("update_manifest.json"))
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            print(f"{label}: {repeat} 次请求建立 {server.stats['connections'] - connections} 个连接，"
+                  f"平均 {elapsed:.2f} ms/次")
+
+        # 服务器不可用：使用缓存的内容
+        server.shutdown()
+        server.server_close()
+        stats, _ = launch(server)
+        print(f"离线启动: {stats}")
+        assert stats["offline"] == 1 and stats["fresh"] == 1
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
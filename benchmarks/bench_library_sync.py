@@ -0,0 +1,93 @@
+"""
+本地词库库 (library.py) 的基准测试：用本地 HTTP 服务器 (按连接限速，模拟网络带宽) 提供 词库 目录中的文件，
+比较逐个下载 (1 个线程) 与并发同步 (library.SYNC_WORKERS 个线程) 的耗时和建立的连接数，检查
+- 再次同步时所有文件都由条件请求确认未变化 (304)，不重新下载；
+- 内容损坏的文件校验失败，不会进入词库库；
+- 同步后切换词库只读取本地文件 (与直接下载导入的耗时对比)。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_library_sync.py [每个连接的限速 KB/s，默认 2048]
+测试在临时目录中进行，不会改动 data 目录。
+"""
+import contextlib, io, os, shutil, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import http_client  # noqa: E402
+import library  # noqa: E402
+from downloader import download_to_file, file_sha256  # noqa: E402
+from vocab_model import VocabModel  # noqa: E402
+from local_server import start_server  # noqa: E402
+
+
+def quiet(fn, *args, **kwargs):
+    """运行 fn 时不输出 print 的内容。"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def main():
+    rate = int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 2048 * 1024
+    tmp = tempfile.mkdtemp(prefix="learnword-bench-")
+    remote = os.path.join(tmp, "remote")
+    shutil.copytree(os.path.join(ROOT, "词库"), remote)
+    names = sorted(os.listdir(remote))
+    with open(os.path.join(remote, "损坏.json"), "w", encoding="utf-8") as f:
+        f.write('[{"word": "broken", "translations": [')
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    server = start_server(remote, rate)
+    base_url = server.url("")
+    try:
+        total = sum(os.path.getsize(os.path.join(remote, n)) for n in names)
+        print(f"词库: {len(names)} 个文件，共 {total / 1024 / 1024:.1f} MB，每个连接限速 {rate // 1024} KB/s")
+        model = VocabModel()
+
+        for workers in (1, library.SYNC_WORKERS):
+            shutil.rmtree(library.LIBRARY_DIR, ignore_errors=True)
+            shutil.rmtree(os.path.join("data", "cache"), ignore_errors=True)
+            http_client._session = None
+            before = dict(server.stats)
+            start = time.perf_counter()
+            results = quiet(library.sync_library, model, names, base_url=base_url, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert all(r == "downloaded" for r in results.values()), results
+            print(f"同步 ({workers} 个线程): {elapsed:.2f} s，建立 {server.stats['connections'] - before['connections']} 个连接")
+
+        manifest = library.load_manifest()
+        for name in names:
+            entry = manifest[name]
+            assert entry["sha256"] == file_sha256(os.path.join(remote, name))
+            print(f"  {name}: {entry['size'] / 1024:.0f} KB，{entry['words']} 个单词")
+
+        before = dict(server.stats)
+        start = time.perf_counter()
+        results = quiet(library.sync_library, model, names, base_url=base_url)
+        elapsed = time.perf_counter() - start
+        assert all(r == "unchanged" for r in results.values()), results
+        print(f"再次同步: {elapsed * 1000:.0f} ms，{server.stats['not_modified'] - before['not_modified']} 个 304，"
+              f"{server.stats['full'] - before['full']} 个完整下载")
+
+        results = quiet(library.sync_library, model, ["损坏.json"], base_url=base_url)
+        assert results["损坏.json"].startswith("failed") and not os.path.exists(library.library_path("损坏.json"))
+        assert not [n for n in os.listdir(library.LIBRARY_DIR) if n.endswith(".part")]
+        print(f"损坏的文件: {results['损坏.json']}，未进入词库库")
+
+        # 切换词库：从网络下载导入 vs 从本地词库库导入
+        name = names[0]
+        start = time.perf_counter()
+        path = download_to_file(library.file_url(name, base_url))
+        quiet(model.load_words_from_download, path, name)
+        network = time.perf_counter() - start
+        start = time.perf_counter()
+        quiet(model.load_words_from_json, library.local_file(name))
+        local = time.perf_counter() - start
+        print(f"切换到 {name}: 网络下载 {network * 1000:.0f} ms，本地词库库 {local * 1000:.0f} ms")
+    finally:
+        server.shutdown()
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+进度文件格式对比：二进制快照 (data/progress.bin) 与 indent=2 的完整 JSON 进度文件。
+对 1-初中、4-CET6、7-SAT 三个词库分别测量文件大小、写入耗时和加载耗时。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_progress_snapshot.py [已学习比例，默认 0.3]
+测试在临时目录中进行，不会改动 data 目录。
+"""
+import json, os, random, shutil, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vocab_model import VocabModel, WordItem  # noqa: E402
+
+WORDLISTS = ["1-初中-顺序.json", "4-CET6-顺序.json", "7-SAT-顺序.json"]
+REPEAT = 5
+
+
+def best_of(fn):
+    """重复执行 fn，返回最短耗时 (毫秒)。"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def make_model(wordlist, ratio):
+    """加载词库并随机设置一部分单词的学习状态。"""
+    model = VocabModel()
+    model.settings["async_save"] = False
+    model.load_words_from_json(os.path.join(ROOT, "词库", wordlist))
+    rng = random.Random(0)
+    for w in rng.sample(model.words, int(len(model.words) * ratio)):
+        w.stage = rng.randint(1, 3)
+        w.attempts = rng.randint(1, 12)
+        w.learned = w.stage == 3 and rng.random() < 0.7
+        w.reviewed = w.learned and rng.random() < 0.5
+        w.tested = rng.random() < 0.3
+    return model
+
+
+def bench(wordlist, ratio):
+    model = make_model(wordlist, ratio)
+    json_path = os.path.join("data", "bench_progress.json")
+
+    def write_json():
+        data = {"words": [w.to_dict() for w in model.words], "settings": model.settings,
+                "current_wordlist_name": model.current_wordlist_name}
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def load_json():
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [WordItem.from_dict(d) for d in data["words"]]
+
+    def write_binary():
+        model._write_snapshot(model.progress_path)
+
+    def load_binary():
+        # 使用新的模型实例，模拟启动时加载 (词条来自解析缓存)
+        return VocabModel().load_progress()
+
+    json_write = best_of(write_json)
+    json_load = best_of(load_json)
+    bin_write = best_of(write_binary)
+    bin_load = best_of(load_binary)
+
+    expected = [(w.word, w.stage, w.learned, w.attempts, w.reviewed, w.tested) for w in model.words]
+    loaded = [(w.word, w.stage, w.learned, w.attempts, w.reviewed, w.tested) for w in load_binary()]
+    assert loaded == expected, "二进制快照加载结果与内存数据不一致"
+
+    return {
+        "wordlist": wordlist,
+        "words": len(model.words),
+        "json_kb": os.path.getsize(json_path) / 1024,
+        "bin_kb": os.path.getsize(model.progress_path) / 1024,
+        "json_write": json_write,
+        "bin_write": bin_write,
+        "json_load": json_load,
+        "bin_load": bin_load,
+    }
+
+
+def main():
+    ratio = float(sys.argv[1]) if len(sys.argv) > 1 else 0.3
+    workdir = tempfile.mkdtemp(prefix="learnword-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        # 预热解析缓存，只比较进度文件本身的读写
+        for name in WORDLISTS:
+            VocabModel().load_words_from_json(os.path.join(ROOT, "词库", name))
+        results = [bench(name, ratio) for name in WORDLISTS]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    print(f"已设置学习状态的单词比例: {ratio:.0%}，每项取 {REPEAT} 次中的最短耗时")
+    print(f"{'词库':<18}{'单词数':>8}{'JSON KB':>10}{'二进制 KB':>11}{'JSON 写 ms':>12}{'二进制写 ms':>12}"
+          f"{'JSON 读 ms':>12}{'二进制读 ms':>12}")
+    for r in results:
+        print(f"{r['wordlist']:<18}{r['words']:>8}{r['json_kb']:>10.1f}{r['bin_kb']:>11.1f}"
+              f"{r['json_write']:>12.1f}{r['bin_write']:>12.1f}{r['json_load']:>12.1f}{r['bin_load']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
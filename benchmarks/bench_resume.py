@@ -0,0 +1,140 @@
+"""
+断点续传和完整性校验 (downloader.download_resumable、library.install) 的测试：用本地 HTTP 服务器提供 词库 目录中的文件，检查
+- 服务器每个响应只发送一部分内容就断开连接时，下载通过 Range 请求续传完成，服务器发送的总字节数等于文件大小，
+  安装的文件与发布的 SHA-256 一致 (不支持续传的 download_to_file 在同样的网络下无法完成)；
+- 发布的 SHA-256 与下载的内容不一致时拒绝安装，词库库中不留下任何文件；
+- 取消下载后保留部分文件，下次安装只请求剩余的部分；部分文件下载后远程文件发生变化时 (If-Range 不匹配) 重新完整下载。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_resume.py [每个响应断开前发送的 KB 数，默认 512]
+测试在临时目录中进行，不会改动 data 目录。
+"""
+import contextlib, hashlib, io, os, shutil, sys, tempfile, threading, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+import library  # noqa: E402
+import storage_codec  # noqa: E402
+from downloader import download_to_file, file_sha256  # noqa: E402
+from vocab_model import VocabModel  # noqa: E402
+from local_server import start_server  # noqa: E402
+
+NAME = "7-SAT-顺序.json"
+
+
+def quiet(fn, *args, **kwargs):
+    """运行 fn 时不输出 print 的内容。"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def stored_sha256(path):
+    """库中文件 (可能已压缩) 解压后内容的 SHA-256。"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(storage_codec.decompress(f.read())).hexdigest()
+
+
+def published(path):
+    return {"sha256": file_sha256(path), "size": os.path.getsize(path)}
+
+
+def install_counting(model, remote_path, base_url):
+    """安装 NAME，返回 (结果, 本次从网络收到的字节数)。"""
+    progress_seen = []
+    result = quiet(library.install, model, NAME, published(remote_path), base_url,
+                   lambda received, total: progress_seen.append(received))
+    return result, progress_seen[-1] - progress_seen[0]
+
+
+def library_files():
+    if not os.path.isdir(library.LIBRARY_DIR):
+        return []
+    return sorted(n for n in os.listdir(library.LIBRARY_DIR) if n != library.MANIFEST_NAME)
+
+
+def main():
+    drop_after = int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 512 * 1024
+    tmp = tempfile.mkdtemp(prefix="learnword-bench-")
+    remote = os.path.join(tmp, "remote")
+    os.makedirs(remote)
+    remote_path = os.path.join(remote, NAME)
+    shutil.copy(os.path.join(ROOT, "词库", NAME), remote_path)
+    size = os.path.getsize(remote_path)
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    server = start_server(remote, drop_after=drop_after)
+    base_url = server.url("")
+    try:
+        model = VocabModel()
+        print(f"{NAME}: {size / 1024:.0f} KB，服务器每个响应发送 {drop_after // 1024} KB 后断开连接")
+
+        # 不支持续传：每次都从头下载，总是在同一位置断开
+        try:
+            quiet(download_to_file, library.file_url(NAME, base_url))
+            raise AssertionError("download_to_file 不应完成")
+        except requests.exceptions.RequestException as e:
+            print(f"download_to_file: 失败 ({type(e).__name__})")
+
+        # 断点续传：连接断开后从断点继续
+        before = dict(server.stats)
+        start = time.perf_counter()
+        result = quiet(library.install, model, NAME, published(remote_path), base_url)
+        elapsed = time.perf_counter() - start
+        sent = server.stats["bytes"] - before["bytes"]
+        assert result == "downloaded", result
+        assert stored_sha256(library.library_path(NAME)) == file_sha256(remote_path)
+        assert library_files() == [NAME], library_files()
+        assert sent == size, (sent, size)
+        print(f"library.install: {result}，{elapsed:.2f} s，{server.stats['requests'] - before['requests']} 个请求 "
+              f"({server.stats['partial'] - before['partial']} 个 Range 续传，{server.stats['dropped'] - before['dropped']} 次断开)，"
+              f"服务器共发送 {sent / size:.2f} 倍文件大小")
+        assert quiet(library.install, model, NAME, published(remote_path), base_url) == "unchanged"
+
+        # 发布的 SHA-256 与内容不一致：拒绝安装
+        server.drop_after = 0
+        shutil.rmtree(library.LIBRARY_DIR)
+        result = quiet(library.install, model, NAME, {"sha256": "0" * 64}, base_url)
+        assert result.startswith("failed") and library_files() == [], (result, library_files())
+        print(f"SHA-256 不一致: {result}，词库库中没有文件")
+
+        # 取消后续传：下载到一半时取消，下次只请求剩余部分
+        cancel_event = threading.Event()
+
+        def cancel_midway(received, total):
+            if received >= size // 2:
+                cancel_event.set()
+
+        result = quiet(library.install, model, NAME, published(remote_path), base_url, cancel_midway, cancel_event)
+        part_path = library.library_path(NAME) + ".part"
+        kept = os.path.getsize(part_path)
+        assert result == "cancelled" and kept >= size // 2, (result, kept)
+        # 被取消的响应在服务器端可能还在发送，这里按客户端收到的字节数统计
+        before = dict(server.stats)
+        result, sent = install_counting(model, remote_path, base_url)
+        assert result == "downloaded" and sent == size - kept and server.stats["partial"] == before["partial"] + 1
+        assert stored_sha256(library.library_path(NAME)) == file_sha256(remote_path)
+        print(f"取消后续传: 保留 {kept / 1024:.0f} KB，续传时下载 {sent / 1024:.0f} KB")
+
+        # 部分文件下载后远程文件变化：If-Range 不匹配，服务器返回完整的新文件
+        cancel_event.clear()
+        shutil.rmtree(library.LIBRARY_DIR)
+        result = quiet(library.install, model, NAME, published(remote_path), base_url, cancel_midway, cancel_event)
+        assert result == "cancelled", result
+        with open(remote_path, "a", encoding="utf-8") as f:
+            f.write("\n")
+        size = os.path.getsize(remote_path)
+        before = dict(server.stats)
+        result, sent = install_counting(model, remote_path, base_url)
+        assert result == "downloaded" and sent == size and server.stats["full"] == before["full"] + 1, result
+        assert stored_sha256(library.library_path(NAME)) == file_sha256(remote_path)
+        assert library_files() == [NAME], library_files()
+        print(f"远程文件变化后续传: 重新完整下载 {sent / 1024:.0f} KB，校验通过")
+    finally:
+        server.shutdown()
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+学习 / 复习 / 测试流程 (session.py) 的无界面基准测试：用模拟的答题者驱动完整的会话，
+测量每秒能处理的答题次数，以及其中保存进度所占的时间。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_sessions.py [词库文件名，默认 7-SAT-顺序.json] [答对概率，默认 0.8]
+测试在临时目录中进行，不会改动 data 目录。
+"""
+import os, random, shutil, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vocab_model import VocabModel  # noqa: E402
+from session import LearnSession, ReviewSession, TestSession, CHOICE, SELF_CHECK, RECOGNIZE  # noqa: E402
+
+SESSIONS = 50
+SESSION_SIZE = 20
+
+
+def respond(question, rng, accuracy):
+    """模拟答题者：以 accuracy 的概率答对。"""
+    item = question.item
+    right = rng.random() < accuracy
+    if question.kind == CHOICE:
+        if right:
+            return item.pos + "." + item.definition
+        wrong = [o for o in question.options if o != item.pos + "." + item.definition]
+        return rng.choice(wrong) if wrong else ""
+    if question.kind in (SELF_CHECK, RECOGNIZE):
+        return right
+    return item.word if right else item.word[::-1] + "x"
+
+
+def run(model, make_session, rng, accuracy):
+    """运行 SESSIONS 次会话，返回 (答题次数, 总耗时秒)。"""
+    answers = 0
+    start = time.perf_counter()
+    for _ in range(SESSIONS):
+        session = make_session()
+        question = session.next_question()
+        while question is not None:
+            session.answer(respond(question, rng, accuracy))
+            answers += 1
+            question = session.next_question()
+    model.flush()
+    return answers, time.perf_counter() - start
+
+
+def main():
+    name = sys.argv[1] if len(sys.argv) > 1 else "7-SAT-顺序.json"
+    accuracy = float(sys.argv[2]) if len(sys.argv) > 2 else 0.8
+    workdir = tempfile.mkdtemp(prefix="learnword-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        rows = []
+        for autosave in (False, True):
+            model = VocabModel()
+            model.load_words_from_json(os.path.join(ROOT, "词库", name))
+            model.save_progress()
+            rng = random.Random(0)
+            now = int(time.time())
+            for label, make in (
+                    ("学习", lambda: LearnSession(model, SESSION_SIZE, rng=rng, autosave=autosave)),
+                    # 复习时把时间推后一天，使刚学完的单词到期
+                    ("复习", lambda: ReviewSession(model, SESSION_SIZE, rng=rng, autosave=autosave,
+                                                 now=now + 86400)),
+                    ("测试", lambda: TestSession(model, SESSION_SIZE, rng=rng, autosave=autosave))):
+                answers, seconds = run(model, make, rng, accuracy)
+                rows.append((label, "是" if autosave else "否", answers, seconds))
+            model.checkpoint()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    print(f"词库: {name}，答对概率 {accuracy:.0%}，每种会话 {SESSIONS} 次 × {SESSION_SIZE} 个单词")
+    print(f"{'会话':<6}{'保存':>6}{'答题次数':>10}{'耗时 ms':>10}{'答题/秒':>12}")
+    for label, autosave, answers, seconds in rows:
+        print(f"{label:<6}{autosave:>6}{answers:>10}{seconds * 1000:>10.1f}{answers / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+列式单词存储 (WordColumns + WordItem 视图) 与原来每个单词一个 dataclass 实例的对比：
+测量单词列表占用的内存，以及 get_stats 和设置界面 refresh_view 中整表统计的耗时。
+
+用法 (在仓库根目录执行)：python benchmarks/bench_word_columns.py [词库文件名，默认 7-SAT-顺序.json] [放大倍数，默认 1]
+"""
+import os, random, sys, time, tracemalloc
+from dataclasses import dataclass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vocab_model import VocabModel, build_word_items  # noqa: E402
+
+REPEAT = 20
+
+
+@dataclass
+class LegacyWordItem:
+    """改动前的 WordItem：普通 dataclass，每个实例带一个 __dict__。"""
+    word: str
+    definition: str = ""
+    pos: str = ""
+    example: str = ""
+    stage: int = 1
+    learned: bool = False
+    attempts: int = 0
+    reviewed: bool = False
+    tested: bool = False
+
+
+def measure(build):
+    """返回 build() 的结果和构建过程中新增的内存 (KB)；词条字符串在测量前已创建，不计入。"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, (after - before) / 1024
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def legacy_stats(words):
+    """改动前 get_stats 与 refresh_view 的统计方式：逐个单词访问属性。"""
+    learned_words = [w for w in words if w.learned]
+    reviewed_words = [w for w in learned_words if w.reviewed]
+    tested_words = [w for w in words if w.tested]
+    return len(learned_words), len(reviewed_words), len(tested_words), len(words)
+
+
+def main():
+    name = sys.argv[1] if len(sys.argv) > 1 else "7-SAT-顺序.json"
+    scale = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    # 只使用解析逻辑，不读写 data 目录中的进度文件
+    model = VocabModel()
+    with open(os.path.join(ROOT, "词库", name), "r", encoding="utf-8") as f:
+        parsed = model._parse_json_content(f.read())
+    entries = [(w.word, w.definition, w.pos, w.example) for w in parsed] * scale
+    del parsed
+
+    rng = random.Random(0)
+    states = [(rng.randint(1, 3), rng.randint(0, 5), rng.random() < 0.4, rng.random() < 0.2, rng.random() < 0.3)
+              for _ in entries]
+
+    def build_legacy():
+        return [LegacyWordItem(word=e[0], definition=e[1], pos=e[2], example=e[3], stage=s[0], attempts=s[1],
+                               learned=s[2], reviewed=s[3], tested=s[4]) for e, s in zip(entries, states)]
+
+    def build_columns():
+        words = build_word_items(entries)
+        for w, s in zip(words, states):
+            w.stage, w.attempts, w.learned, w.reviewed, w.tested = s
+        return words
+
+    legacy, legacy_kb = measure(build_legacy)
+    columns, columns_kb = measure(build_columns)
+    model.words = columns
+
+    def column_stats():
+        learned, total = model.get_stats()
+        return learned, model.count_words("reviewed"), model.count_words("tested"), total
+
+    assert legacy_stats(legacy) == column_stats(), "统计结果不一致"
+
+    legacy_ms = best_of(lambda: legacy_stats(legacy))
+    column_ms = best_of(column_stats)
+    legacy_select = best_of(lambda: [w for w in legacy if not w.learned])
+    column_select = best_of(lambda: model.select_words("unlearned"))
+
+    print(f"词库: {name} x{scale}，共 {len(entries)} 个单词 (不含词条字符串本身)")
+    print(f"{'':<28}{'dataclass':>12}{'列式存储':>12}")
+    print(f"{'单词对象内存 (KB)':<24}{legacy_kb:>12.1f}{columns_kb:>12.1f}")
+    print(f"{'每个单词 (字节)':<25}{legacy_kb * 1024 / len(entries):>12.1f}{columns_kb * 1024 / len(entries):>12.1f}")
+    print(f"{'get_stats + refresh_view 计数 (ms)':<20}{legacy_ms:>12.3f}{column_ms:>12.3f}")
+    print(f"{'select_words(unlearned) (ms)':<26}{legacy_select:>12.3f}{column_select:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+基准测试共用的本地 HTTP 服务器，代替 GitHub 提供 update_manifest.json、announcement.json 和词库文件。
+支持 ETag / Last-Modified 条件请求 (未变化时返回 304)、Range 请求 (206，带 If-Range)、HTTP/1.1 长连接、
+按字节/秒限速，以及每个响应发送指定字节数后断开连接 (模拟不稳定的网络)，
+并统计收到的请求数、建立的连接数和发送的字节数，用于验证连接复用、缓存和断点续传的效果。
+"""
+import functools, hashlib, os, re, socket, threading, time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 允许长连接，客户端可以复用连接
+    rate = 0  # 限速 (字节/秒)，0 表示不限速
+
+    def setup(self):
+        super().setup()
+        # 响应头和内容分两次发送，长连接下关闭 Nagle 算法以免与客户端的延迟确认叠加出约 40 ms 的等待
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.stats_lock:
+            self.server.stats["connections"] += 1
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass  # 客户端取消下载后重置了连接
+
+    def send_head(self):
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                etag = '"' + hashlib.sha1(f.read()).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with self.server.stats_lock:
+                    self.server.stats["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            self._etag = etag
+            match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+            if_range = self.headers.get("If-Range")
+            if match and (if_range is None or if_range == etag):
+                return self._send_range(path, int(match.group(1)))
+        return super().send_head()
+
+    def _send_range(self, path, start):
+        """返回 path 从 start 开始的内容 (206)；start 超出文件大小时返回 416。"""
+        size = os.path.getsize(path)
+        if start >= size:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        f = open(path, "rb")
+        f.seek(start)
+        self.send_response(206)
+        self.send_header("Content-type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        self.send_header("Content-Length", str(size - start))
+        self.send_header("Last-Modified", self.date_time_string(int(os.path.getmtime(path))))
+        self.end_headers()
+        self._partial = True
+        return f
+
+    def end_headers(self):
+        etag = getattr(self, "_etag", None)
+        if etag:
+            self.send_header("ETag", etag)
+            self._etag = None
+        self.send_header("Accept-Ranges", "bytes")
+        super().end_headers()
+
+    def copyfile(self, source, outputfile):
+        with self.server.stats_lock:
+            self.server.stats["partial" if getattr(self, "_partial", False) else "full"] += 1
+        self._partial = False
+        block = max(1024, self.rate // 20) if self.rate else 64 * 1024
+        remaining = self.server.drop_after or None  # 发送这么多字节的内容后断开连接
+        while True:
+            data = source.read(block if remaining is None else min(block, remaining))
+            if not data:
+                break
+            try:
+                outputfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                break  # 客户端取消下载后断开连接
+            with self.server.stats_lock:
+                self.server.stats["bytes"] += len(data)
+            if remaining is not None:
+                remaining -= len(data)
+                if not remaining:
+                    # 内容还没发完就断开连接
+                    with self.server.stats_lock:
+                        self.server.stats["dropped"] += 1
+                    self.close_connection = True
+                    break
+            if self.rate:
+                time.sleep(len(data) / self.rate)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(directory, rate=0, drop_after=0, handler=StandInHandler):
+    """
+    在随机端口启动服务器 (后台线程)，返回 server；server.url(name) 为文件的访问地址。
+    drop_after 不为 0 时每个响应只发送这么多字节的内容就断开连接；可以随时修改 server.drop_after。
+    """
+    handler = type("Handler", (handler,), {"rate": rate})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(handler, directory=directory))
+    server.daemon_threads = True
+    server.drop_after = drop_after
+    server.stats_lock = threading.Lock()
+    server.stats = {"requests": 0, "connections": 0, "full": 0, "not_modified": 0, "partial": 0, "dropped": 0,
+                    "bytes": 0}
+    server.url = lambda name: f"http://127.0.0.1:{server.server_address[1]}/{name}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
@@ -0,0 +1,177 @@
+import random, re
+from difflib import SequenceMatcher
+
+# 词性字符串中的分隔符：JSON 词库为 "adj, n"，CSV 词库为 "n&vt."
+_POS_SPLIT = re.compile(r"[,&/\s]+")
+# 及物/不及物动词与 v 视为同一词性
+_POS_ALIASES = {"vt": "v", "vi": "v"}
+
+
+def option_text(item):
+    """选择题中显示的选项文本：词性 + "." + 释义。"""
+    return item.pos + "." + item.definition
+
+
+def pos_tags(pos):
+    """把词性字符串拆分为规范化的词性标签列表，例如 "n&vt." -> ["n", "v"]。"""
+    tags = []
+    for part in _POS_SPLIT.split(pos.lower()):
+        tag = part.strip(". ")
+        tag = _POS_ALIASES.get(tag, tag)
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+class DistractorPool:
+    """
+    词义选择题的干扰项池：在词库加载后建立一次，包含去重后的全部选项文本，并按词性分组。
+    每次出题只做常数次随机抽取，耗时与词库大小无关；优先抽取与答案词性相同的选项，避免一眼看出答案。
+    """
+
+    # 每个干扰项最多随机尝试的次数，超过后放宽条件
+    MAX_TRIES = 16
+
+    def __init__(self, words):
+        self.options = []  # 去重后的选项文本
+        self.by_pos = {}  # 词性标签 -> options 中的下标列表
+        seen = {}
+        for w in words:
+            if not w.definition:
+                continue
+            text = option_text(w)
+            if text in seen:
+                continue
+            seen[text] = len(self.options)
+            for tag in pos_tags(w.pos):
+                self.by_pos.setdefault(tag, []).append(len(self.options))
+            self.options.append(text)
+
+    def __len__(self):
+        return len(self.options)
+
+    def sample(self, item, k=3, exclude=(), rng=random):
+        """
+        为 item 抽取最多 k 个互不相同的干扰项。
+        答案本身以及 exclude 中的选项文本 (例如同一单词其他词条的释义) 不会被选中。
+        """
+        banned = set(exclude)
+        banned.add(option_text(item))
+        picked = []
+
+        # 先从同词性的分组中抽取，不够时再从全部选项中抽取
+        same_pos = [self.by_pos[t] for t in pos_tags(item.pos) if t in self.by_pos]
+        everything = [range(len(self.options))] if self.options else []
+        for groups in (same_pos, everything):
+            tries = 0
+            while groups and len(picked) < k and tries < self.MAX_TRIES * k:
+                tries += 1
+                text = self.options[rng.choice(rng.choice(groups))]
+                if text not in banned:
+                    banned.add(text)
+                    picked.append(text)
+
+        if len(picked) < k:
+            # 只有选项很少 (或几乎都被排除) 时才会走到这里，顺序补齐即可
+            for text in self.options:
+                if len(picked) >= k:
+                    break
+                if text not in banned:
+                    banned.add(text)
+                    picked.append(text)
+        return picked
+
+
+def edit_distance(a, b):
+    """
+    两个字符串的编辑距离 (Levenshtein)。
+    使用位并行算法 (Myers / Hyyrö)：把 a 的每个位置对应一个二进制位，逐个处理 b 的字符，
+    比逐格填表的动态规划快数倍，建立 BK 树时需要大量调用。
+    """
+    if a == b:
+        return 0
+    if not a:
+        return len(b)
+    if not b:
+        return len(a)
+    peq = {}  # 字符 -> 该字符在 a 中出现位置的位掩码
+    bit = 1
+    for c in a:
+        peq[c] = peq.get(c, 0) | bit
+        bit <<= 1
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = full, 0, len(a)
+    for c in b:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+class BKTree:
+    """
+    BK 树：按编辑距离组织的度量空间索引，用于查找拼写相近的形近词 (affect / effect、adapt / adopt)。
+    查询时利用三角不等式剪枝，只访问一部分节点。
+    """
+
+    def __init__(self, words=()):
+        self._root = None  # 节点为 [单词, {到父节点的距离: 子节点}]
+        self.size = 0
+        for w in words:
+            self.add(w)
+
+    def add(self, word):
+        """加入一个单词 (重复的单词忽略)。"""
+        if self._root is None:
+            self._root = [word, {}]
+            self.size = 1
+            return
+        node = self._root
+        while True:
+            d = edit_distance(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [word, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        """返回与 word 的编辑距离不超过 max_distance 的 [(距离, 单词), ...] (包括 word 本身，距离为 0)。"""
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            d = edit_distance(word, node[0])
+            if d <= max_distance:
+                found.append((d, node[0]))
+            low, high = d - max_distance, d + max_distance
+            for dist, child in node[1].items():
+                if low <= dist <= high:
+                    stack.append(child)
+        return found
+
+
+def differing_positions(word, others):
+    """返回 word 中与 others 里各个单词不相同的字母位置 (升序)，即区分这些形近词的关键字母。"""
+    positions = set()
+    for other in others:
+        for tag, i1, i2, _, _ in SequenceMatcher(None, word, other, autojunk=False).get_opcodes():
+            if tag == "equal":
+                continue
+            # 插入操作在 word 中没有对应字母，取插入点处的字母
+            positions.update(range(i1, i2) if i2 > i1 else [min(i1, len(word) - 1)])
+    return sorted(positions)
@@ -0,0 +1,188 @@
+import hashlib, json, os, re, tempfile, time
+import requests
+import http_client
+
+# 流式下载：把响应分块写入临时文件，不把整个文件读入内存，并逐块报告进度、检查是否已取消。
+# 与界面无关，设置窗口的后台下载线程 (WordlistDownloader) 和基准测试脚本共用。
+# download_resumable 在此基础上保留未完成的部分文件，连接中断后用 HTTP Range 从断点继续，并在完成后校验 SHA-256。
+
+CHUNK_SIZE = 64 * 1024  # 每次读取并写入的字节数
+DOWNLOAD_TIMEOUT = 15  # 连接和两次读取之间的超时 (秒)
+RETRIES = 5  # 连接中断后自动续传的最多次数
+RETRY_DELAY = 0.5  # 第 n 次续传前等待 n * RETRY_DELAY 秒
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
+
+class DownloadCancelled(Exception):
+    """下载被用户取消。"""
+
+
+class DownloadIntegrityError(Exception):
+    """下载完成的文件与发布的 SHA-256 不一致。"""
+
+
+class _NotModified(Exception):
+    """条件请求的结果为 304，内部用于跳出下载流程。"""
+
+
+def download_to_file(url, dest_dir="data", progress=None, cancel_event=None,
+                     chunk_size=CHUNK_SIZE, timeout=DOWNLOAD_TIMEOUT, session=None, headers=None, response_headers=None):
+    """
+    把 url 的内容流式下载到 dest_dir 中的临时文件 (*.part)，返回临时文件路径，由调用方移动或删除。
+    临时文件与词库备份位于同一目录，之后可以用 os.replace 原子地替换。
+    - progress(received, total)：每写入一块调用一次；total 为 0 表示总大小未知。
+    - cancel_event：threading.Event，被设置后在下一块数据到达时停止并抛出 DownloadCancelled。
+    - session：发送请求的 requests.Session，默认使用共享连接池 (http_client.get_session())。
+    - headers：附加的请求头，例如条件请求的 If-None-Match；服务器返回 304 (未修改) 时返回 None。
+    - response_headers：给出字典时写入响应头 (用于记录 ETag / Last-Modified)。
+    下载失败或取消时删除临时文件；网络错误照常抛出 requests.exceptions.RequestException。
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    get = (session or http_client.get_session()).get
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix="download-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f, get(url, stream=True, timeout=timeout, headers=headers) as response:
+            if response_headers is not None:
+                response_headers.update(response.headers)
+            if response.status_code == 304:
+                raise _NotModified()
+            response.raise_for_status()
+            # 服务器压缩传输时 Content-Length 是压缩后的大小，与写入的字节数不可比，按未知处理
+            total = 0
+            if not response.headers.get("Content-Encoding"):
+                total = int(response.headers.get("Content-Length") or 0)
+            received = 0
+            if progress:
+                progress(received, total)
+            for chunk in response.iter_content(chunk_size):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise DownloadCancelled(url)
+                f.write(chunk)
+                received += len(chunk)
+                if progress:
+                    progress(received, max(total, received) if total else 0)
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelled(url)
+        return tmp_path
+    except _NotModified:
+        os.remove(tmp_path)
+        return None
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def file_sha256(path):
+    """文件内容的 SHA-256 (十六进制)。"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _discard_partial(part_path):
+    for path in (part_path, part_path + ".json"):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _load_partial(url, part_path):
+    """已下载的部分：返回 (字节数, 记录的 ETag / Last-Modified)；不是同一个 url 的部分文件直接丢弃。"""
+    try:
+        with open(part_path + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        size = os.path.getsize(part_path)
+    except (OSError, ValueError):
+        _discard_partial(part_path)
+        return 0, None
+    if meta.get("url") != url:
+        _discard_partial(part_path)
+        return 0, None
+    return size, meta.get("etag") or meta.get("last_modified")
+
+
+def download_resumable(url, part_path, progress=None, cancel_event=None, expected_sha256=None,
+                       retries=RETRIES, chunk_size=CHUNK_SIZE, timeout=DOWNLOAD_TIMEOUT, session=None,
+                       headers=None, response_headers=None):
+    """
+    把 url 下载到 part_path，返回 part_path (内容已完整并通过校验)，由调用方原子地移动到最终位置。
+    - part_path 已有同一 url 未完成的部分时，用 Range 请求从断点继续 (带 If-Range，远程文件已变化时服务器返回完整内容)；
+    - 下载过程中连接中断或超时，自动从断点续传；连续 retries 次没有收到新数据时放弃，
+      失败或被取消时保留部分文件，下次调用继续；
+    - expected_sha256 给出时校验下载完成的文件，不一致时删除文件并抛出 DownloadIntegrityError；
+    - headers (条件请求头) 只用于从头开始的下载；服务器返回 304 时返回 None。
+    progress、cancel_event、session、response_headers 的含义与 download_to_file 相同。
+    """
+    session = session or http_client.get_session()
+    attempt = 0
+    while True:
+        offset, validator = _load_partial(url, part_path)
+        request_headers = dict(headers or {}) if not offset else {"Range": f"bytes={offset}-"}
+        if offset and validator:
+            request_headers["If-Range"] = validator
+        received = start = offset
+        try:
+            with session.get(url, stream=True, timeout=timeout, headers=request_headers) as response:
+                if response.status_code == 304 and not offset:
+                    return None
+                if response.status_code == 416:
+                    # 部分文件比远程文件还大 (远程文件已变化)：丢弃后从头下载
+                    _discard_partial(part_path)
+                    continue
+                response.raise_for_status()
+                if response_headers is not None:
+                    response_headers.update(response.headers)
+
+                match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+                if response.status_code == 206 and match and int(match.group(1)) == offset:
+                    total = int(match.group(2)) if match.group(2) != "*" else 0
+                    mode = "ab"
+                else:
+                    # 服务器不支持 Range 或远程文件已变化：从头下载，并记录用于续传的 ETag / Last-Modified
+                    offset = 0
+                    total = 0 if response.headers.get("Content-Encoding") else int(response.headers.get("Content-Length") or 0)
+                    mode = "wb"
+                    received = start = 0
+                    os.makedirs(os.path.dirname(part_path) or ".", exist_ok=True)
+                    with open(part_path + ".json", "w", encoding="utf-8") as f:
+                        json.dump({"url": url, "etag": response.headers.get("ETag"),
+                                   "last_modified": response.headers.get("Last-Modified")}, f)
+
+                with open(part_path, mode) as f:
+                    if progress:
+                        progress(received, total)
+                    for chunk in response.iter_content(chunk_size):
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise DownloadCancelled(url)
+                        f.write(chunk)
+                        received += len(chunk)
+                        if progress:
+                            progress(received, max(total, received) if total else 0)
+                if total and received < total:
+                    raise requests.exceptions.ChunkedEncodingError(f"连接提前结束: {received}/{total} 字节")
+            break
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError) as e:
+            attempt = 1 if received > start else attempt + 1  # 收到了新数据时重新计数
+            if attempt > retries:
+                raise
+            print(f"下载中断，{attempt * RETRY_DELAY:.1f} 秒后从断点继续 ({attempt}/{retries}): {e}")
+            time.sleep(attempt * RETRY_DELAY)
+        if cancel_event is not None and cancel_event.is_set():
+            raise DownloadCancelled(url)
+
+    if expected_sha256 and file_sha256(part_path) != expected_sha256.lower():
+        _discard_partial(part_path)
+        raise DownloadIntegrityError(f"{url} 的 SHA-256 与发布的不一致")
+    try:
+        os.remove(part_path + ".json")
+    except OSError:
+        pass
+    return part_path
@@ -0,0 +1,155 @@
+import hashlib, json, os, threading, time
+import requests
+from requests.adapters import HTTPAdapter
+
+# 共享的网络层：
+# - 整个程序共用一个 requests.Session (连接池)，检查更新、加载公告和下载词库复用同一组 TCP/TLS 连接；
+# - fetch() 为更新清单、公告等小文件提供磁盘缓存 (data/http_cache)：缓存未过期时不访问网络，
+#   过期后带 If-None-Match / If-Modified-Since 发送条件请求，服务器返回 304 时直接使用缓存；
+#   网络不可用时退回缓存中的旧内容。
+
+CACHE_DIR = os.path.join("data", "http_cache")
+POOL_CONNECTIONS = 4  # 连接池按主机保留的数量
+POOL_MAXSIZE = 8  # 每个主机最多同时保持的连接数 (并发下载时使用)
+DEFAULT_TIMEOUT = 5
+ANNOUNCEMENT_MAX_AGE = 60 * 60  # 公告的缓存有效期 (秒)；更新清单每次都重新验证
+
+_session = None
+_session_lock = threading.Lock()
+
+# 本次运行中的请求统计：full 为完整下载，not_modified 为 304 重新验证，fresh 为缓存未过期未访问网络，
+# offline 为网络失败时使用缓存
+stats = {"full": 0, "not_modified": 0, "fresh": 0, "offline": 0}
+_stats_lock = threading.Lock()
+
+
+def get_session():
+    """返回全局共享的 requests.Session，首次调用时创建。"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+class CachedResponse:
+    """fetch() 的结果：content 为响应内容 (bytes)，source 为 full / not_modified / fresh / offline。"""
+    __slots__ = ("url", "content", "source")
+
+    def __init__(self, url, content, source):
+        self.url = url
+        self.content = content
+        self.source = source
+
+    @property
+    def from_cache(self):
+        return self.source != "full"
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content.decode("utf-8"))
+
+    def __repr__(self):
+        return f"CachedResponse(url={self.url!r}, source={self.source!r}, size={len(self.content)})"
+
+
+def _cache_paths(url):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, key + ".json"), os.path.join(CACHE_DIR, key + ".body")
+
+
+def _load_cached(url):
+    """读取 url 的缓存，返回 (元数据, 内容)；没有缓存或缓存损坏时返回 (None, None)。"""
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    if meta.get("url") != url or meta.get("size") != len(body):
+        return None, None
+    return meta, body
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _store(url, meta, body=None):
+    """写入缓存；body 为 None 时只更新元数据 (304 之后刷新获取时间)。先写内容再写元数据。"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    meta_path, body_path = _cache_paths(url)
+    if body is not None:
+        _write_atomic(body_path, body)
+    _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+
+def _count(source):
+    with _stats_lock:
+        stats[source] += 1
+
+
+def fetch(url, max_age=0, timeout=DEFAULT_TIMEOUT):
+    """
+    获取 url 的内容，返回 CachedResponse。
+    - 缓存的获取时间在 max_age 秒以内时直接返回缓存，不访问网络；
+    - 否则发送条件请求：304 时返回缓存，200 时更新缓存；
+    - 网络错误或服务器错误时，有缓存则返回缓存 (source 为 offline)，没有缓存则照常抛出异常。
+    """
+    meta, body = _load_cached(url)
+    now = time.time()
+    if meta is not None and now - meta.get("fetched", 0) < max_age:
+        _count("fresh")
+        return CachedResponse(url, body, "fresh")
+
+    headers = {}
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and meta is not None:
+            meta["fetched"] = now
+            try:
+                _store(url, meta)
+            except OSError as e:
+                print(f"写入网络缓存失败: {e}")
+            _count("not_modified")
+            return CachedResponse(url, body, "not_modified")
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        if meta is None:
+            raise
+        print(f"网络请求失败，使用缓存的内容: {url} ({e})")
+        _count("offline")
+        return CachedResponse(url, body, "offline")
+
+    content = response.content
+    new_meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched": now,
+        "size": len(content),
+    }
+    try:
+        _store(url, new_meta, content)
+    except OSError as e:
+        print(f"写入网络缓存失败: {e}")
+    _count("full")
+    return CachedResponse(url, content, "full")
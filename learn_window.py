@@ -1,11 +1,10 @@
-import random, os, csv
-from collections import deque
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QLineEdit, \
-    QMessageBox, QFrame, QGridLayout  # 导入 QGridLayout
+    QMessageBox, QFrame, QGridLayout, QCheckBox  # 导入 QGridLayout
 from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFont, QPalette, QColor  # 导入 QPalette 和 QColor
+from PySide6.QtGui import QFont
 
 from vocab_model import VocabModel
+from session import LearnSession, CHOICE, SELF_CHECK, SPELL
 
 
 class LearnWindow(QMainWindow):
@@ -45,6 +44,11 @@ class LearnWindow(QMainWindow):
         # 返回按钮（保持在顶部右侧）
         btn_row = QHBoxLayout()
         btn_row.addStretch()  # 将按钮推到右侧
+        # 困难干扰项：选择题使用拼写相近的单词的释义，填空题挖去区分形近词的字母
+        self.hard_check = QCheckBox("困难干扰项")
+        self.hard_check.setChecked(bool(self.model.settings.get("hard_distractors", False)))
+        self.hard_check.toggled.connect(self._toggle_hard_distractors)
+        btn_row.addWidget(self.hard_check)
         self.btn_return = QPushButton("返回主页面")
         self.btn_return.setObjectName("return_btn")  # 设置对象名
         btn_row.addWidget(self.btn_return)
@@ -151,8 +155,9 @@ class LearnWindow(QMainWindow):
         self.idk_btn.clicked.connect(self.on_idk)
         self.btn_return.clicked.connect(self.close)
 
-        # 学习队列和当前单词状态
-        self.queue = deque()  # 存储待学习单词的队列
+        # 学习流程 (LearnSession) 和当前题目状态
+        self.session = None  # 负责选词、出题和根据答案更新单词状态
+        self.question = None  # 当前题目 (session.Question)
         self.current = None  # 当前正在学习的单词对象
 
         # 准备队列并开始学习
@@ -230,37 +235,18 @@ class LearnWindow(QMainWindow):
             }
         """)
 
-    def _prepare_queue_and_start(self):
-        """准备学习队列，根据学习阶段和设置的数量限制来筛选单词。"""
-        # 筛选所有未学完的单词
-        all_unlearned = [w for w in self.model.words if not w.learned]
-
-        # 获取设置中定义的本次学习单词数量限制
-        count = self.model.settings.get("learn_count", 10)
+    def closeEvent(self, event):
+        """关闭窗口前等待后台保存完成，确保本次的进度已写入磁盘。"""
+        self.model.flush()
+        super().closeEvent(event)
 
-        pool = [w for w in self.model.words]
-        if not pool:
+    def _prepare_queue_and_start(self):
+        """准备学习队列 (由 LearnSession 根据学习阶段和设置的数量限制选词) 并开始学习。"""
+        if not self.model.words:
             QMessageBox.information(self, "提示", "词库为空")
             return
 
-        # 根据 stage 阶段降序排序，确保高阶段单词优先被选中
-        pool.sort(key=lambda x: x.stage, reverse=True)
-
-        # 从未学完的单词中随机选择本次要学的数量的单词
-        selected = random.sample(all_unlearned, min(count, len(all_unlearned)))
-
-        # 按阶段分组 (stages = {1: [w1, w2], 2: [w3], ...})
-        stages = {}
-        for w in selected:
-            stages.setdefault(w.stage, []).append(w)
-
-        # 重新构建队列：按阶段升序（从低阶段开始）加入队列，并在阶段内随机打乱
-        self.queue = deque()
-        for st in sorted(stages.keys(), reverse=False):  # 注意：这里应是升序 (reverse=False) 确保从 Stage 1 开始学
-            grp = stages[st]
-            random.shuffle(grp)
-            for w in grp: self.queue.append(w)
-
+        self.session = LearnSession(self.model, hard=self.hard_check.isChecked())
         self._show_next()
 
     def keyPressEvent(self, event):
@@ -269,7 +255,7 @@ class LearnWindow(QMainWindow):
             if self.current is None:
                 return
 
-            phase = min(max(1, self.current.stage), 3)
+            phase = self.question.phase
 
             if phase == 1:
                 # 阶段1：无法用Enter提交（因为有4个选项，不知道选哪个）
@@ -280,11 +266,8 @@ class LearnWindow(QMainWindow):
                     # 此时处于“认识/不认识”界面，Enter 触发“认识”
                     self._phase2_handle(self.current)
                 # 如果已进入“下一个/我记错了”界面，则 Enter 触发"下一个"
-                elif phase == 2:
-                    if self.know_btn.isVisible() and self.unknow_btn.isVisible():
-                        self._phase2_handle(self.current)
-                    elif hasattr(self, 'next_btn') and self.next_btn.isVisible():
-                        self._phase2_next()  # Enter 触发“下一个”
+                elif hasattr(self, 'next_btn') and self.next_btn.isVisible():
+                    self._phase2_next()  # Enter 触发“下一个”
             elif phase == 3:
                 # 阶段3：直接提交
                 self.on_submit()
@@ -294,27 +277,27 @@ class LearnWindow(QMainWindow):
 
     def _show_next(self):
         """显示下一个单词的当前学习阶段界面。"""
-        if not self.queue:
+        self.question = self.session.next_question() if self.session else None
+        if self.question is None:
             # 队列为空，学习结束
+            self.current = None
             self._hide_all()
             self.word_label.setText("🎉 本次学习完成！ 🎉")
             # 3秒后自动关闭窗口
             QTimer.singleShot(3000, self.close)
             return
 
-        self.current = self.queue.popleft()  # 取出队列头部的单词
-
-        # 确定当前单词应该进入的阶段 (确保 stage 在 1 到 3 之间)
-        phase = min(max(1, self.current.stage), 3)
+        self.current = self.question.item
+        phase = self.question.phase
         self._update_stage_indicator(phase)  # 更新阶段指示灯
 
         # 根据阶段进入不同的界面
         if phase == 1:
-            self._enter_phase1(self.current)
+            self._enter_phase1(self.question)
         elif phase == 2:
             self._enter_phase2(self.current)
         else:
-            self._enter_phase3(self.current)
+            self._enter_phase3(self.question)
 
     def _hide_all(self):
         """隐藏所有阶段相关的控件，用于学习结束或切换阶段时的清理。"""
@@ -340,28 +323,17 @@ class LearnWindow(QMainWindow):
                 # 未进行的阶段保持透明
                 dot.setStyleSheet("border:2px solid #555; border-radius:10px; background-color:transparent;")
 
-    def _enter_phase1(self, item):
-        """进入阶段 1：词义选择题。"""
+    def _enter_phase1(self, question):
+        """进入阶段 1：词义选择题 (选项由 LearnSession 生成)。"""
         self._hide_all()  # 隐藏所有，再显示需要的
         self.phase_frame.show()
 
         # 显示阶段 1 控件
         for b in self.opt_buttons: b.show()
-        self.word_label.setText(item.word)
-
-        # 准备选项
-        correct = item.pos+"."+item.definition or ""
-        # 筛选 3 个干扰项 (确保不与当前单词重复，且有释义)
-        distract = [w.pos+"."+w.definition for w in self.model.words if w.word != item.word and w.definition]
-        distract = list(dict.fromkeys(distract))  # 去重
-        random.shuffle(distract)
-
-        opts = [correct] + distract[:3]
-        while len(opts) < 4: opts.append("")  # 确保选项数量为 4
-        random.shuffle(opts)
+        self.word_label.setText(question.item.word)
 
         # 设置按钮文本
-        for b, t in zip(self.opt_buttons, opts): b.setText(t)
+        for b, t in zip(self.opt_buttons, question.options): b.setText(t)
 
     def _enter_phase2(self, item):
         """进入阶段 2：认识/不认识自测。"""
@@ -430,28 +402,23 @@ class LearnWindow(QMainWindow):
         """处理阶段 2 的“下一个”按钮点击：进入下一阶段。"""
         self.next_btn.hide()
         self.wrong_btn.hide()
-        if self.current:
-            # 成功进入下一阶段 (Stage + 1，但不超过 3)
-            self.current.stage = min(3, self.current.stage + 1)
-            self.queue.append(self.current)  # 重新加入队列
-            self.model.save_progress()
+        if self._awaiting(SELF_CHECK):
+            self.session.answer(True)  # 成功进入下一阶段 (Stage + 1，但不超过 3)，重新加入队列
         self._show_next()
 
     def _phase2_wrong(self, item):
         """处理阶段 2 的“我记错了”按钮点击：退回阶段 1。"""
-        # 答错：降级回第一阶段
-        item.stage = 1
-        item.attempts += 1
-        self.queue.append(item)
-        self.model.save_progress()
+        if self._awaiting(SELF_CHECK):
+            self.session.answer(False)  # 答错：降级回第一阶段，重新加入队列
         self.next_btn.hide()
         self.wrong_btn.hide()
         self._show_next()
 
-    def _enter_phase3(self, item):
+    def _enter_phase3(self, question):
         """进入阶段 3：拼写填空。"""
         self._hide_all()  # 隐藏所有，再显示需要的
         self.phase_frame.hide()  # 隐藏阶段 1/2 的框架
+        item = question.item
 
         # 显示阶段 3 控件
         self.cloze_label.show()
@@ -460,7 +427,7 @@ class LearnWindow(QMainWindow):
         self.idk_btn.show()
 
         # cloez_label 显示带下划线的单词（提示）
-        self.cloze_label.setText(self._make_cloze(item.word))
+        self.cloze_label.setText(question.cloze)
         self.cloze_label.setWordWrap(True)  # 再次确保换行开启
 
         # word_label 显示释义作为提示 自动换行已设置
@@ -473,91 +440,56 @@ class LearnWindow(QMainWindow):
     def on_choice(self):
         """处理阶段 1 的选择题答案提交。"""
         btn = self.sender()  # 获取触发事件的按钮
-        if not self.current: return
+        if not self._awaiting(CHOICE): return
 
-        # 检查答案是否正确
-        if btn.text().strip() == (self.current.pos+"."+self.current.definition or "").strip():
-            self.current.stage = min(3, self.current.stage + 1)  # 答对：阶段 +1
+        # 答对：阶段 +1；答错：阶段 -1 (最低到 1)。单词重新加入队列
+        feedback = self.session.answer(btn.text())
+        if feedback.correct:
             QMessageBox.information(self, "正确", "回答正确")
         else:
-            self.current.stage = max(1, self.current.stage - 1)  # 答错：阶段 -1 (最低到 1)
-            self.current.attempts += 1
-            QMessageBox.warning(self, "错误", f"正确释义: {self.current.pos+"."+self.current.definition or ""}")
-
-        self.queue.append(self.current)  # 重新加入队列
-        self.model.save_progress()
+            QMessageBox.warning(self, "错误", f"正确释义: {feedback.expected}")
         QTimer.singleShot(100, self._show_next)  # 延迟显示下一题
 
     def on_know(self):
         """处理阶段 2 首次点击“认识”按钮 (在 _enter_phase2 绑定前)。"""
-        if not self.current: return
-        # 默认的 on_know/on_unknow 只是处理阶段变化，并重新加入队列
-        self.current.stage = min(3, self.current.stage + 1)
-        self.queue.append(self.current)
-        self.model.save_progress()
+        if not self._awaiting(SELF_CHECK): return
+        self.session.answer(True)
         QTimer.singleShot(100, self._show_next)
 
     def on_unknow(self):
         """处理阶段 2 首次点击“不认识”按钮 (在 _enter_phase2 绑定前)。"""
-        if not self.current: return
-        self.current.stage = max(1, self.current.stage - 1)
-        self.current.attempts += 1
-        self.queue.append(self.current)
-        self.model.save_progress()
-
-        # 将 Stage 1 的单词推到队列末尾，以便先学习 Stage 2/3 的单词
-        size = len(self.queue)
-        rotated = 0
-        while rotated < size:
-            if len(self.queue) == 0: break
-            if getattr(self.queue[0], "stage", 1) == 1:
-                break
-            self.queue.append(self.queue.popleft())
-            rotated += 1
-
+        if not self._awaiting(SELF_CHECK): return
+        self.session.answer(False)
         QTimer.singleShot(100, self._show_next)
 
     def on_submit(self):
         """处理阶段 3 的拼写提交。"""
-        if not self.current: return
-        s = self.spell_input.text().strip()
-        self.current.attempts += 1
-
-        # 检查拼写是否正确（不区分大小写）
-        if s.lower() == (self.current.word or "").lower():
-            self.current.learned = True  # 拼写正确，标记为已学完
-            self.current.stage = min(3, self.current.stage + 0)  # 保持在最高阶段
-            self.model.save_progress()
+        if not self._awaiting(SPELL): return
+
+        # 拼写正确 (不区分大小写) 时标记为已学完并排入复习计划，错误时退回阶段 1
+        feedback = self.session.answer(self.spell_input.text())
+        if feedback.correct:
             QMessageBox.information(self, "正确", "拼写正确")
             QTimer.singleShot(200, self._show_next)
         else:
-            QMessageBox.information(self, "错误", f"正确: {self.current.word}")
-            self.current.learned = False
-            self.current.stage = 1  # 拼写错误，退回阶段 1
-            self.queue.append(self.current)
-            self.model.save_progress()
+            QMessageBox.information(self, "错误", f"正确: {feedback.expected}")
             QTimer.singleShot(100, self._show_next)
 
     def on_idk(self):
         """处理阶段 3 的“我不会”按钮点击。"""
-        if not self.current: return
-        QMessageBox.information(self, "提示", f"正确: {self.current.word}")
-        self.current.stage = 1  # 退回阶段 1
-        self.queue.append(self.current)
-        self.model.save_progress()
+        if not self._awaiting(SPELL): return
+        feedback = self.session.answer(None)  # 退回阶段 1
+        QMessageBox.information(self, "提示", f"正确: {feedback.expected}")
         QTimer.singleShot(200, self._show_next)
 
-    def _make_cloze(self, word):
-        """生成带下划线的填空提示。"""
-        chars = list(word)
-        import random as _r
-        if len(chars) == 0: return ""
-
-        # 随机选择要隐藏的字母数量 (最少 1 个，最多一半)
-        n = max(1, min(len(chars) - 1, _r.randint(1, max(1, len(chars) // 2))))
-
-        # 随机选择 n 个要隐藏的字母的索引
-        idxs = _r.sample(range(len(chars)), n)
-
-        # 生成带下划线的字符串
-        return " ".join([("_" if i in idxs else c) for i, c in enumerate(chars)])
\ No newline at end of file
+    def _awaiting(self, kind):
+        """当前是否有等待回答的 kind 类型题目 (答题后到显示下一题之间的重复操作会被忽略)。"""
+        question = self.session.current if self.session else None
+        return question is not None and question.kind == kind
+
+    def _toggle_hard_distractors(self, checked):
+        """切换困难干扰项模式并保存到设置，本次学习中之后出的题立即生效。"""
+        self.model.settings["hard_distractors"] = checked
+        self.model.save_settings()
+        if self.session:
+            self.session.hard = checked
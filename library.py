@@ -0,0 +1,362 @@
+import hashlib, json, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import http_client
+import storage_codec
+import wordlist_patch
+from downloader import download_resumable, file_sha256, DownloadCancelled, DownloadIntegrityError
+from vocab_model import VocabModel
+
+# 本地词库库：把远程的全部词库文件下载到 data/library，并在 manifest.json 中记录每个文件的
+# sha256、大小、单词数和 ETag / Last-Modified。之后切换词库只读取本地文件，不需要等待网络。
+#
+# 同步 (sync_library) 时用有限大小的线程池并发下载，所有线程共用 http_client 的连接池。
+# 每个文件 (install) 先下载到 <文件名>.part，中断后从断点续传；完成后按更新清单中发布的 SHA-256 校验并解析，
+# 全部通过后才原子地替换库中的文件。已有的文件与发布的版本一致时不访问网络；
+# 清单没有发布 SHA-256 时发送条件请求，未变化 (304) 时跳过。
+#
+# 增量更新：更新清单为每个词库发布版本号 version 和补丁列表 patches (见 wordlist_patch.py)。
+# 本地版本落后且有连续的补丁可以升级到发布的版本时，只下载补丁并应用到解析缓存中的词条，
+# 再写出新版本的文件 (内容按解析规则与发布的文件等价，字节不一定相同，因此之后按版本号判断是否最新)；
+# 补丁不可用或应用失败时退回完整下载。
+#
+# 库中的文件按设置项 library_codec 压缩存储 (storage_codec)，清单中的 sha256 始终是未压缩内容的摘要，
+# size 是库中文件的大小。读取时按文件内容自动识别压缩方式。
+
+LIBRARY_DIR = os.path.join("data", "library")
+MANIFEST_NAME = "manifest.json"
+# 词库文件所在的 GitHub 路径
+BASE_URL = "https://raw.githubusercontent.com/Junpgle/LearnWord/master/%E8%AF%8D%E5%BA%93/"
+# 远程更新清单；其中的 wordlists 字段存在时作为词库目录，否则使用 CATALOG。
+# wordlists 的每一项为文件名，或 {"name": 文件名, "sha256": ..., "size": ..., "version": 版本号,
+# "patches": [{"from": 旧版本号, "to": 新版本号, "file": 补丁相对于 BASE_URL 的路径, "sha256": ..., "size": ...}]}
+MANIFEST_URL = "https://raw.githubusercontent.com/Junpgle/LearnWord/refs/heads/master/update_manifest.json"
+# 预设可下载的文件名列表 (这些文件存在于 GitHub 路径下)
+CATALOG = ["1-初中-顺序.json", "2-高中-顺序.json", "3-CET4-顺序.json", "4-CET6-顺序.json", "5-考研-顺序.json",
+           "6-托福-顺序.json", "7-SAT-顺序.json"]
+SYNC_WORKERS = 4  # 并发下载的线程数 (不超过 http_client.POOL_MAXSIZE，连接才能全部复用)
+PATCH_DIR = "patches"  # 补丁文件所在的子目录 (相对于词库目录)
+
+_manifest_lock = threading.Lock()  # 同步和单个下载可能同时更新清单
+
+
+def library_path(name):
+    return os.path.join(LIBRARY_DIR, name)
+
+
+def file_url(name, base_url=BASE_URL):
+    return base_url + quote(name)
+
+
+def load_manifest():
+    """
+    读取本地词库库的清单 {文件名: {sha256, size, words, version, codec, etag, last_modified, synced}}；
+    不存在时返回空字典。
+    """
+    try:
+        with open(os.path.join(LIBRARY_DIR, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(files):
+    os.makedirs(LIBRARY_DIR, exist_ok=True)
+    path = os.path.join(LIBRARY_DIR, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"files": files}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _update_manifest(name, entry):
+    with _manifest_lock:
+        files = load_manifest()
+        files[name] = entry
+        _save_manifest(files)
+
+
+def local_file(name, manifest=None):
+    """词库 name 已同步到本地且大小与清单一致时返回本地路径，否则返回 None。"""
+    entry = (manifest if manifest is not None else load_manifest()).get(name)
+    path = library_path(name)
+    if entry and os.path.exists(path) and os.path.getsize(path) == entry.get("size"):
+        return path
+    return None
+
+
+def catalog_entries(wordlists):
+    """把更新清单中的 wordlists 转换为 {文件名: 发布信息}，发布信息可能包含 sha256 和 size。"""
+    entries = {}
+    for item in wordlists or ():
+        if isinstance(item, str):
+            entries[item] = {}
+        elif isinstance(item, dict) and item.get("name"):
+            entries[item["name"]] = {k: v for k, v in item.items() if k != "name"}
+    return entries
+
+
+def _is_current(entry, info):
+    """本地条目是否已是发布的版本：双方都有版本号时比较版本号，否则比较 SHA-256。"""
+    if entry.get("version") is not None and info.get("version") is not None:
+        return entry["version"] == info["version"]
+    published = (info.get("sha256") or "").lower()
+    return bool(published) and entry.get("sha256") == published
+
+
+def _patch_chain(info, version):
+    """从本地版本 version 依次升级到发布版本所需的补丁列表；没有连续的补丁时返回 None。"""
+    by_source = {p.get("from"): p for p in info.get("patches") or () if isinstance(p, dict) and p.get("file")}
+    chain = []
+    while version != info.get("version"):
+        patch = by_source.get(version)
+        if patch is None or len(chain) >= len(by_source):
+            return None
+        chain.append(patch)
+        version = patch.get("to")
+    return chain
+
+
+def _install_patches(model, name, entry, info, chain, base_url):
+    """下载 chain 中的补丁，依次应用到本地词库库中 name 的词条，写出新版本的文件并更新清单。"""
+    path = library_path(name)
+    kind = "json" if name.lower().endswith(".json") else "csv"
+    # 安装时已写入解析缓存，这里通常直接命中，不需要解析文件
+    entries = [(w.word, w.definition, w.pos, w.example) for w in model.parse_wordlist_file(path, name)]
+    session = http_client.get_session()
+    for patch in chain:
+        response = session.get(file_url(patch["file"], base_url), timeout=http_client.DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        if patch.get("sha256") and hashlib.sha256(response.content).hexdigest() != patch["sha256"].lower():
+            raise DownloadIntegrityError(f"补丁 {patch['file']} 的 SHA-256 与发布的不一致")
+        entries = wordlist_patch.apply_patch(entries, json.loads(response.content.decode("utf-8")))
+
+    data = wordlist_patch.dump_wordlist(entries, kind)
+    codec = model.settings.get("library_codec", storage_codec.NONE)
+    stored = storage_codec.compress(data, codec)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(stored)
+    os.replace(tmp_path, path)
+    # 写入解析缓存，之后导入新文件时直接命中
+    model.cache_parsed_wordlist(path, entries, name)
+    _update_manifest(name, dict(entry, sha256=hashlib.sha256(data).hexdigest(), size=len(stored), words=len(entries),
+                                version=info["version"], codec=codec, etag=None, last_modified=None,
+                                synced=int(time.time())))
+    return "patched"
+
+
+def fetch_catalog(timeout=5):
+    """远程词库目录 {文件名: 发布信息}：优先使用更新清单中的 wordlists 字段，获取失败或没有该字段时使用 CATALOG。"""
+    try:
+        entries = catalog_entries(http_client.fetch(MANIFEST_URL, timeout=timeout).json().get("wordlists"))
+    except (requests.exceptions.RequestException, ValueError, AttributeError):
+        entries = {}
+    return entries or {name: {} for name in CATALOG}
+
+
+def install(model, name, info=None, base_url=BASE_URL, progress=None, cancel_event=None):
+    """
+    下载词库 name 并安装到本地词库库，返回 "downloaded" / "patched" / "unchanged" / "cancelled"
+    或以 "failed: " 开头的错误信息。
+    - info：更新清单中发布的信息 (sha256、size、version、patches)，给出 sha256 时校验下载的文件，
+      本地版本落后且有可用的补丁时增量更新 ("patched")；
+    - model：用于解析校验下载的文件 (VocabModel.parse_wordlist_file，不改变当前词库)；
+    - progress(received, total)：下载进度，cancel_event：取消下载 (已下载的部分保留，下次继续)。
+    """
+    info = info or {}
+    published = (info.get("sha256") or "").lower()
+    manifest = load_manifest()
+    entry = manifest.get(name) if local_file(name, manifest) else None
+    if entry and _is_current(entry, info):
+        return "unchanged"  # 与发布的版本一致，无需访问网络
+    if entry and entry.get("version") is not None and info.get("version") is not None:
+        chain = _patch_chain(info, entry["version"])
+        if chain:
+            try:
+                return _install_patches(model, name, entry, info, chain, base_url)
+            except (requests.exceptions.RequestException, DownloadIntegrityError, ValueError, OSError) as e:
+                print(f"增量更新 {name} 失败，改为完整下载: {e}")
+
+    headers = {}
+    if entry and not published:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    response_headers = CaseInsensitiveDict()
+    part_path = library_path(name) + ".part"
+    os.makedirs(LIBRARY_DIR, exist_ok=True)
+    try:
+        path = download_resumable(file_url(name, base_url), part_path, progress=progress, cancel_event=cancel_event,
+                                  expected_sha256=published or None, headers=headers,
+                                  response_headers=response_headers)
+    except DownloadCancelled:
+        return "cancelled"
+    except DownloadIntegrityError as e:
+        return f"failed: 校验失败 ({e})"
+    except requests.exceptions.RequestException as e:
+        return f"failed: {e}"
+    if path is None:
+        return "unchanged"
+
+    # 校验：能解析出单词才安装到库中 (同时预先生成解析缓存，切换词库时直接命中)
+    words = model.parse_wordlist_file(path, name)
+    if not words:
+        os.remove(path)
+        return "failed: 文件格式错误或内容为空"
+    target = library_path(name)
+    codec = model.settings.get("library_codec", storage_codec.NONE)
+    sha256 = published or file_sha256(path)
+    if codec == storage_codec.NONE:
+        os.replace(path, target)
+    else:
+        # 按设置压缩后存入库中；压缩后的文件字节不同，解析缓存也要按新文件记录
+        storage_codec.compress_file(path, target, codec)
+        os.remove(path)
+        model.cache_parsed_wordlist(target, [(w.word, w.definition, w.pos, w.example) for w in words], name)
+    new_entry = {
+        "sha256": sha256,  # 未压缩内容的 SHA-256
+        "size": os.path.getsize(target),  # 库中文件 (可能已压缩) 的大小
+        "words": len(words),
+        "version": info.get("version"),
+        "codec": codec,
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+        "synced": int(time.time()),
+    }
+    _update_manifest(name, new_entry)
+    return "downloaded"
+
+
+def sync_library(model, catalog=None, base_url=BASE_URL, workers=SYNC_WORKERS, progress=None, cancel_event=None):
+    """
+    把 catalog ({文件名: 发布信息} 或文件名列表，默认为远程词库目录) 中的词库全部安装到本地词库库，
+    返回 {文件名: 结果} (结果见 install)。
+    - progress(done, total, name)：每完成一个文件调用一次 (在工作线程中调用)；
+    - cancel_event：被设置后正在下载的文件在下一块数据到达时停止，尚未开始的文件直接跳过。
+    """
+    if catalog is None:
+        catalog = fetch_catalog()
+    elif not isinstance(catalog, dict):
+        catalog = {name: {} for name in catalog}
+    names = list(catalog)
+    lock = threading.Lock()
+    results = {}
+    done = [0]
+
+    def run(name):
+        if cancel_event is not None and cancel_event.is_set():
+            result = "cancelled"
+        else:
+            try:
+                result = install(model, name, catalog[name], base_url, cancel_event=cancel_event)
+            except Exception as e:
+                result = f"failed: {e}"
+        with lock:
+            results[name] = result
+            done[0] += 1
+            count = done[0]
+        print(f"同步词库 {name}: {result}")
+        if progress:
+            progress(count, len(names), name)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(run, names))
+    return {name: results[name] for name in names}
+
+
+def _write_published(manifest_path, manifest, entries):
+    manifest["wordlists"] = [dict(name=name, **info) if info else name for name, info in entries.items()]
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def _read_published(manifest_path):
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest, catalog_entries(manifest.get("wordlists")) or {name: {} for name in CATALOG}
+
+
+def publish(directory, manifest_path="update_manifest.json"):
+    """
+    发布词库：计算 directory 中每个词库文件的 SHA-256 和大小，写入更新清单的 wordlists 字段。
+    内容变化的词库版本号加一 (首次发布为 1)，已有的补丁列表保留。
+    清单中已有而目录中没有的词库保留原有条目 (没有条目时按 CATALOG 补上文件名)。
+    """
+    manifest, entries = _read_published(manifest_path)
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path) and name.lower().endswith((".json", ".csv")):
+            old = entries.get(name, {})
+            info = dict(old, sha256=file_sha256(path), size=os.path.getsize(path))
+            if "version" not in old:
+                info["version"] = 1
+            elif old.get("sha256") != info["sha256"]:
+                info["version"] = old["version"] + 1
+            entries[name] = info
+    _write_published(manifest_path, manifest, entries)
+    return entries
+
+
+def publish_patch(model, old_path, new_path, manifest_path="update_manifest.json"):
+    """
+    为词库发布增量补丁：比较旧版本文件 old_path 与新版本文件 new_path (位于词库目录中，文件名即词库名)，
+    把补丁写入词库目录下的 PATCH_DIR，并在更新清单中把该词库的版本号加一、登记补丁和新文件的 SHA-256。
+    old_path 必须是清单中当前发布的版本。返回补丁内容。
+    """
+    name = os.path.basename(new_path)
+    manifest, entries = _read_published(manifest_path)
+    old = entries.get(name, {})
+    if old.get("sha256") and old["sha256"] != file_sha256(old_path):
+        raise ValueError(f"{old_path} 不是更新清单中发布的 {name}")
+    old_entries = [(w.word, w.definition, w.pos, w.example) for w in model.parse_wordlist_file(old_path, name)]
+    new_entries = [(w.word, w.definition, w.pos, w.example) for w in model.parse_wordlist_file(new_path, name)]
+    if not old_entries or not new_entries:
+        raise ValueError("词库文件格式错误或内容为空")
+
+    source = old.get("version", 1)
+    target = source + 1
+    patch = wordlist_patch.make_patch(old_entries, new_entries)
+    patch["name"] = name
+    patch["from"]["version"] = source
+    patch["to"]["version"] = target
+    data = json.dumps(patch, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    relative = f"{PATCH_DIR}/{name}.v{source}-v{target}.patch.json"
+    patch_path = os.path.join(os.path.dirname(new_path), PATCH_DIR, os.path.basename(relative))
+    os.makedirs(os.path.dirname(patch_path), exist_ok=True)
+    with open(patch_path, "wb") as f:
+        f.write(data)
+
+    patches = [p for p in old.get("patches", ()) if p.get("from") != source]
+    patches.append({"from": source, "to": target, "file": relative, "sha256": hashlib.sha256(data).hexdigest(),
+                    "size": len(data)})
+    entries[name] = dict(old, sha256=file_sha256(new_path), size=os.path.getsize(new_path), version=target,
+                         patches=patches)
+    _write_published(manifest_path, manifest, entries)
+    return patch
+
+
+if __name__ == "__main__":
+    # 用法：python library.py publish [词库目录，默认 词库] [更新清单，默认 update_manifest.json]
+    #       python library.py patch <旧版本文件> <新版本文件 (词库目录中)> [更新清单，默认 update_manifest.json]
+    import sys
+    args = sys.argv[1:]
+    if args and args[0] == "publish":
+        published = publish(args[1] if len(args) > 1 else "词库", args[2] if len(args) > 2 else "update_manifest.json")
+        for name, info in published.items():
+            print(f"{name}: v{info.get('version', '?')} {info.get('sha256', '(未发布校验值)')}")
+    elif len(args) >= 3 and args[0] == "patch":
+        patch = publish_patch(VocabModel(), args[1], args[2], args[3] if len(args) > 3 else "update_manifest.json")
+        print(f"{patch['name']}: v{patch['from']['version']} -> v{patch['to']['version']}，"
+              f"删除 {len(patch['removed'])}，修改 {len(patch['changed'])}，新增 {len(patch['added'])}")
+    else:
+        print("用法: python library.py publish [词库目录] [更新清单]\n"
+              "      python library.py patch <旧版本文件> <新版本文件> [更新清单]")
+        sys.exit(1)
@@ -1,16 +1,21 @@
-import sys, os
+import sys, os, time
+
+# 进程启动时刻，启动计时以此为起点 (在导入 PySide6 之前记录，导入耗时也计入窗口显示时间)
+PROCESS_START = time.perf_counter()
+
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
     QLabel, QPushButton, QGridLayout, QHBoxLayout, QMessageBox
 )
 # ✅ 修改：导入 QThread 和 Signal/Slot 机制所需的 QObject, Signal, Slot
-from PySide6.QtCore import Qt, QPropertyAnimation, QRect, QUrl, QThread, QObject, Signal, Slot
+from PySide6.QtCore import Qt, QPropertyAnimation, QRect, QUrl, QThread, QObject, Signal, Slot, QTimer
 from PySide6.QtGui import QFont, QDesktopServices
 # ✅ 新增：导入 json 库用于解析远程更新清单
 import json
 import requests
+import http_client
 # 假设 vocab_model 存在
-from vocab_model import VocabModel  # , WordItem
+from vocab_model import VocabModel, create_model  # , WordItem
 from learn_window import LearnWindow
 from review_window import ReviewWindow
 from test_window import TestWindow
@@ -34,9 +39,9 @@ class UpdateChecker(QObject):
         manifest_url = "https://raw.githubusercontent.com/Junpgle/LearnWord/refs/heads/master/update_manifest.json"
 
         try:
-            # 实际网络请求，设置超时 5 秒
-            response = requests.get(manifest_url, timeout=5)
-            response.raise_for_status()  # 对 4xx 或 5xx 状态码抛出异常
+            # 通过共享连接池发送条件请求 (超时 5 秒)：清单未变化时服务器返回 304，直接使用本地缓存；
+            # 网络不可用时使用上次缓存的清单，4xx 或 5xx 状态码且没有缓存时抛出异常
+            response = http_client.fetch(manifest_url, timeout=5)
 
             # 解析 JSON 响应
             manifest = response.json()
@@ -62,20 +67,83 @@ class AnnouncementLoader(QObject):
     def run_load(self):
         url = "https://raw.githubusercontent.com/Junpgle/LearnWord/refs/heads/master/announcement.json"
         try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
+            # 公告变化不频繁：缓存一小时内不访问网络，过期后发送条件请求
+            response = http_client.fetch(url, max_age=http_client.ANNOUNCEMENT_MAX_AGE, timeout=5)
             data = response.json()
             self.signal_result.emit(True, data)
         except Exception as e:
             self.signal_result.emit(False, f"加载公告失败：{e}")
 
 # =================================================================
-# 3. 主窗口类：MainWindow
+# 3. 后台线程类：启动时加载进度和词库，本地没有词库时再从网络下载
+# =================================================================
+class DataLoader(QObject):
+    signal_status = Signal(str)  # 加载状态提示，显示在主窗口中
+    signal_result = Signal(bool, object)  # (success, 加载途径 model.startup_source)
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def run_load(self):
+        try:
+            # 先只使用本地数据 (进度文件、上次词库、默认词库文件)
+            ok = self.model.load_all_data(allow_network=False)
+            if not ok:
+                self.signal_status.emit("本地没有可用的词库，正在从网络下载默认词库...")
+                ok = self.model.fetch_default_wordlist()
+            self.signal_result.emit(ok, self.model.startup_source)
+        except Exception as e:
+            print(f"启动加载数据时发生错误: {e}")
+            self.signal_result.emit(False, "failed")
+
+
+class StartupTimer:
+    """
+    启动计时：记录从进程启动到各个阶段 (窗口显示、第一次进入事件循环、数据加载完成) 的耗时，
+    全部阶段结束后打印汇总并追加到 data/startup_times.jsonl，便于按加载途径比较启动速度。
+    """
+    log_path = os.path.join("data", "startup_times.jsonl")
+
+    def __init__(self, start=PROCESS_START):
+        self.start = start
+        self.marks = {}
+        self.result = None  # (加载途径, 单词数)，数据加载完成后设置
+
+    def mark(self, name):
+        self.marks[name] = round((time.perf_counter() - self.start) * 1000, 1)
+        self._report()
+
+    def finish(self, source, words):
+        self.mark("data_loaded")
+        self.result = (source, words)
+        self._report()
+
+    def _report(self):
+        # 数据可能在窗口第一次绘制之前就加载完成，两者都结束后才输出
+        if self.result is None or "first_frame" not in self.marks:
+            return
+        source, words = self.result
+        self.result = None
+        print("启动计时 (ms): " + ", ".join(f"{k} {v}" for k, v in self.marks.items()) + f" (加载途径: {source})")
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                record = {"time": int(time.time()), "source": source, "words": words, **self.marks}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"写入启动计时失败: {e}")
+
+
+# =================================================================
+# 4. 主窗口类：MainWindow
 # =================================================================
 class MainWindow(QMainWindow):
-    def __init__(self, model: VocabModel):
+    def __init__(self, model: VocabModel, startup_timer=None):
         super().__init__()
         self.model = model
+        self.startup_timer = startup_timer
+        self.data_ready = False  # 后台数据加载是否已经结束
         self.setWindowTitle("LearnWord")
         self.setFixedSize(1000, 700)
         self.central = QWidget()
@@ -124,6 +192,12 @@ class MainWindow(QMainWindow):
         self.layout.addLayout(top_bar_layout)
         # ----------------------------------------------------
 
+        # 加载状态提示：数据在后台加载，加载完成前显示
+        self.status_label = QLabel("正在加载学习进度...")
+        self.status_label.setObjectName("status_label")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.status_label)
+
         self.layout.addSpacing(30)
 
         # 添加垂直弹簧，将所有内容向下推动 (现在用于将网格推到中央)
@@ -246,13 +320,81 @@ class MainWindow(QMainWindow):
             #about_btn:hover {
                 background-color: #c0392b;
             }
+
+            /* 加载状态提示 */
+            #status_label {
+                color: #aaaaaa;
+                font-size: 14px;
+            }
+
+            /* 加载中禁用的按钮 */
+            QPushButton:disabled {
+                background-color: #333333;
+                color: #777777;
+            }
         """)
         # ----------------------------------------------------
 
-        # 在初始化结束时自动获取公告和检查更新
+        # 数据加载完成前禁用模式按钮
+        for b in [self.btn_learn, self.btn_review, self.btn_test, self.btn_setting]:
+            b.setEnabled(False)
+
+        # 在初始化结束时开始后台加载数据，并自动获取公告和检查更新
+        self._start_data_load()
         self._start_announcement_load()
         self._start_update_check()
 
+    @Slot()
+    def _start_data_load(self):
+        """启动后台线程加载进度和词库，窗口先显示加载状态"""
+        self.load_thread = QThread()
+        self.load_worker = DataLoader(self.model)
+        self.load_worker.moveToThread(self.load_thread)
+
+        self.load_thread.started.connect(self.load_worker.run_load)
+        self.load_worker.signal_status.connect(self.status_label.setText)
+        self.load_worker.signal_result.connect(self._handle_data_loaded)
+        self.load_worker.signal_result.connect(self.load_thread.quit)
+        self.load_thread.finished.connect(self.load_thread.deleteLater)
+        self.load_worker.signal_result.connect(self.load_worker.deleteLater)
+
+        self.load_thread.start()
+
+    @Slot(bool, object)
+    def _handle_data_loaded(self, success: bool, source: object):
+        """数据加载完成：启用按钮；没有加载到任何单词时提示用户在设置中导入词库"""
+        self.data_ready = True
+        for b in [self.btn_learn, self.btn_review, self.btn_test, self.btn_setting]:
+            b.setEnabled(True)
+
+        if self.startup_timer is not None:
+            self.startup_timer.finish(source, len(self.model.words))
+
+        if success and self.model.words:
+            self.status_label.hide()
+            return
+
+        self.status_label.setText("未能加载任何单词，请在“设置”中导入词库。")
+        QMessageBox.critical(
+            self,
+            "加载失败",
+            "未能加载任何单词。请确保 '六级.csv' 文件存在且格式正确，或在设置中导入其他词库。",
+            QMessageBox.Ok
+        )
+
+    def wait_for_data(self):
+        """等待后台数据加载结束 (程序退出时调用，避免线程仍在运行时退出)"""
+        if not self.data_ready:
+            self.load_thread.quit()
+            self.load_thread.wait()
+
+    def _has_words(self):
+        """学习、复习、测试前检查是否已有单词"""
+        if self.model.words:
+            return True
+        QMessageBox.warning(self, "没有单词", "当前没有可用的单词，请先在“设置”中导入词库。")
+        return False
+
     def _load_announcement_state(self):
         """从本地文件加载已读公告 ID 列表"""
         state_file = "data/announcement_state.json"
@@ -284,6 +426,8 @@ class MainWindow(QMainWindow):
 
     def open_learn(self):
         """打开学习窗口"""
+        if not self._has_words():
+            return
         if self.learn_win is None or not self.learn_win.isVisible():
             # 每次打开前加载最新进度，确保学习数据是最新的
             self.model.load_progress()
@@ -294,6 +438,8 @@ class MainWindow(QMainWindow):
 
     def open_review(self):
         """打开复习窗口"""
+        if not self._has_words():
+            return
         if self.review_win is None or not self.review_win.isVisible():
             # 每次打开前加载最新进度
             self.model.load_progress()
@@ -304,6 +450,8 @@ class MainWindow(QMainWindow):
 
     def open_test(self):
         """打开测试窗口"""
+        if not self._has_words():
+            return
         if self.test_win is None or not self.test_win.isVisible():
             # 每次打开前加载最新进度
             self.model.load_progress()
@@ -610,25 +758,25 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setFont(QFont("MiSans", 11, QFont.Bold))
 
-    # 初始化数据模型
-    model = VocabModel()
+    # 初始化数据模型 (存在 data/vocab.db 时使用 SQLite 后端)；进度和词库由主窗口在后台线程中加载
+    model = create_model()
+    startup_timer = StartupTimer()
+    startup_timer.mark("qt_ready")
 
-    # 🚨 关键修改：调用统一的加载方法，实现自动加载和默认词库的兜底逻辑
-    model.load_all_data()
+    # 退出前等待后台加载结束，写完后台未保存的修改，并将进度增量日志合并回进度快照 (data/progress.bin)
+    def _on_quit():
+        mw.wait_for_data()
+        model.checkpoint()
+        print(f"进度保存统计: {model.save_stats()}")
 
-    # 检查是否成功加载了单词
-    if not model.words:
-        QMessageBox.critical(
-            None,
-            "致命错误",
-            "未能加载任何单词。请确保 '六级.csv' 文件存在且格式正确，或导入其他词库。",
-            QMessageBox.Ok
-        )
-        sys.exit(1)
+    app.aboutToQuit.connect(_on_quit)
 
-    # 创建并显示主窗口
-    mw = MainWindow(model)
+    # 创建并立即显示主窗口 (显示加载状态，数据加载完成后启用按钮)
+    mw = MainWindow(model, startup_timer)
     mw.show()
+    startup_timer.mark("window_shown")
+    # 事件循环开始后第一次处理定时器时，窗口已完成首次绘制
+    QTimer.singleShot(0, lambda: startup_timer.mark("first_frame"))
 
     # 执行应用
     sys.exit(app.exec())
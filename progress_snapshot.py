@@ -0,0 +1,99 @@
+import json, struct
+from array import array
+
+# 二进制进度快照 (data/progress.bin)：
+# 文件头 (魔数、格式版本、元数据长度、记录数) + 元数据 JSON + 定长状态记录 + 单词 id 字符串表。
+# 只保存状态不是默认值的单词；元数据包含词典信息、词库名称、设置和增量日志批次号。
+MAGIC = b"LWPS"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHII")
+# 每条记录：单词在词典中的下标 (uint32)、stage (uint16)、attempts (uint32)、标志位 (uint8)、
+# 复习计划的难度系数 (uint16，千分之一)、间隔天数 (uint32)、下次复习时间 (uint32，Unix 秒)
+RECORD = struct.Struct("<IHIBHII")
+# 版本 1 的记录没有复习计划字段，读取时按默认值补齐 (难度系数 2.5，未排计划)
+RECORD_V1 = struct.Struct("<IHIB")
+V1_SCHEDULE = (2500, 0, 0)
+
+FLAG_LEARNED = 1
+FLAG_REVIEWED = 2
+FLAG_TESTED = 4
+
+_STAGE_MAX = 0xFFFF
+_ATTEMPTS_MAX = 0xFFFFFFFF
+_EASE_MAX = 0xFFFF
+
+
+def is_snapshot(raw):
+    """raw (文件开头的字节) 是否为二进制进度快照。"""
+    return raw[:len(MAGIC)] == MAGIC
+
+
+def dumps(meta, records, ids):
+    """
+    生成快照字节串。
+    records: [(下标, stage, attempts, 标志位, 难度系数千分值, 间隔天数, 下次复习时间), ...]；
+    ids: 与 records 一一对应的单词 id，
+    词库文件发生变化时按 id 匹配恢复状态。
+    """
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body = bytearray(RECORD.size * len(records))
+    offset = 0
+    for index, stage, attempts, flags, ease, interval, due in records:
+        RECORD.pack_into(body, offset, index, min(stage, _STAGE_MAX), min(attempts, _ATTEMPTS_MAX), flags,
+                         min(ease, _EASE_MAX), interval, due)
+        offset += RECORD.size
+    lengths = array("I", (len(s) for s in ids))
+    return b"".join((
+        HEADER.pack(MAGIC, FORMAT_VERSION, len(meta_bytes), len(records)),
+        meta_bytes,
+        bytes(body),
+        lengths.tobytes(),
+        "".join(ids).encode("utf-8"),
+    ))
+
+
+class Snapshot:
+    """已解析的快照：meta 为元数据字典，records 为定长记录元组列表，单词 id 表按需解码。"""
+
+    def __init__(self, meta, records, raw, ids_offset):
+        self.meta = meta
+        self.records = records
+        self._raw = raw
+        self._ids_offset = ids_offset
+
+    def ids(self):
+        """解码单词 id 字符串表，与 records 一一对应。只有词库文件变化时才需要。"""
+        n = len(self.records)
+        lengths = array("I")
+        end = self._ids_offset + n * lengths.itemsize
+        lengths.frombytes(self._raw[self._ids_offset:end])
+        text = self._raw[end:].decode("utf-8")
+        ids = []
+        pos = 0
+        for length in lengths:
+            ids.append(text[pos:pos + length])
+            pos += length
+        return ids
+
+
+def loads(raw):
+    """解析快照字节串；格式或版本不符时抛出 ValueError。"""
+    try:
+        magic, version, meta_len, count = HEADER.unpack_from(raw, 0)
+    except struct.error:
+        raise ValueError("进度快照文件不完整")
+    if magic != MAGIC:
+        raise ValueError("不是二进制进度快照")
+    if version not in (1, FORMAT_VERSION):
+        raise ValueError(f"不支持的进度快照版本: {version}")
+    record = RECORD if version == FORMAT_VERSION else RECORD_V1
+
+    meta_end = HEADER.size + meta_len
+    records_end = meta_end + count * record.size
+    if len(raw) < records_end + count * array("I").itemsize:
+        raise ValueError("进度快照文件不完整")
+    meta = json.loads(raw[HEADER.size:meta_end].decode("utf-8"))
+    records = list(record.iter_unpack(raw[meta_end:records_end]))
+    if version == 1:
+        records = [r + V1_SCHEDULE for r in records]
+    return Snapshot(meta, records, raw, records_end)
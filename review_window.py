@@ -1,15 +1,16 @@
-import random, os
+import os
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QLineEdit, \
-    QMessageBox
+    QMessageBox, QCheckBox
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 from vocab_model import VocabModel  # 导入核心数据模型
+from session import ReviewSession, RECOGNIZE, SPELL
 
 
 class ReviewWindow(QMainWindow):
     """
     复习窗口：实现两阶段复习模式 (识别 -> 拼写)，主要针对 learned=True 的单词，
-    目标是更新单词的 reviewed 状态和 stage 进度。
+    目标是更新单词的 reviewed 状态和 stage 进度，并按回答结果更新复习计划 (scheduler.py, SM-2)。
     """
 
     def __init__(self, model: VocabModel, parent=None):
@@ -39,6 +40,11 @@ class ReviewWindow(QMainWindow):
         # 1. 返回按钮
         btn_row = QHBoxLayout();
         btn_row.addStretch()
+        # 困难模式：拼写阶段挖去区分形近词的字母 (与学习窗口共用同一设置)
+        self.hard_check = QCheckBox("困难干扰项")
+        self.hard_check.setChecked(bool(self.model.settings.get("hard_distractors", False)))
+        self.hard_check.toggled.connect(self._toggle_hard_distractors)
+        btn_row.addWidget(self.hard_check)
         self.btn_return = QPushButton("返回主页面");
         self.btn_return.setObjectName("return_btn")  # 设置对象名
         btn_row.addWidget(self.btn_return);
@@ -111,7 +117,7 @@ class ReviewWindow(QMainWindow):
         self.idk_btn.clicked.connect(self.on_idk)  # 我不会 -> 放弃拼写，阶段重置，放回队列尾
 
         # 队列和当前单词初始化
-        self.queue = []  # 复习队列，存储 WordItem 对象
+        self.session = None  # 复习流程 (ReviewSession)：选词、出题和根据答案更新单词状态及复习计划
         self.current = None  # 当前正在复习的 WordItem
         self._prepare_and_start()  # 准备复习单词并开始
 
@@ -174,27 +180,22 @@ class ReviewWindow(QMainWindow):
             }
         """)
 
+    def closeEvent(self, event):
+        """关闭窗口前等待后台保存完成，确保本次的进度已写入磁盘。"""
+        self.model.flush()
+        super().closeEvent(event)
+
     def _prepare_and_start(self):
         """
-        准备复习队列：优先选择 learned=True 的单词，数量由设置决定。
+        准备复习队列：由 ReviewSession 选择已到期的单词 (按到期时间从早到晚)，数量由设置决定。
         """
-        count = self.model.settings.get("review_count", 15)
-        # 过滤出所有单词
-        pool = self.model.words  # 直接使用模型的 words 列表
-        # 优先复习已学过的单词
-        learned_pool = [w for w in pool if w.learned]
-
-        # 如果有已学单词，则复习已学单词；否则，复习整个词库
-        use_pool = learned_pool if learned_pool else pool
+        self.session = ReviewSession(self.model, hard=self.hard_check.isChecked())
 
-        if not use_pool:
+        if self.session.finished:
             QMessageBox.information(self, "提示", "词库为空。")
             QTimer.singleShot(100, self.close)
             return
 
-        random.shuffle(use_pool)
-        # 截取设置的复习数量
-        self.queue = use_pool[:min(count, len(use_pool))]
         self._show_next()
 
     def keyPressEvent(self, event):
@@ -232,7 +233,9 @@ class ReviewWindow(QMainWindow):
         """
         显示下一个单词，或结束复习。
         """
-        if not self.queue:
+        question = self.session.next_question()
+        if question is None:
+            self.current = None
             self.word_label.setText("🎉 本次复习完成！ 🎉")
             self.phase2_widget.hide()
             self.phase3_widget.hide()
@@ -240,8 +243,8 @@ class ReviewWindow(QMainWindow):
             QTimer.singleShot(3000, self.close)
             return
 
-        # 弹出下一个单词，进入阶段一：识别
-        self.current = self.queue.pop(0)
+        # 进入阶段一：识别
+        self.current = question.item
         self.word_label.setText(self.current.word)
 
         # 显示阶段一的控件
@@ -253,8 +256,11 @@ class ReviewWindow(QMainWindow):
     def on_know(self):
         """
         用户点击“认识”：进入阶段二（拼写/回忆）。
+        复习计划在拼写结果出来后 (on_submit / on_idk) 再更新。
         """
-        if not self.current: return
+        if not self._awaiting(RECOGNIZE): return
+        self.session.answer(True)
+        question = self.session.next_question()  # 同一单词的拼写题
 
         self.phase2_widget.hide()
         self.phase3_widget.show()
@@ -262,7 +268,7 @@ class ReviewWindow(QMainWindow):
 
         # 阶段二显示释义和填空提示
         self.word_label.setText(f"{self.current.pos}. {self.current.definition}")
-        self.cloze.setText(self._make_cloze(self.current.word))
+        self.cloze.setText(question.cloze)
         self.input.setText("")
         self.input.setFocus()
 
@@ -270,80 +276,47 @@ class ReviewWindow(QMainWindow):
         """
         用户点击“不认识”：复习失败，将单词重新放回队列尾部，等待下一轮复习。
         """
-        if not self.current: return
-
-        # 状态重置/调整：让它在下一轮复习中重新开始
-        self.current.stage = 1
-        self.current.attempts += 1  # 可用于统计
-
-        # 放回队列尾部
-        self.queue.append(self.current);
-        self.model.save_progress()  # 保存状态变化
+        if not self._awaiting(RECOGNIZE): return
 
+        # 阶段重置并按“完全不认识”更新复习计划，单词放回队列尾部
+        self.session.answer(False)
         self._show_next()
 
     def on_submit(self):
         """
         用户在阶段二提交拼写答案。
         """
-        if not self.current: return
-        s = self.input.text().strip()
+        if not self._awaiting(SPELL): return
 
-        if s.lower() == self.current.word.lower():
-            # 拼写正确
+        feedback = self.session.answer(self.input.text())
+        if feedback.correct:
+            # 拼写正确：标记为已复习，阶段提升，按本次是否答错过评分
             QMessageBox.information(self, "正确", "拼写正确！")
-
-            # 更新状态：标记为已复习，并确保 learned 状态 (尽管通常从 learned pool 来)
-            self.current.learned = True
-            self.current.reviewed = True  # ✅ 标记为已成功复习
-
-            # 阶段可以向上提升，最高到 3 (stage=3 通常表示已完成所有学习/测试步骤)
-            self.current.stage = min(3, self.current.stage + 1)
-
-            self.model.save_progress()
             QTimer.singleShot(200, self._show_next)  # 自动前进
         else:
-            # 拼写错误
-            QMessageBox.information(self, "错误", f"正确答案: {self.current.word}")
-
-            # 状态重置：将单词阶段重置为 1，放回队列重新开始
-            self.current.stage = 1
-            self.queue.append(self.current)
-
-            self.model.save_progress()
+            # 拼写错误：阶段重置，放回队列重新开始
+            QMessageBox.information(self, "错误", f"正确答案: {feedback.expected}")
             QTimer.singleShot(100, self._show_next)  # 自动前进
 
     def on_idk(self):
         """
         用户点击“我不会”：相当于拼写失败，重置状态并放回队列。
         """
-        if not self.current: return
+        if not self._awaiting(SPELL): return
 
+        feedback = self.session.answer(None)
         # 显示正确答案
-        QMessageBox.information(self, "提示", f"正确答案是: {self.current.word}")
-
-        # 状态重置：重置阶段，放回队列
-        self.current.stage = 1
-        self.queue.append(self.current)
-
-        self.model.save_progress()
+        QMessageBox.information(self, "提示", f"正确答案是: {feedback.expected}")
         QTimer.singleShot(200, self._show_next)
 
-    def _make_cloze(self, word):
-        """
-        生成填空提示，随机将单词的部分字母替换为下划线。
-        - 至少替换 1 个字母。
-        - 最多替换单词长度的一半。
-        """
-        chars = list(word)
-        import random as _r
-        if len(chars) == 0: return ""
-
-        # 随机确定要替换的字母数量 n
-        n = max(1, min(len(chars) - 1, _r.randint(1, max(1, len(chars) // 2))))
-
-        # 随机选择要替换的字母索引
-        idxs = _r.sample(range(len(chars)), n)
-
-        # 生成填空字符串，用空格分隔字母和下划线
-        return " ".join([("_" if i in idxs else c) for i, c in enumerate(chars)])
+    def _awaiting(self, kind):
+        """当前是否有等待回答的 kind 类型题目 (答题后到显示下一题之间的重复操作会被忽略)。"""
+        question = self.session.current if self.session else None
+        return question is not None and question.kind == kind
+
+    def _toggle_hard_distractors(self, checked):
+        """切换困难干扰项模式并保存到设置，本次复习中之后出的题立即生效。"""
+        self.model.settings["hard_distractors"] = checked
+        self.model.save_settings()
+        if self.session:
+            self.session.hard = checked
@@ -0,0 +1,92 @@
+import threading, time
+
+
+class SaveWorker:
+    """
+    后台保存线程：接收“有数据需要保存”的通知，把短时间内的多次通知合并成一次写入。
+    write_fn 在后台线程中执行，必须自行保证写入是原子的。
+    """
+
+    def __init__(self, write_fn, delay=0.3):
+        self._write_fn = write_fn
+        self.delay = delay  # 合并窗口 (秒)：第一次通知后最多等待这么久再写入
+        self._cond = threading.Condition()
+        self._dirty = False  # 是否有尚未写入的修改
+        self._dirty_since = 0.0  # 第一条未写入通知的时间
+        self._writing = False  # 后台线程是否正在写入
+        self._flush_requested = False  # flush() 要求立即写入，跳过合并窗口
+
+        # 统计信息，用于验证连续答题时的合并效果
+        self.notify_count = 0  # 收到的保存通知次数
+        self.save_count = 0  # 实际写入次数
+        self.error_count = 0  # 写入失败次数
+        self.last_duration = 0.0  # 最近一次写入耗时 (秒)
+        self.max_duration = 0.0  # 最长一次写入耗时 (秒)
+        self.total_duration = 0.0  # 累计写入耗时 (秒)
+
+        self._thread = threading.Thread(target=self._run, name="SaveWorker", daemon=True)
+        self._thread.start()
+
+    def notify(self):
+        """标记有新的修改需要保存，立即返回。"""
+        with self._cond:
+            if not self._dirty:
+                self._dirty = True
+                self._dirty_since = time.monotonic()
+            self.notify_count += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        立即写入所有未保存的修改，并等待写入完成。
+        返回 True 表示已全部写入，False 表示等待超时。
+        """
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(lambda: not self._dirty and not self._writing, timeout)
+            self._flush_requested = False
+            return done
+
+    def stats(self):
+        """返回保存统计：通知次数、写入次数、被合并的通知数和写入耗时 (毫秒)。"""
+        with self._cond:
+            saves = self.save_count
+            return {
+                "notifications": self.notify_count,
+                "saves": saves,
+                "coalesced": max(0, self.notify_count - saves),
+                "errors": self.error_count,
+                "last_ms": round(self.last_duration * 1000, 3),
+                "max_ms": round(self.max_duration * 1000, 3),
+                "avg_ms": round(self.total_duration / saves * 1000, 3) if saves else 0.0,
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty)
+                # 在合并窗口内继续收集通知，flush() 时立即写入
+                while not self._flush_requested:
+                    remaining = self._dirty_since + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._dirty = False
+                self._writing = True
+
+            start = time.perf_counter()
+            try:
+                self._write_fn()
+            except Exception as e:
+                print(f"后台保存进度失败: {e}")
+                self.error_count += 1
+            duration = time.perf_counter() - start
+
+            with self._cond:
+                self._writing = False
+                self.save_count += 1
+                self.last_duration = duration
+                self.max_duration = max(self.max_duration, duration)
+                self.total_duration += duration
+                self._cond.notify_all()
@@ -0,0 +1,93 @@
+import heapq, time
+
+# SM-2 间隔重复算法：每个单词保存难度系数 (ease)、当前间隔 (interval，天) 和下次复习时间 (due，Unix 秒)。
+# 回答质量 quality 取 0-5：小于 3 视为遗忘，间隔清零并在 RELEARN_DELAY 后重新复习；
+# 否则间隔依次为 1 天、6 天、之后每次乘以 ease。ease 按回答质量调整，最小为 MIN_EASE。
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+DAY_SECONDS = 24 * 60 * 60
+RELEARN_DELAY = 10 * 60  # 遗忘后重新复习的延迟 (秒)
+MAX_INTERVAL = 36500  # 间隔上限 (天)
+
+# 界面中各操作对应的回答质量
+QUALITY_GOOD = 4  # 认识并拼写正确
+QUALITY_HARD = 3  # 拼写正确，但本次复习中曾经答错
+QUALITY_WRONG = 2  # 认识但拼写错误
+QUALITY_FORGOT = 1  # 拼写时选择“我不会”
+QUALITY_BLACKOUT = 0  # 完全不认识
+
+
+def next_ease(ease, quality):
+    """SM-2 的难度系数更新公式。"""
+    q = 5 - quality
+    return max(MIN_EASE, ease + 0.1 - q * (0.08 + q * 0.02))
+
+
+def next_interval(interval, ease, quality):
+    """回答质量为 quality 时的下一个间隔 (天)；0 表示需要在当天重新复习。"""
+    if quality < 3:
+        return 0
+    if interval <= 0:
+        return 1
+    if interval == 1:
+        return 6
+    return min(MAX_INTERVAL, max(interval + 1, round(interval * ease)))
+
+
+def review(item, quality, now=None):
+    """按回答质量更新 item 的 ease、interval 和 due。"""
+    now = int(time.time() if now is None else now)
+    interval = next_interval(item.interval, item.ease, quality)
+    item.ease = next_ease(item.ease, quality)
+    item.interval = interval
+    item.due = now + (interval * DAY_SECONDS if interval else RELEARN_DELAY)
+
+
+class DueIndex:
+    """
+    到期时间索引：按 (due, 行号) 排序的最小堆，只包含已学完的单词。
+    due 为 0 的单词 (旧版进度文件迁移而来，尚未排过复习计划) 排在最前面，视为已经到期。
+    单词的 due 改变或不再是已学完时不从堆中删除旧条目，而是在取出时与列式存储中的当前值比对后丢弃 (惰性删除)；
+    失效条目过多时整体重建。取出最早到期的 k 个单词的耗时为 O(k log n)。
+    """
+
+    def __init__(self, columns, learned_bit):
+        self._columns = columns
+        self._learned_bit = learned_bit
+        self._heap = []
+        self.rebuild()
+
+    def rebuild(self):
+        flags = self._columns.flags
+        bit = self._learned_bit
+        self._heap = [(due, i) for i, due in enumerate(self._columns.due) if flags[i] & bit]
+        heapq.heapify(self._heap)
+
+    def push(self, index):
+        """行 index 的 due 发生变化或刚成为已学完时调用。"""
+        heapq.heappush(self._heap, (self._columns.due[index], index))
+        if len(self._heap) > 2 * len(self._columns) + 64:
+            self.rebuild()
+
+    def _valid(self, entry):
+        due, index = entry
+        return self._columns.flags[index] & self._learned_bit and self._columns.due[index] == due
+
+    def earliest(self, count, until=None):
+        """按到期时间先后返回最多 count 个行号；给定 until 时只返回 due <= until 的行。"""
+        heap = self._heap
+        taken = []
+        rows = []
+        seen = set()
+        while heap and len(rows) < count:
+            entry = heapq.heappop(heap)
+            if not self._valid(entry) or entry[1] in seen:
+                continue  # 失效或重复的条目直接丢弃
+            taken.append(entry)
+            if until is not None and entry[0] > until:
+                break
+            seen.add(entry[1])
+            rows.append(entry[1])
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return rows
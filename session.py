@@ -0,0 +1,298 @@
+import random
+from collections import deque
+
+from distractor_pool import option_text
+from scheduler import QUALITY_GOOD, QUALITY_HARD, QUALITY_WRONG, QUALITY_FORGOT, QUALITY_BLACKOUT
+
+# 与界面无关的学习 / 复习 / 测试流程。窗口只负责显示 Question 并把用户的操作交给 answer()，
+# 因此这些流程也可以在没有 Qt 的环境中直接驱动 (脚本、模拟和基准测试)。
+#
+# 用法：
+#     session = LearnSession(model)
+#     q = session.next_question()
+#     while q is not None:
+#         feedback = session.answer(...)   # 按 q.kind 提交答案
+#         q = session.next_question()
+
+# 题目类型
+CHOICE = "choice"  # 学习阶段 1：四选一词义选择题，answer(选项文本)
+SELF_CHECK = "self_check"  # 学习阶段 2：认识/不认识自测，answer(True / False)
+RECOGNIZE = "recognize"  # 复习阶段 1：认识/不认识，answer(True / False)
+SPELL = "spell"  # 拼写填空，answer(输入的单词)；学习和复习中 answer(None) 表示“我不会”
+
+
+def make_cloze(word, hidden=None, rng=random):
+    """
+    生成带下划线的填空提示，字母之间用空格分隔。
+    hidden 为要挖去的字母位置；不给出时随机挖去 1 个到一半的字母 (至少保留 1 个字母)。
+    """
+    chars = list(word)
+    if len(chars) == 0:
+        return ""
+    if not hidden or len(hidden) >= len(chars):
+        # 随机确定要替换的字母数量 n，再随机选择要替换的字母
+        n = max(1, min(len(chars) - 1, rng.randint(1, max(1, len(chars) // 2))))
+        hidden = rng.sample(range(len(chars)), n)
+    hidden = set(hidden)
+    return " ".join([("_" if i in hidden else c) for i, c in enumerate(chars)])
+
+
+def spelling_matches(text, word):
+    """拼写判定：忽略首尾空白，不区分大小写。"""
+    return text.strip().lower() == (word or "").lower()
+
+
+class Question:
+    """一道题：kind 为题目类型，item 为对应的 WordItem；选择题带 options，拼写题带 cloze。"""
+    __slots__ = ("kind", "item", "phase", "options", "cloze")
+
+    def __init__(self, kind, item, phase, options=None, cloze=""):
+        self.kind = kind
+        self.item = item
+        self.phase = phase  # 界面左上角阶段指示灯的阶段号
+        self.options = options or []
+        self.cloze = cloze
+
+    def __repr__(self):
+        return f"Question(kind={self.kind!r}, word={self.item.word!r}, phase={self.phase!r})"
+
+
+class Feedback:
+    """answer() 的结果：correct 为是否答对，expected 为正确答案 (用于界面提示)。"""
+    __slots__ = ("correct", "expected")
+
+    def __init__(self, correct, expected=""):
+        self.correct = correct
+        self.expected = expected
+
+    def __repr__(self):
+        return f"Feedback(correct={self.correct!r}, expected={self.expected!r})"
+
+
+class _Session:
+    """各流程共用的部分：题目队列、当前题目、答题计数和保存。"""
+
+    def __init__(self, model, rng=None, autosave=True):
+        self.model = model
+        self.rng = rng or random
+        self.autosave = autosave  # 每次答题后调用 model.save_progress()
+        self.queue = deque()
+        self.current = None  # 当前题目 (Question)，答题后置为 None
+        self.answered = 0  # 已回答的次数 (复习中“认识/不认识”也算一次)
+        self.correct = 0  # 其中答对的数量
+
+    @property
+    def finished(self):
+        return self.current is None and not self.queue
+
+    def next_question(self):
+        """取出下一道题；全部完成时返回 None。上一道题还没有回答时返回同一道题。"""
+        if self.current is None:
+            if not self.queue:
+                return None
+            self.current = self._make_question(self.queue.popleft())
+        return self.current
+
+    def answer(self, response) -> Feedback:
+        """回答当前题目，更新单词状态并保存，返回 Feedback。"""
+        if self.current is None:
+            raise RuntimeError("没有待回答的题目，请先调用 next_question()")
+        question = self.current
+        self.current = None
+        feedback = self._answer(question, response)
+        self.answered += 1
+        if feedback.correct:
+            self.correct += 1
+        if self.autosave:
+            self.model.save_progress()
+        return feedback
+
+    def _cloze(self, word, hard):
+        """拼写题的填空提示；困难模式下挖去区分形近词的字母。"""
+        hidden = self.model.confusable_positions(word) if hard else None
+        return make_cloze(word, hidden, self.rng)
+
+    def _make_question(self, item):
+        raise NotImplementedError
+
+    def _answer(self, question, response):
+        raise NotImplementedError
+
+
+class LearnSession(_Session):
+    """
+    三阶段学习：阶段 1 词义选择题 -> 阶段 2 认识/不认识自测 -> 阶段 3 拼写。
+    单词按当前 stage 出题，答对进入下一阶段并重新排到队尾，拼写正确后标记为已学完并排入复习计划。
+    """
+
+    def __init__(self, model, count=None, hard=None, rng=None, autosave=True, now=None):
+        super().__init__(model, rng, autosave)
+        if count is None:
+            count = model.settings.get("learn_count", 10)
+        # hard 为 None 时跟随设置项 hard_distractors；窗口中切换复选框时直接修改该属性
+        self.hard = model.settings.get("hard_distractors", False) if hard is None else hard
+        self.now = now  # 排复习计划时使用的当前时间 (Unix 秒)；None 表示实时时间，模拟时可指定
+        if not model.words:
+            return
+
+        # 从未学完的单词中选择本次要学的数量的单词 (默认按尝试次数和学习阶段加权抽取，无需遍历整个词库)
+        selected = model.sample_learn_words(count)
+        # 预先建立选择题干扰项池 (同一词库只建立一次)，之后每道题的出题耗时与词库大小无关
+        model.distractor_pool()
+        if self.hard:
+            model.confusable_tree()  # 困难模式同样预先建立形近词索引
+
+        # 按阶段分组，从低阶段开始加入队列，阶段内随机打乱
+        stages = {}
+        for w in selected:
+            stages.setdefault(w.stage, []).append(w)
+        for st in sorted(stages):
+            grp = stages[st]
+            self.rng.shuffle(grp)
+            self.queue.extend(grp)
+
+    def _make_question(self, item):
+        # 确定当前单词应该进入的阶段 (确保 stage 在 1 到 3 之间)
+        phase = min(max(1, item.stage), 3)
+        if phase == 1:
+            # 从预先建立的干扰项池中抽取 3 个干扰项；困难模式优先使用形近词的释义
+            opts = [option_text(item)] + self.model.sample_distractors(item, 3, hard=self.hard)
+            while len(opts) < 4:
+                opts.append("")  # 确保选项数量为 4
+            self.rng.shuffle(opts)
+            return Question(CHOICE, item, phase, options=opts)
+        if phase == 2:
+            return Question(SELF_CHECK, item, phase)
+        return Question(SPELL, item, phase, cloze=self._cloze(item.word, self.hard))
+
+    def _answer(self, question, response):
+        item = question.item
+        if question.kind == CHOICE:
+            expected = option_text(item)
+            correct = (response or "").strip() == expected.strip()
+            if correct:
+                item.stage = min(3, item.stage + 1)  # 答对：阶段 +1
+            else:
+                item.stage = max(1, item.stage - 1)  # 答错：阶段 -1 (最低到 1)
+                item.attempts += 1
+            self.queue.append(item)
+            return Feedback(correct, expected)
+
+        if question.kind == SELF_CHECK:
+            if response:
+                item.stage = min(3, item.stage + 1)  # 记得：进入下一阶段
+            else:
+                item.stage = 1  # 记错了：退回阶段 1
+                item.attempts += 1
+            self.queue.append(item)
+            if not response:
+                self._rotate_to_stage1()
+            return Feedback(bool(response), option_text(item))
+
+        # 拼写；response 为 None 表示“我不会”
+        if response is None:
+            item.stage = 1
+            self.queue.append(item)
+            return Feedback(False, item.word)
+        item.attempts += 1
+        if spelling_matches(response, item.word):
+            item.learned = True  # 拼写正确，标记为已学完
+            self.model.review_word(item, QUALITY_GOOD, self.now)  # 排入复习计划 (第一次复习在 1 天后)
+            return Feedback(True, item.word)
+        item.learned = False
+        item.stage = 1  # 拼写错误，退回阶段 1
+        self.queue.append(item)
+        return Feedback(False, item.word)
+
+    def _rotate_to_stage1(self):
+        """把队首阶段 2/3 的单词依次轮转到队尾，直到阶段 1 的单词排在队首 (与原先窗口中“不认识”的处理相同)。"""
+        for _ in range(len(self.queue)):
+            if getattr(self.queue[0], "stage", 1) == 1:
+                break
+            self.queue.append(self.queue.popleft())
+
+
+class ReviewSession(_Session):
+    """
+    两阶段复习：阶段 1 认识/不认识 -> 阶段 2 看释义拼写。
+    按回答结果更新复习计划 (SM-2)，答错的单词放回队尾，本次复习中重新出现。
+    """
+
+    def __init__(self, model, count=None, hard=None, rng=None, autosave=True, now=None):
+        super().__init__(model, rng, autosave)
+        if count is None:
+            count = model.settings.get("review_count", 15)
+        self.hard = model.settings.get("hard_distractors", False) if hard is None else hard
+        self.now = now  # 评分时使用的当前时间 (Unix 秒)；None 表示实时时间，模拟时可指定
+        self.failed = set()  # 本次复习中答错过的单词 (id)，之后答对时按“困难”评分
+
+        # 优先复习已到期的单词 (由到期时间索引取出)；没有时提前复习最早到期的，再没有时复习整个词库
+        pool = model.due_words(count, now)
+        if not pool:
+            pool = model.due_words(count, now, ahead=True)
+        if not pool:
+            pool = model.sample_words("all", count)
+        self.queue.extend(pool)
+
+    def _make_question(self, item):
+        return Question(RECOGNIZE, item, 1)
+
+    def _answer(self, question, response):
+        item = question.item
+        if question.kind == RECOGNIZE:
+            if response:
+                # 认识：进入拼写阶段 (复习计划在拼写结果出来后再更新)
+                self.current = Question(SPELL, item, 2, cloze=self._cloze(item.word, self.hard))
+                return Feedback(True, item.word)
+            # 不认识：阶段重置，放回队列尾部
+            item.stage = 1
+            item.attempts += 1
+            self._grade(item, QUALITY_BLACKOUT)
+            self.queue.append(item)
+            return Feedback(False, item.word)
+
+        if response is not None and spelling_matches(response, item.word):
+            item.learned = True
+            item.reviewed = True  # 标记为已成功复习
+            item.stage = min(3, item.stage + 1)
+            # 本次复习中答错过的单词只算“困难”，下次间隔增长得慢一些
+            self._grade(item, QUALITY_HARD if id(item) in self.failed else QUALITY_GOOD)
+            return Feedback(True, item.word)
+
+        # 拼写错误或“我不会”：阶段重置，放回队列重新开始
+        item.stage = 1
+        self._grade(item, QUALITY_FORGOT if response is None else QUALITY_WRONG)
+        self.queue.append(item)
+        return Feedback(False, item.word)
+
+    def _grade(self, item, quality):
+        """按回答质量更新复习计划；答错的单词记入本次的 failed。"""
+        if quality < QUALITY_HARD:
+            self.failed.add(id(item))
+        self.model.review_word(item, quality, self.now)
+
+
+class TestSession(_Session):
+    """拼写测试：每个未测试过的单词出一道填空题，答对标记为已测试，答错不重复出题。"""
+
+    __test__ = False  # 类名以 Test 开头，避免被 pytest 当作测试类收集
+
+    def __init__(self, model, count=None, rng=None, autosave=True):
+        super().__init__(model, rng, autosave)
+        if count is None:
+            count = model.settings.get("test_count", 20)
+        # 只测试未测试过的单词，随机抽取设置的数量
+        self.queue.extend(model.sample_words("untested", count))
+
+    def _make_question(self, item):
+        return Question(SPELL, item, 1, cloze=make_cloze(item.word, rng=self.rng))
+
+    def _answer(self, question, response):
+        item = question.item
+        if not spelling_matches(response or "", item.word):
+            return Feedback(False, item.word)
+        # 通过模型的单词索引找到对应的 WordItem (词库中重复的单词优先选题目本身，其次按释义区分)
+        model_word = self.model.find_word(item.word, item.definition, prefer=item)
+        if model_word:
+            model_word.tested = True
+        return Feedback(True, item.word)
@@ -1,9 +1,74 @@
-import os, csv, json, requests, io
+import os, csv, json, io, threading
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar, \
-    QSpinBox, QTextEdit, QGroupBox, QFileDialog, QMessageBox, QInputDialog
-from PySide6.QtCore import Qt
+    QSpinBox, QTextEdit, QGroupBox, QFileDialog, QMessageBox, QInputDialog, QCheckBox, QProgressDialog
+from PySide6.QtCore import Qt, QThread, QObject, Signal, Slot
 from PySide6.QtGui import QFont
 from vocab_model import VocabModel  # 假设 VocabModel 和 WordItem 都在 vocab_model.py 中
+import library
+import storage_codec
+
+
+# =================================================================
+# 后台线程类：流式下载词库文件，保持 GUI 响应性
+# =================================================================
+class WordlistDownloader(QObject):
+    # 下载进度：(已接收字节数, 总字节数)，总字节数为 0 表示未知
+    signal_progress = Signal(int, int)
+    # 下载结果：(success, 词库库中的文件路径 或 错误信息)；取消时 success 为 False，错误信息为 None
+    signal_result = Signal(bool, object)
+
+    def __init__(self, model, name):
+        super().__init__()
+        self.model = model
+        self.name = name
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消下载 (可以从界面线程直接调用)，在下一块数据到达时生效；已下载的部分保留，下次从断点继续。"""
+        self._cancel_event.set()
+
+    def run_download(self):
+        try:
+            # 更新清单中发布的 SHA-256 (有缓存时不重新下载清单)，下载后校验一致才安装到本地词库库
+            info = library.fetch_catalog().get(self.name)
+            result = library.install(self.model, self.name, info, progress=self.signal_progress.emit,
+                                     cancel_event=self._cancel_event)
+        except Exception as e:
+            self.signal_result.emit(False, f"保存下载文件时出错: {e}")
+            return
+        if result == "cancelled":
+            self.signal_result.emit(False, None)
+        elif result.startswith("failed"):
+            self.signal_result.emit(False, f"下载失败: {result[len('failed: '):]}")
+        else:
+            self.signal_result.emit(True, library.library_path(self.name))
+
+
+# =================================================================
+# 后台线程类：并发下载全部网络词库到本地词库库
+# =================================================================
+class LibrarySyncer(QObject):
+    # 同步进度：(已完成的文件数, 文件总数, 刚完成的文件名)
+    signal_progress = Signal(int, int, str)
+    # 同步结果：(success, {文件名: 结果} 或 错误信息)
+    signal_result = Signal(bool, object)
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消同步 (可以从界面线程直接调用)。"""
+        self._cancel_event.set()
+
+    def run_sync(self):
+        try:
+            results = library.sync_library(self.model, progress=self.signal_progress.emit,
+                                           cancel_event=self._cancel_event)
+            self.signal_result.emit(True, results)
+        except Exception as e:
+            self.signal_result.emit(False, f"同步词库时出错: {e}")
 
 
 class SettingWindow(QMainWindow):
@@ -15,6 +80,8 @@ class SettingWindow(QMainWindow):
     def __init__(self, model: VocabModel, parent=None):
         super().__init__(parent)
         self.model = model
+        self.download_dialog = None  # 正在显示的下载进度对话框
+        self.sync_dialog = None  # 正在显示的同步进度对话框
         self.setWindowTitle("设置与进度管理")
         self.setFixedSize(1000, 700)
         self.central = QWidget()
@@ -32,6 +99,7 @@ class SettingWindow(QMainWindow):
         self.btn_import = QPushButton("导入单词库 (CSV/JSON)")
         # **新增下载按钮**
         self.btn_download = QPushButton("从网络下载词库")
+        self.btn_sync = QPushButton("同步词库")
         self.btn_open = QPushButton("打开当前词库")
 
         # 按钮文本修改以反映自定义路径功能
@@ -39,7 +107,7 @@ class SettingWindow(QMainWindow):
         self.btn_load = QPushButton("从文件加载进度")
 
         # 统一设置按钮样式
-        for b in [self.btn_import, self.btn_download, self.btn_open, self.btn_save, self.btn_load]:
+        for b in [self.btn_import, self.btn_download, self.btn_sync, self.btn_open, self.btn_save, self.btn_load]:
             b.setFont(font)
             b.setFixedHeight(36)
             b.setStyleSheet(
@@ -113,6 +181,29 @@ class SettingWindow(QMainWindow):
             gbl.addWidget(spin)
             left_layout.addWidget(gb)
 
+        # 学习选词方式：按权重抽取时，尝试次数越多、学习阶段越靠后的未学完单词越容易被选中
+        self.weighted_check = QCheckBox("按难度加权选词")
+        self.weighted_check.setChecked(bool(self.model.settings.get("learn_weighted", True)))
+        self.attempts_weight_spin = QSpinBox()
+        self.attempts_weight_spin.setMaximum(99)
+        self.attempts_weight_spin.setValue(self.model.settings.get("learn_weight_attempts", 1))
+        self.stage_weight_spin = QSpinBox()
+        self.stage_weight_spin.setMaximum(99)
+        self.stage_weight_spin.setValue(self.model.settings.get("learn_weight_stage", 1))
+        self.weighted_check.toggled.connect(lambda v: self._auto_save_setting("learn_weighted", v))
+        self.attempts_weight_spin.valueChanged.connect(lambda v: self._auto_save_setting("learn_weight_attempts", v))
+        self.stage_weight_spin.valueChanged.connect(lambda v: self._auto_save_setting("learn_weight_stage", v))
+
+        gb = QGroupBox("学习选词")
+        gb.setStyleSheet("QGroupBox{border:1px solid #eee;border-radius:10px;padding:8px;}")
+        gbl = QHBoxLayout(gb)
+        gbl.addWidget(self.weighted_check)
+        gbl.addWidget(QLabel("尝试次数权重："))
+        gbl.addWidget(self.attempts_weight_spin)
+        gbl.addWidget(QLabel("阶段权重："))
+        gbl.addWidget(self.stage_weight_spin)
+        left_layout.addWidget(gb)
+
         bottom_layout.addWidget(left_group, 2)  # 左侧权重 2
 
         # --- 右侧区域：当前单词库列表 ---
@@ -140,6 +231,7 @@ class SettingWindow(QMainWindow):
         self.btn_import.clicked.connect(self.import_wordlist)
         # **新增下载信号连接**
         self.btn_download.clicked.connect(self.download_wordlist)
+        self.btn_sync.clicked.connect(self.sync_library)
         self.btn_open.clicked.connect(self.open_current_wordlist)
         self.btn_save.clicked.connect(self.save_progress_to_file)
         self.btn_load.clicked.connect(self.load_progress_from_file)
@@ -172,7 +264,7 @@ class SettingWindow(QMainWindow):
             QMessageBox.critical(self, "导入失败", f"文件格式错误或文件为空: {os.path.basename(path)}")
             return
 
-        # 3. 立即保存进度到默认路径 (data/progress.json)
+        # 3. 立即保存进度到默认路径 (data/progress.bin)
         self.model.save_progress()
 
         QMessageBox.information(self, "导入成功",
@@ -180,31 +272,38 @@ class SettingWindow(QMainWindow):
         self.refresh_view()  # 刷新界面显示新的统计数据、单词列表和词库名称
 
     def download_wordlist(self):
-        """显示网络词库列表，供用户选择下载并导入。"""
-
-        # 词库 GitHub 路径
-        BASE_URL = "https://raw.githubusercontent.com/Junpgle/LearnWord/master/%E8%AF%8D%E5%BA%93/"
+        """显示网络词库列表，供用户选择下载并导入；已同步到本地词库库的词库直接从本地导入。"""
 
-        # 预设可下载的文件名列表 (这些文件存在于 GitHub 路径下)
-        available_dics = ["1-初中-顺序.json", "2-高中-顺序.json", "3-CET4-顺序.json", "4-CET6-顺序.json", "5-考研-顺序.json","6-托福-顺序.json","7-SAT-顺序.json"]
+        # 可下载的词库：预设目录加上本地词库库中已有的文件
+        manifest = library.load_manifest()
+        available_dics = library.CATALOG + sorted(n for n in manifest if n not in library.CATALOG)
+        labels = [f"{n}  (已同步)" if library.local_file(n, manifest) else n for n in available_dics]
 
         # 1. 弹出选择对话框
-        item, ok = QInputDialog.getItem(
+        label, ok = QInputDialog.getItem(
             self,
             "下载词库",
             "选择要下载的词库文件:",
-            available_dics,
+            labels,
             0,
             False  # 不允许编辑
         )
 
-        if not ok or not item:
+        if not ok or not label:
+            return
+        item = available_dics[labels.index(label)]
+
+        # 已同步到本地：直接导入本地文件，无需等待网络
+        local_path = library.local_file(item, manifest)
+        if local_path:
+            reply = QMessageBox.question(self, '确认切换',
+                                         f"从本地词库库导入: \n{item}\n这将覆盖当前词库。",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                self._import_library_file(item, local_path)
             return
 
-        # 2. 构造完整的下载 URL
-        download_url = BASE_URL + item
-
-        # 3. 询问用户是否确认下载
+        # 2. 询问用户是否确认下载
         reply = QMessageBox.question(self, '确认下载',
                                      f"确认从网络下载文件: \n{item}\n这将覆盖当前词库。",
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
@@ -212,58 +311,147 @@ class SettingWindow(QMainWindow):
         if reply == QMessageBox.No:
             return
 
-        # 4. 执行下载
-        temp_msg = QMessageBox(QMessageBox.Information, "下载中", f"正在下载 {item}，请稍候...", QMessageBox.NoButton)
-        temp_msg.show()
-
-        try:
-            # 使用 requests 库进行下载
-            response = requests.get(download_url, timeout=15)
-            response.raise_for_status()  # 检查 HTTP 错误 (如 404, 500)
-
-            file_content = response.text
-            temp_msg.close()  # 关闭提示框
-
-            # 5. 导入下载的内容
-            self._import_downloaded_content(item, file_content)
-
-        except requests.exceptions.RequestException as e:
-            temp_msg.close()
-            QMessageBox.critical(self, "下载失败", f"网络请求失败或文件未找到: {e}")
-        except Exception as e:
-            temp_msg.close()
-            QMessageBox.critical(self, "导入失败", f"处理下载内容时出错: {e}")
+        # 3. 在后台线程中下载，进度对话框显示进度并可取消
+        self.btn_download.setEnabled(False)
+        self._download_name = item
+
+        self.download_dialog = QProgressDialog(f"正在下载 {item}...", "取消", 0, 0, self)
+        self.download_dialog.setWindowTitle("下载中")
+        self.download_dialog.setWindowModality(Qt.WindowModal)
+        self.download_dialog.setMinimumDuration(0)
+        self.download_dialog.setAutoClose(False)
+        self.download_dialog.setAutoReset(False)
+
+        self.download_thread = QThread()
+        self.download_worker = WordlistDownloader(self.model, item)
+        self.download_worker.moveToThread(self.download_thread)
+
+        self.download_thread.started.connect(self.download_worker.run_download)
+        self.download_worker.signal_progress.connect(self._update_download_progress)
+        self.download_worker.signal_result.connect(self._handle_download_result)
+        self.download_worker.signal_result.connect(self.download_thread.quit)
+        self.download_thread.finished.connect(self.download_thread.deleteLater)
+        self.download_worker.signal_result.connect(self.download_worker.deleteLater)
+        # 取消按钮直接设置工作对象的取消标志 (工作线程正在下载，无法通过排队的信号通知)
+        self.download_dialog.canceled.connect(self.download_worker.cancel)
+
+        self.download_dialog.show()
+        self.download_thread.start()
+
+    @Slot(int, int)
+    def _update_download_progress(self, received, total):
+        """更新下载进度对话框；总大小未知时显示忙碌状态和已下载的大小。"""
+        dialog = self.download_dialog
+        if dialog is None or dialog.wasCanceled():
+            return
+        if total:
+            dialog.setMaximum(total)
+            dialog.setValue(received)
+            dialog.setLabelText(f"正在下载 {self._download_name}...\n{received / 1024:.0f} / {total / 1024:.0f} KB")
+        else:
+            dialog.setMaximum(0)
+            dialog.setLabelText(f"正在下载 {self._download_name}...\n已下载 {received / 1024:.0f} KB")
+
+    @Slot(bool, object)
+    def _handle_download_result(self, success, path_or_error):
+        """下载结束：成功时导入词库库中的文件，失败时提示错误，取消时直接返回。"""
+        if self.download_dialog is not None:
+            self.download_dialog.close()
+            self.download_dialog = None
+        self.btn_download.setEnabled(True)
+
+        if not success:
+            if path_or_error is not None:
+                QMessageBox.critical(self, "下载失败", str(path_or_error))
+            return
 
-    # **辅助方法 _import_downloaded_content：调用 model 中基于 content 的导入方法**
-    def _import_downloaded_content(self, filename, content):
-        """导入下载的 CSV 或 JSON 文件内容。"""
+        # 4. 导入已安装到本地词库库的文件
+        self._import_library_file(self._download_name, path_or_error)
 
-        loaded_words = []
-        is_json = filename.lower().endswith('.json')
-        is_csv = filename.lower().endswith('.csv')
-
-        if is_json:
-            # 调用 model 的 content-based 导入方法
-            loaded_words = self.model.load_words_from_json_content(content)
-        elif is_csv:
-            # 调用 model 的 content-based 导入方法
-            loaded_words = self.model.load_words_from_csv_content(content)
+    def _import_library_file(self, filename, path):
+        """导入本地词库库中的文件 (同步时已生成解析缓存)。"""
+        if filename.lower().endswith('.json'):
+            loaded_words = self.model.load_words_from_json(path)
         else:
-            QMessageBox.warning(self, "导入失败", f"不支持的文件扩展名: {filename}。")
-            return
+            loaded_words = self.model.load_words_from_csv(path)
 
         if not loaded_words:
-            QMessageBox.critical(self, "导入失败", f"下载的文件格式错误或内容为空: {filename}")
+            QMessageBox.critical(self, "导入失败", f"文件格式错误或文件为空: {filename}")
             return
 
-        # 成功导入后，更新当前词库名称 (在 model 中已保存备份)
-        self.model.current_wordlist_name = f"[网络下载] {filename}"
-        self.model.save_progress()  # 立即保存进度和更新后的词库名称
-
+        self.model.save_progress()
         QMessageBox.information(self, "导入成功",
                                 f"成功导入 {len(self.model.words)} 个单词。新词库已设置为当前词库。")
         self.refresh_view()
 
+    def sync_library(self):
+        """在后台并发下载全部网络词库到本地词库库 (data/library)，之后切换词库无需联网。"""
+        self.btn_sync.setEnabled(False)
+
+        self.sync_dialog = QProgressDialog("正在同步词库...", "取消", 0, 0, self)
+        self.sync_dialog.setWindowTitle("同步词库")
+        self.sync_dialog.setWindowModality(Qt.WindowModal)
+        self.sync_dialog.setMinimumDuration(0)
+        self.sync_dialog.setAutoClose(False)
+        self.sync_dialog.setAutoReset(False)
+
+        self.sync_thread = QThread()
+        self.sync_worker = LibrarySyncer(self.model)
+        self.sync_worker.moveToThread(self.sync_thread)
+
+        self.sync_thread.started.connect(self.sync_worker.run_sync)
+        self.sync_worker.signal_progress.connect(self._update_sync_progress)
+        self.sync_worker.signal_result.connect(self._handle_sync_result)
+        self.sync_worker.signal_result.connect(self.sync_thread.quit)
+        self.sync_thread.finished.connect(self.sync_thread.deleteLater)
+        self.sync_worker.signal_result.connect(self.sync_worker.deleteLater)
+        self.sync_dialog.canceled.connect(self.sync_worker.cancel)
+
+        self.sync_dialog.show()
+        self.sync_thread.start()
+
+    @Slot(int, int, str)
+    def _update_sync_progress(self, done, total, name):
+        dialog = self.sync_dialog
+        if dialog is None or dialog.wasCanceled():
+            return
+        dialog.setMaximum(total)
+        dialog.setValue(done)
+        dialog.setLabelText(f"正在同步词库... ({done}/{total})\n已完成: {name}")
+
+    @Slot(bool, object)
+    def _handle_sync_result(self, success, results_or_error):
+        """同步结束：汇总每个词库的结果。"""
+        if self.sync_dialog is not None:
+            self.sync_dialog.close()
+            self.sync_dialog = None
+        self.btn_sync.setEnabled(True)
+
+        if not success:
+            QMessageBox.critical(self, "同步失败", str(results_or_error))
+            return
+
+        results = results_or_error
+        downloaded = [n for n, r in results.items() if r == "downloaded"]
+        patched = [n for n, r in results.items() if r == "patched"]
+        unchanged = [n for n, r in results.items() if r == "unchanged"]
+        failed = [f"{n}: {r[len('failed: '):]}" for n, r in results.items() if r.startswith("failed")]
+
+        # 当前词库有增量更新时切换到新版本，保留学习进度
+        if self.model.current_wordlist_name in patched:
+            if self.model.update_wordlist(library.library_path(self.model.current_wordlist_name)):
+                self.model.save_progress()
+                self.refresh_view()
+
+        if all(r == "cancelled" for r in results.values()):
+            return
+        message = f"新下载 {len(downloaded)} 个，增量更新 {len(patched)} 个，无变化 {len(unchanged)} 个。"
+        if failed:
+            message += "\n\n以下词库同步失败:\n" + "\n".join(failed)
+            QMessageBox.warning(self, "同步完成", message)
+        else:
+            QMessageBox.information(self, "同步完成", message)
+
     def open_current_wordlist(self):
         """打开并预览当前单词库的内容 (根据上次导入的文件类型)。"""
 
@@ -280,7 +468,7 @@ class SettingWindow(QMainWindow):
 
         try:
             # 读取文件内容
-            with open(path, "r", encoding="utf-8") as f:
+            with storage_codec.open_text(path) as f:
                 data = f.read()
 
             # 使用 QTextEdit 弹窗展示内容
@@ -323,7 +511,7 @@ class SettingWindow(QMainWindow):
             self.model.save_progress()
 
             QMessageBox.information(self, "保存成功",
-                                    f"设置与学习进度已保存到:\n{path}\n(同时已保存到默认路径 data/progress.json)")
+                                    f"设置与学习进度已保存到:\n{path}\n(同时已保存到默认路径 data/progress.bin)")
             self.refresh_view()
         except Exception as e:
             QMessageBox.critical(self, "保存失败", f"保存文件失败: {str(e)}")
@@ -372,14 +560,10 @@ class SettingWindow(QMainWindow):
         self.progress.setValue(learned)
         self.progress.setFormat(f"已学习 {learned} / 全部 {total}")
 
-        # 筛选不同状态的单词
-        learned_words = [w for w in self.model.words if w.learned]
-        reviewed_words = [w for w in learned_words if w.reviewed]
-        tested_words = [w for w in self.model.words if w.tested]
-
-        learned_count = len(learned_words)
-        reviewed_count = len(reviewed_words)
-        tested_count = len(tested_words)
+        # 统计不同状态的单词数量 (由模型按列批量计数，不逐个访问单词)
+        learned_count = learned
+        reviewed_count = self.model.count_words("reviewed")
+        tested_count = self.model.count_words("tested")
 
         # --- 复习进度条 (橙色) ---
         # 复习进度：已复习 (reviewed) ÷ 已学习 (learned)
@@ -399,6 +583,6 @@ class SettingWindow(QMainWindow):
         self.words_view.setPlainText("\n".join(lines))
 
     def _auto_save_setting(self, key, value):
-        """当 SpinBox 改变时自动保存单个设置到 settings.json 文件。"""
+        """当 SpinBox / CheckBox 改变时自动保存单个设置到 settings.json 文件。"""
         self.model.settings[key] = value
         self.model.save_settings()  # 即时写入 settings.json
\ No newline at end of file
@@ -0,0 +1,327 @@
+import argparse, contextlib, io, json, os, random, shutil, sys, tempfile, time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from session import LearnSession, ReviewSession, TestSession, CHOICE, SELF_CHECK, RECOGNIZE, SPELL
+from vocab_model import VocabModel
+
+# 学习者模拟：让 N 个虚拟学习者按各自的答题正确率，逐“天”完成学习、复习、测试会话 (session.py)，
+# 统计答题吞吐量、学习阶段的变化和进度保存次数，用于在没有界面的情况下比较选词/复习计划和进度存储方式。
+# 每个学习者使用独立的数据目录，多个学习者在多个进程中并行运行；同一个随机种子的运行结果完全相同。
+#
+# 用法 (在仓库根目录执行)：
+#     python simulator.py --learners 200 --days 30 --wordlist 7-SAT-顺序.json --workers 8
+#     python simulator.py --learners 20 --trace trace.jsonl          # 记录每次答题
+#     python simulator.py --learners 20 --replay trace.jsonl --storage sqlite   # 用同样的答题结果比较存储方式
+
+SIM_EPOCH = 1_700_000_000  # 模拟时钟的起点 (Unix 秒)，第 d 天为 SIM_EPOCH + d 天
+DAY_SECONDS = 24 * 60 * 60
+
+# 答题正确率：各题型答对的概率
+PROFILES = {
+    "strong": {CHOICE: 0.95, SELF_CHECK: 0.9, RECOGNIZE: 0.9, SPELL: 0.85},
+    "average": {CHOICE: 0.85, SELF_CHECK: 0.75, RECOGNIZE: 0.75, SPELL: 0.65},
+    "weak": {CHOICE: 0.7, SELF_CHECK: 0.55, RECOGNIZE: 0.55, SPELL: 0.4},
+}
+# 拼写答错时选择“我不会”而不是输入错误拼写的概率
+IDK_RATE = 0.2
+
+# 进度存储方式
+STORAGES = ("journal", "snapshot", "sqlite", "memory")
+
+
+def _make_model(storage):
+    """按存储方式创建模型：journal 为默认的增量日志，snapshot 为每次保存都写完整快照，memory 不保存。"""
+    if storage == "sqlite":
+        from sqlite_store import SQLiteVocabModel
+        model = _measured(SQLiteVocabModel)()
+    else:
+        model = _measured(VocabModel)()
+    model.settings["async_save"] = False  # 同步保存，保存耗时计入模拟结果
+    if storage == "snapshot":
+        model.settings["journal_checkpoint_every"] = 1
+    return model
+
+
+_measured_classes = {}
+
+
+def _measured(base):
+    """返回 base 的子类：统计 save_progress 的调用次数、耗时和完整快照的写入次数。"""
+    cls = _measured_classes.get(base)
+    if cls is None:
+        class Measured(base):
+            sim_saves = 0
+            sim_save_seconds = 0.0
+            sim_snapshots = 0
+
+            def save_progress(self, path=None, changed=None):
+                start = time.perf_counter()
+                super().save_progress(path, changed)
+                self.sim_save_seconds += time.perf_counter() - start
+                self.sim_saves += 1
+
+            def _write_snapshot(self, path, snapshot=None):
+                super()._write_snapshot(path, snapshot)
+                self.sim_snapshots += 1
+
+        Measured.__name__ = "Measured" + base.__name__
+        cls = _measured_classes[base] = Measured
+    return cls
+
+
+class Responder:
+    """模拟答题者：按正确率随机答题；给出回放记录时优先使用记录中同一单词、同一题型的结果。"""
+
+    def __init__(self, profile, rng, replay=None):
+        self.profile = PROFILES[profile]
+        self.rng = rng
+        self.replay = replay  # (题型, 单词) -> deque([是否答对, ...])
+
+    def decide(self, question):
+        # 回放时也照常抽取随机数，使随机数序列 (以及之后的出题顺序) 与记录时一致
+        right = self.rng.random() < self.profile[question.kind]
+        if self.replay is not None:
+            recorded = self.replay.get((question.kind, question.item.word))
+            if recorded:
+                return recorded.popleft()
+        return right
+
+    def respond(self, question, right):
+        item = question.item
+        if question.kind == CHOICE:
+            expected = item.pos + "." + item.definition
+            if right:
+                return expected
+            wrong = [o for o in question.options if o != expected]
+            return self.rng.choice(wrong) if wrong else ""
+        if question.kind in (SELF_CHECK, RECOGNIZE):
+            return right
+        if right:
+            return item.word
+        if self.rng.random() < IDK_RATE:
+            return None
+        return item.word[::-1] + "x"  # 必然错误的拼写
+
+
+def _run_session(session, responder, stats, trace, day):
+    question = session.next_question()
+    while question is not None:
+        right = responder.decide(question)
+        before = question.item.stage
+        session.answer(responder.respond(question, right))
+        stats["answers"] += 1
+        stats["transitions"][f"{before}->{question.item.stage}"] += 1
+        if trace is not None:
+            trace.append({"day": day, "kind": question.kind, "word": question.item.word, "right": right})
+        question = session.next_question()
+
+
+def run_learner(task):
+    """在独立的数据目录中运行一个学习者的全部模拟，返回统计结果 (可在子进程中调用)。"""
+    learner, options = task["learner"], task["options"]
+    workdir = os.path.join(options["base_dir"], f"learner-{learner:05d}")
+    os.makedirs(workdir, exist_ok=True)
+    shared_cache = os.path.join(options["base_dir"], "shared", "data", "cache")
+    if os.path.isdir(shared_cache):
+        shutil.copytree(shared_cache, os.path.join(workdir, "data", "cache"), dirs_exist_ok=True)
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    seed = options["seed"] * 100003 + learner
+    random.seed(seed)  # 模型内部的随机选词 (sample_words、干扰项等) 使用全局 random
+    rng = random.Random(seed)
+    profiles = options["profiles"]
+    profile = profiles[learner % len(profiles)]
+    replay = None
+    if task.get("replay") is not None:
+        replay = {}
+        for rec in task["replay"]:
+            replay.setdefault((rec["kind"], rec["word"]), deque()).append(rec["right"])
+    trace = [] if options["trace"] else None
+
+    stats = {"learner": learner, "profile": profile, "answers": 0, "transitions": Counter()}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = _make_model(options["storage"])
+            model.settings["learn_weighted"] = options["learn_weighted"]
+            model.settings["hard_distractors"] = options["hard"]
+            model.load_words_from_json(options["wordlist"])
+            autosave = options["storage"] != "memory"
+            if autosave:
+                model.save_progress()  # 导入词库后的首次完整保存不计入统计
+            model.sim_saves, model.sim_save_seconds, model.sim_snapshots = 0, 0.0, 0
+
+            responder = Responder(profile, rng, replay)
+            start = time.perf_counter()
+            for day in range(options["days"]):
+                now = SIM_EPOCH + day * DAY_SECONDS
+                _run_session(LearnSession(model, options["learn_count"], rng=rng, autosave=autosave, now=now),
+                             responder, stats, trace, day)
+                _run_session(ReviewSession(model, options["review_count"], rng=rng, autosave=autosave, now=now),
+                             responder, stats, trace, day)
+                if options["test_count"]:
+                    _run_session(TestSession(model, options["test_count"], rng=rng, autosave=autosave),
+                                 responder, stats, trace, day)
+            if autosave:
+                model.checkpoint()
+            elapsed = time.perf_counter() - start
+
+            stats.update({
+                "seconds": elapsed,
+                "saves": model.sim_saves,
+                "save_seconds": model.sim_save_seconds,
+                "snapshots": model.sim_snapshots,
+                "learned": model.count_words("learned"),
+                "reviewed": model.count_words("reviewed"),
+                "tested": model.count_words("tested"),
+                "words": len(model.words),
+                "trace": trace,
+            })
+            if options["storage"] == "sqlite":
+                model._conn.close()
+    finally:
+        os.chdir(cwd)
+        if not options["keep"]:
+            shutil.rmtree(workdir, ignore_errors=True)
+    stats["transitions"] = dict(stats["transitions"])
+    return stats
+
+
+def _prime_cache(base_dir, wordlist):
+    """在共享目录中解析一次词库，各学习者复制解析缓存，避免每个学习者都重新解析词库文件。"""
+    shared = os.path.join(base_dir, "shared")
+    os.makedirs(shared, exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(shared)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            VocabModel().load_words_from_json(wordlist)
+    finally:
+        os.chdir(cwd)
+
+
+def simulate(options, replay=None):
+    """
+    运行全部学习者，返回 (每个学习者的统计列表, 总耗时秒)。
+    replay: 学习者编号 -> 答题记录列表 (见 --trace)，用于以相同的答题结果重新运行。
+    """
+    options = dict(options)
+    options["wordlist"] = os.path.abspath(options["wordlist"])
+    own_dir = options.get("base_dir") is None
+    if own_dir:
+        options["base_dir"] = tempfile.mkdtemp(prefix="learnword-sim-")
+    tasks = [{"learner": i, "options": options, "replay": (replay or {}).get(i)}
+             for i in range(options["learners"])]
+    start = time.perf_counter()
+    try:
+        _prime_cache(options["base_dir"], options["wordlist"])
+        if options["workers"] == 1:
+            results = [run_learner(t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+                results = list(pool.map(run_learner, tasks, chunksize=max(1, len(tasks) // (options["workers"] * 4))))
+    finally:
+        if own_dir and not options["keep"]:
+            shutil.rmtree(options["base_dir"], ignore_errors=True)
+    return results, time.perf_counter() - start
+
+
+def summarize(results, wall_seconds):
+    """汇总所有学习者的统计结果。"""
+    answers = sum(r["answers"] for r in results)
+    cpu = sum(r["seconds"] for r in results)
+    transitions = Counter()
+    for r in results:
+        transitions.update(r["transitions"])
+    return {
+        "learners": len(results),
+        "words": results[0]["words"] if results else 0,
+        "answers": answers,
+        "wall_seconds": round(wall_seconds, 3),
+        "answers_per_second": round(answers / wall_seconds, 1) if wall_seconds else 0.0,
+        "answers_per_learner_second": round(answers / cpu, 1) if cpu else 0.0,
+        "saves": sum(r["saves"] for r in results),
+        "snapshots": sum(r["snapshots"] for r in results),
+        "save_share": round(sum(r["save_seconds"] for r in results) / cpu, 3) if cpu else 0.0,
+        "learned": sum(r["learned"] for r in results),
+        "reviewed": sum(r["reviewed"] for r in results),
+        "tested": sum(r["tested"] for r in results),
+        "by_profile": {p: sum(r["learned"] for r in results if r["profile"] == p)
+                       for p in sorted({r["profile"] for r in results})},
+        "transitions": dict(sorted(transitions.items())),
+    }
+
+
+def _print_summary(summary, options):
+    print(f"词库: {os.path.basename(options['wordlist'])} ({summary['words']} 个单词)，"
+          f"{summary['learners']} 个学习者 × {options['days']} 天，存储方式: {options['storage']}，"
+          f"加权选词: {'是' if options['learn_weighted'] else '否'}")
+    print(f"答题次数: {summary['answers']}，总耗时 {summary['wall_seconds']:.1f} s，"
+          f"吞吐量 {summary['answers_per_second']:.0f} 次/秒 (单个学习者 {summary['answers_per_learner_second']:.0f} 次/秒)")
+    print(f"保存: {summary['saves']} 次，完整快照 {summary['snapshots']} 次，保存耗时占 {summary['save_share']:.1%}")
+    print(f"已学完 {summary['learned']}，已复习 {summary['reviewed']}，已测试 {summary['tested']} "
+          f"(按正确率: {summary['by_profile']})")
+    print("阶段变化: " + ", ".join(f"{k}: {v}" for k, v in summary["transitions"].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LearnWord 学习者模拟")
+    parser.add_argument("--learners", type=int, default=20)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--wordlist", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                           "词库", "7-SAT-顺序.json"))
+    parser.add_argument("--profiles", default="strong,average,weak", help="逗号分隔，学习者依次使用")
+    parser.add_argument("--storage", choices=STORAGES, default="journal")
+    parser.add_argument("--uniform", action="store_true", help="学习选词不加权 (等概率随机)")
+    parser.add_argument("--hard", action="store_true", help="使用形近词干扰项")
+    parser.add_argument("--learn-count", type=int, default=10)
+    parser.add_argument("--review-count", type=int, default=15)
+    parser.add_argument("--test-count", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", help="把每次答题记录写入 JSON lines 文件")
+    parser.add_argument("--replay", help="按 --trace 记录的答题结果重新运行")
+    parser.add_argument("--json", help="把汇总结果写入 JSON 文件")
+    parser.add_argument("--keep", action="store_true", help="保留各学习者的数据目录")
+    parser.add_argument("--base-dir", help="数据目录 (默认使用临时目录)")
+    args = parser.parse_args(argv)
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"未知的正确率配置: {', '.join(unknown)} (可选: {', '.join(PROFILES)})")
+
+    options = {
+        "learners": args.learners, "days": args.days, "wordlist": args.wordlist, "profiles": profiles,
+        "storage": args.storage, "learn_weighted": not args.uniform, "hard": args.hard,
+        "learn_count": args.learn_count, "review_count": args.review_count, "test_count": args.test_count,
+        "workers": max(1, args.workers), "seed": args.seed, "trace": bool(args.trace), "keep": args.keep,
+        "base_dir": args.base_dir,
+    }
+
+    replay = None
+    if args.replay:
+        replay = {}
+        with open(args.replay, "r", encoding="utf-8") as f:
+            for line in f:
+                rec = json.loads(line)
+                replay.setdefault(rec["learner"], []).append(rec)
+
+    results, wall = simulate(options, replay)
+    summary = summarize(results, wall)
+    _print_summary(summary, options)
+
+    if args.trace:
+        with open(args.trace, "w", encoding="utf-8") as f:
+            for r in results:
+                for rec in r["trace"]:
+                    f.write(json.dumps(dict(rec, learner=r["learner"]), ensure_ascii=False) + "\n")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,310 @@
+import json, os, random, sqlite3, sys, time
+from typing import List
+
+from vocab_model import VocabModel, WordColumns, WordItem, pack_word_flags
+
+# 默认数据库路径：存在该文件时 create_model() 会自动选用 SQLite 后端
+DEFAULT_DB_PATH = os.path.join("data", "vocab.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    definition TEXT NOT NULL DEFAULT '',
+    pos TEXT NOT NULL DEFAULT '',
+    example TEXT NOT NULL DEFAULT '',
+    stage INTEGER NOT NULL DEFAULT 1,
+    learned INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    reviewed INTEGER NOT NULL DEFAULT 0,
+    tested INTEGER NOT NULL DEFAULT 0,
+    ease REAL NOT NULL DEFAULT 2.5,
+    interval INTEGER NOT NULL DEFAULT 0,
+    due INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_words_learned ON words (learned);
+CREATE INDEX IF NOT EXISTS idx_words_tested ON words (tested);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# 复习计划列 (后来加入)：旧数据库中缺少时用 ALTER TABLE 补上，取默认值
+SCHEDULE_COLUMNS = (
+    ("ease", "REAL NOT NULL DEFAULT 2.5"),
+    ("interval", "INTEGER NOT NULL DEFAULT 0"),
+    ("due", "INTEGER NOT NULL DEFAULT 0"),
+)
+# 到期时间索引：按 (learned, due) 取出最早到期的已学单词
+DUE_INDEX = "CREATE INDEX IF NOT EXISTS idx_words_due ON words (learned, due)"
+
+# select_words 的状态 -> WHERE 条件 (均可由上面的索引直接命中)
+STATUS_WHERE = {
+    "unlearned": "learned = 0",
+    "learned": "learned = 1",
+    "reviewed": "learned = 1 AND reviewed = 1",
+    "tested": "tested = 1",
+    "untested": "tested = 0",
+    "all": "1",
+}
+
+
+def _connect(db_path):
+    """打开数据库并确保表结构存在。"""
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    # 启动时在后台线程中加载数据，之后由界面线程使用：同一时间只有一个线程访问连接，可以关闭线程检查
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    existing = {r[1] for r in conn.execute("PRAGMA table_info(words)")}
+    with conn:
+        for name, decl in SCHEDULE_COLUMNS:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE words ADD COLUMN {name} {decl}")
+        conn.execute(DUE_INDEX)
+    return conn
+
+
+def _state_row(w: WordItem):
+    """WordItem 的状态列取值 (布尔值存为 0/1)。"""
+    return (int(w.stage), int(bool(w.learned)), int(w.attempts), int(bool(w.reviewed)), int(bool(w.tested)),
+            w.ease, int(w.interval), int(w.due))
+
+
+def _write_all_words(conn, words: List[WordItem]):
+    """在一个事务中用 words 替换整张 words 表，返回按顺序分配的行号列表。"""
+    with conn:
+        conn.execute("DELETE FROM words")
+        conn.executemany(
+            "INSERT INTO words (id, word, definition, pos, example, stage, learned, attempts, reviewed, tested, "
+            "ease, interval, due) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((i, w.word, w.definition, w.pos, w.example) + _state_row(w) for i, w in enumerate(words, start=1))
+        )
+    return list(range(1, len(words) + 1))
+
+
+def migrate_progress_json(json_path, db_path=DEFAULT_DB_PATH):
+    """
+    一次性迁移：把进度文件 (progress.bin 或旧版 progress.json，连同增量日志和 settings.json 中的设置)
+    导入 SQLite 数据库。返回导入的单词数量。数据库中已有的单词会被替换。
+    """
+    source = VocabModel()
+    words = source.load_progress(json_path)
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"进度文件未找到: {json_path}")
+
+    conn = _connect(db_path)
+    try:
+        _write_all_words(conn, words)
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                             ((k, json.dumps(v, ensure_ascii=False)) for k, v in source.settings.items()))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('current_wordlist_name', ?)",
+                         (source.current_wordlist_name,))
+    finally:
+        conn.close()
+    return len(words)
+
+
+class SQLiteVocabModel(VocabModel):
+    """
+    SQLite 存储后端：单词、学习状态和设置都保存在带索引的 SQLite 数据库中。
+    答题后的保存只执行变化单词的单行 UPDATE；学习/复习/测试的选词由索引查询完成。
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._conn = _connect(db_path)
+        self._row_ids = {}  # id(WordItem) -> 数据库行号
+        self._items_by_row = {}  # 数据库行号 -> WordItem
+        self._db_words = None  # 与数据库内容一致的 words 列表；词库被替换后需整表重写
+        self._db_name = None  # 数据库中保存的词库名称
+
+        super().__init__()
+
+        # 原有的进度文件只用于一次性迁移；之后进度都以数据库为准
+        self.legacy_progress_path = self.progress_path
+        self.progress_path = db_path
+
+    # =============== 设置相关 ===============
+    def save_settings(self):
+        """将当前设置写入 settings 表。"""
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                   ((k, json.dumps(v, ensure_ascii=False)) for k, v in self.settings.items()))
+
+    def load_settings(self):
+        """从 settings 表加载设置；表为空时沿用 settings.json 中的旧设置。"""
+        rows = self._conn.execute("SELECT key, value FROM settings").fetchall()
+        if rows:
+            self.settings.update({k: json.loads(v) for k, v in rows})
+        else:
+            super().load_settings()
+
+    # =============== 学习进度相关 ===============
+    def _bind_rows(self, row_ids):
+        """记录 self.words 与数据库行号的对应关系。"""
+        self._row_ids = {id(w): r for w, r in zip(self.words, row_ids)}
+        self._items_by_row = dict(zip(row_ids, self.words))
+        self._db_words = self.words
+
+    def _set_meta(self, key, value):
+        if key == "current_wordlist_name":
+            self._db_name = value
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def save_progress(self, path=None, changed=None):
+        """
+        保存进度。
+        - path 指向其他文件时：导出为 JSON 进度文件 (与默认后端格式相同)。
+        - 词库被替换时：整表重写。
+        - 其他情况：只在一个事务中 UPDATE 自上次保存以来状态变化的单词 (以及显式传入的 changed)。
+        """
+        if path and path != self.db_path:
+            self._write_snapshot(path)
+            return
+
+        if self._db_words is not self.words:
+            self._take_changes()
+            self._bind_rows(_write_all_words(self._conn, self.words))
+            self._set_meta("current_wordlist_name", self.current_wordlist_name)
+            return
+
+        rows = [_state_row(w) + (self._row_ids[id(w)],)
+                for w, _ in self._take_changes(changed) if id(w) in self._row_ids]
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE words SET stage = ?, learned = ?, attempts = ?, reviewed = ?, tested = ?, "
+                    "ease = ?, interval = ?, due = ? WHERE id = ?",
+                    rows
+                )
+        if self.current_wordlist_name != self._db_name:
+            self._set_meta("current_wordlist_name", self.current_wordlist_name)
+
+    def checkpoint(self):
+        """数据库在每次保存时已提交，这里只需合并 WAL 日志。"""
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def load_progress(self, path=None):
+        """
+        从数据库加载全部单词和状态。
+        path 指向 JSON 进度文件时按原格式读取，随后的 save_progress() 会把它写入数据库。
+        """
+        path = path or self.db_path
+        if path != self.db_path:
+            return super().load_progress(path)
+
+        # 内存中的单词与数据库保持同步 (每次修改都会立即写入)，无需重新读取
+        if self.words and self._db_words is self.words:
+            return self.words
+
+        rows = self._conn.execute(
+            "SELECT id, word, definition, pos, example, stage, learned, attempts, reviewed, tested, ease, interval, due "
+            "FROM words ORDER BY id"
+        ).fetchall()
+        columns = WordColumns()
+        self.words = [columns.add(r[1], r[2], r[3], r[4], r[5], r[7], pack_word_flags(r[6], r[8], r[9]),
+                                  int(round(r[10] * 1000)), r[11], r[12])
+                      for r in rows]
+        self._bind_rows([r[0] for r in rows])
+
+        name = self._conn.execute("SELECT value FROM meta WHERE key = 'current_wordlist_name'").fetchone()
+        self.current_wordlist_name = name[0] if name else "来自进度文件"
+        self._db_name = self.current_wordlist_name
+        return self.words
+
+    def load_all_data(self, allow_network=True):
+        """
+        启动加载：数据库为空而存在旧的进度文件 (progress.bin 或 progress.json) 时先执行一次迁移，
+        之后沿用默认的加载顺序；从词库文件加载的单词会立即写入数据库。
+        """
+        empty = self._conn.execute("SELECT 1 FROM words LIMIT 1").fetchone() is None
+        legacy = next((p for p in (self.legacy_progress_path, self.json_progress_path) if os.path.exists(p)), None)
+        if empty and legacy:
+            try:
+                count = migrate_progress_json(legacy, self.db_path)
+                print(f"已将 {count} 个单词从 {legacy} 迁移到 {self.db_path}")
+            except Exception as e:
+                print(f"迁移旧进度文件失败: {e}")
+
+        if self._conn.execute("SELECT 1 FROM words LIMIT 1").fetchone() is None:
+            # 数据库中没有单词：走默认加载顺序 (上次词库 -> 默认词库 -> 网络下载)
+            ok = super().load_all_data(allow_network)
+            if ok:
+                self.save_progress()
+            return ok
+
+        self.load_settings()
+        self.load_progress()
+        print("Data loaded from SQLite database.")
+        self.startup_source = "database" if self.words else "failed"
+        return bool(self.words)
+
+    def fetch_default_wordlist(self):
+        """从网络下载默认词库，并立即写入数据库。"""
+        ok = super().fetch_default_wordlist()
+        if ok:
+            self.save_progress()
+        return ok
+
+    # =============== 单词筛选 ===============
+    def select_words(self, status):
+        """通过索引查询指定状态的单词；内存中的词库尚未写入数据库时退回列表筛选。"""
+        if status not in STATUS_WHERE:
+            raise ValueError(f"未知的单词状态: {status}")
+        if self._db_words is not self.words:
+            return super().select_words(status)
+        rows = self._conn.execute(f"SELECT id FROM words WHERE {STATUS_WHERE[status]} ORDER BY id").fetchall()
+        return [self._items_by_row[r[0]] for r in rows]
+
+    def sample_words(self, status, count):
+        """
+        由索引查询指定状态的单词，再用全局 random 随机抽取最多 count 个。
+        不使用 SQL 的 RANDOM()：抽取结果由随机种子决定，与默认后端 (同样按词库顺序抽取) 一致。
+        """
+        if status not in STATUS_WHERE:
+            raise ValueError(f"未知的单词状态: {status}")
+        if self._db_words is not self.words:
+            return super().sample_words(status, count)
+        rows = [r[0] for r in self._conn.execute(f"SELECT id FROM words WHERE {STATUS_WHERE[status]} ORDER BY id")]
+        return [self._items_by_row[row] for row in random.sample(rows, min(count, len(rows)))]
+
+    def count_words(self, status):
+        """由索引统计指定状态的单词数量。"""
+        if status not in STATUS_WHERE:
+            raise ValueError(f"未知的单词状态: {status}")
+        if self._db_words is not self.words:
+            return super().count_words(status)
+        return self._conn.execute(f"SELECT COUNT(*) FROM words WHERE {STATUS_WHERE[status]}").fetchone()[0]
+
+    def due_words(self, count, now=None, ahead=False):
+        """由到期时间索引查询最早到期的最多 count 个已学单词 (参数同 VocabModel.due_words)。"""
+        if self._db_words is not self.words:
+            return super().due_words(count, now, ahead)
+        now = int(time.time() if now is None else now)
+        where = "learned = 1" if ahead else "learned = 1 AND due <= ?"
+        rows = self._conn.execute(
+            f"SELECT id FROM words WHERE {where} ORDER BY due, id LIMIT ?", (count,) if ahead else (now, count)
+        ).fetchall()
+        return [self._items_by_row[r[0]] for r in rows]
+
+    def get_stats(self):
+        """获取学习统计数据 (已学习数量, 全部数量)。"""
+        if self._db_words is not self.words:
+            return super().get_stats()
+        learned, total = self._conn.execute("SELECT COALESCE(SUM(learned), 0), COUNT(*) FROM words").fetchone()
+        return learned, total
+
+
+if __name__ == "__main__":
+    # 一次性迁移：python sqlite_store.py [progress.bin|progress.json] [vocab.db]
+    default_src = os.path.join("data", "progress.bin")
+    if not os.path.exists(default_src):
+        default_src = os.path.join("data", "progress.json")
+    src = sys.argv[1] if len(sys.argv) > 1 else default_src
+    dst = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DB_PATH
+    n = migrate_progress_json(src, dst)
+    print(f"已迁移 {n} 个单词: {src} -> {dst}")
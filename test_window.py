@@ -1,6 +1,5 @@
 import csv
 import os
-import random
 
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
@@ -8,6 +7,7 @@ from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QLineEd
     QHBoxLayout
 
 from vocab_model import VocabModel
+from session import TestSession
 
 
 class TestWindow(QMainWindow):
@@ -78,12 +78,8 @@ class TestWindow(QMainWindow):
         self.input.returnPressed.connect(self.on_submit)
 
         # 数据初始化
-        self.words = []
-
-        self.test_list = []
+        self.session = None  # 测试流程 (TestSession)：选词、出题、判分并更新 tested 状态
         self.current = None
-        self.total = 0
-        self.correct = 0
 
         self._prepare_and_start()
 
@@ -135,24 +131,21 @@ class TestWindow(QMainWindow):
             }
         """)
 
+    def closeEvent(self, event):
+        """关闭窗口前等待后台保存完成，确保本次的进度已写入磁盘。"""
+        self.model.flush()
+        super().closeEvent(event)
+
     def _prepare_and_start(self):
         """
-        根据设置准备测试单词列表，并开始测试。
+        根据设置准备测试单词列表 (由 TestSession 抽取未测试过的单词)，并开始测试。
         """
-        # 从 VocabModel 的设置中获取单次测试数量
-        count = self.model.settings.get("test_count", 20)
-        pool = [w for w in self.model.words if not w.tested] # 只测试未测试过的单词
+        self.session = TestSession(self.model)
 
-        if not pool:
+        if self.session.finished:
             QMessageBox.information(self, "提示", "词库为空，请导入单词库。")
             return
 
-        # 随机打乱单词，并根据设置的数量抽取
-        random.shuffle(pool)
-        self.test_list = pool[:min(count, len(pool))]
-
-        self.total = 0
-        self.correct = 0
         self._update_score()  # 初始化分数显示
         self.next_q()
 
@@ -162,8 +155,9 @@ class TestWindow(QMainWindow):
         """
         self.next_btn.setEnabled(False)  # 禁用下一题按钮
 
-        if not self.test_list:
-            self.cloze.setText(f"🎉 本次测试完成！ 🎉\n" f"得分：{self.correct} / {self.total}")
+        question = self.session.next_question()
+        if question is None:
+            self.cloze.setText(f"🎉 本次测试完成！ 🎉\n" f"得分：{self.session.correct} / {self.session.answered}")
             self.submit.hide()
             self.next_btn.hide()
             self.input.hide()
@@ -173,20 +167,16 @@ class TestWindow(QMainWindow):
             QTimer.singleShot(3000, self.close)
             return
 
-        # 弹出测试列表的第一个单词
-        self.current = self.test_list.pop(0)
-
-        # 制作填空提示
-        cloze = self._make_cloze(self.current.word)
+        self.current = question.item
 
         # 在界面上显示填空提示和词性和释义
         if self.current.definition:
             # 移除释义中的换行符，确保显示在一行
             clean_definition = self.current.definition.replace('\n', ' / ')
             pos = self.current.pos
-            self.cloze.setText(f"{cloze}\n\n词性:{pos}.\n释义: {clean_definition}\n")
+            self.cloze.setText(f"{question.cloze}\n\n词性:{pos}.\n释义: {clean_definition}\n")
         else:
-            self.cloze.setText(cloze)
+            self.cloze.setText(question.cloze)
 
         self.input.setText("")  # 清空输入框
         self.input.setFocus()  # 设置焦点到输入框
@@ -195,42 +185,24 @@ class TestWindow(QMainWindow):
         """
         处理用户提交的答案。
         """
-        if not self.current: return
+        if self.session is None or self.session.current is None: return
 
         s = self.input.text().strip()
         if s == "":
             QMessageBox.warning(self, "提示", "请输入答案")
             return
 
-        self.total += 1
-
-        # 核心判断逻辑：不区分大小写
-        if s.lower() == self.current.word.lower():
-            self.correct += 1
+        # 核心判断逻辑 (不区分大小写) 和 tested 状态的更新都由 TestSession 完成，只会保存本次变化的单词
+        feedback = self.session.answer(s)
+        if feedback.correct:
             QMessageBox.information(self, "正确", "回答正确！")
 
-            # --- 更新 VocabModel 状态的关键逻辑 ---
-            tested_word_str = self.current.word  # 当前正确单词
-
-            # 1. 在 VocabModel 的总单词列表中查找匹配的 WordItem 对象
-            model_word = next(
-                (w for w in self.model.words if w.word.lower() == tested_word_str.lower()),
-                None
-            )
-
-            if model_word:
-                # 2. 更新对应 WordItem 的 tested 状态为 True
-                model_word.tested = True
-
-            # 3. 保存模型的进度，将更新后的状态持久化
-            self.model.save_progress()
-
             # 延时 600ms 自动跳转到下一题
             QTimer.singleShot(600, self.next_q)
 
         else:
             # 回答错误
-            QMessageBox.information(self, "错误", f"正确答案是: {self.current.word}")
+            QMessageBox.information(self, "错误", f"正确答案是: {feedback.expected}")
             self.next_btn.setEnabled(True)  # 启用下一题按钮，让用户手动跳过
 
         self._update_score()
@@ -239,26 +211,6 @@ class TestWindow(QMainWindow):
         """
         更新计分板上的分数和正确率。
         """
-        pct = (self.correct / self.total * 100) if self.total > 0 else 0.0
-        self.score.setText(f"{self.correct} / {self.total} ({pct:.2f}%)")
-
-    def _make_cloze(self, word):
-        """
-        生成填空提示，随机将单词的部分字母替换为下划线。
-        - 至少替换 1 个字母。
-        - 最多替换单词长度的一半。
-        """
-        chars = list(word)
-        import random as _r
-
-        # 确保单词不为空
-        if len(chars) == 0: return ""
-
-        # 随机确定要替换的字母数量 n
-        n = max(1, min(len(chars) - 1, _r.randint(1, max(1, len(chars) // 2))))
-
-        # 随机选择要替换的字母索引
-        idxs = _r.sample(range(len(chars)), n)
-
-        # 生成填空字符串，用 '_' 替换被选中的字母
-        return ' '.join([('_' if i in idxs else c) for i, c in enumerate(chars)])
+        correct, total = self.session.correct, self.session.answered
+        pct = (correct / total * 100) if total > 0 else 0.0
+        self.score.setText(f"{correct} / {total} ({pct:.2f}%)")
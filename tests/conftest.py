@@ -0,0 +1,33 @@
+import os, sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))  # 本地 HTTP 服务器 local_server.py
+
+WORDLIST_DIR = os.path.join(ROOT, "词库")
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """在临时目录中运行测试，程序写入的 data 目录不会影响仓库。"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def serve():
+    """serve(directory, rate=0, drop_after=0) 启动代替 GitHub 的本地 HTTP 服务器，测试结束后关闭。"""
+    from local_server import start_server
+    servers = []
+
+    def start(directory, rate=0, drop_after=0):
+        server = start_server(directory, rate, drop_after)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
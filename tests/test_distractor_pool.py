@@ -0,0 +1,53 @@
+"""形近词索引：编辑距离 (distractor_pool.edit_distance) 和 BK 树 (BKTree)。"""
+import os
+import random
+
+from conftest import WORDLIST_DIR
+from distractor_pool import BKTree, differing_positions, edit_distance
+from vocab_model import VocabModel
+
+
+def reference_distance(a, b):
+    """逐格填表的动态规划，作为对照。"""
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[0], i
+        for j, cb in enumerate(b, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (ca != cb))
+    return row[-1]
+
+
+def test_edit_distance_matches_dynamic_programming():
+    rng = random.Random(1)
+    pairs = [("", ""), ("", "abc"), ("abc", ""), ("affect", "effect"), ("adapt", "adopt"), ("kitten", "sitting"),
+             ("flaw", "lawn"), ("词库", "词典"), ("a" * 70, "a" * 69 + "b"), ("ab" * 40, "ba" * 41)]
+    for _ in range(500):
+        pairs.append(tuple("".join(rng.choice("abcd") for _ in range(rng.randrange(12))) for _ in range(2)))
+    for a, b in pairs:
+        assert edit_distance(a, b) == reference_distance(a, b), (a, b)
+
+
+def test_bk_tree_search_matches_linear_scan():
+    rng = random.Random(2)
+    words = ["".join(rng.choice("abcde") for _ in range(rng.randint(1, 7))) for _ in range(400)]
+    tree = BKTree(words)
+    vocabulary = set(words)
+    assert tree.size == len(vocabulary)  # 重复的单词只加入一次
+    for query in words[:50] + ["", "zzz", "abcdeabcde"]:
+        for max_distance in range(4):
+            expected = sorted((reference_distance(query, w), w) for w in vocabulary
+                              if reference_distance(query, w) <= max_distance)
+            assert sorted(tree.search(query, max_distance)) == expected
+    assert BKTree().search("word", 2) == []
+
+
+def test_confusable_words_on_bundled_list(workdir):
+    model = VocabModel()
+    assert model.load_words_from_json(os.path.join(WORDLIST_DIR, "7-SAT-顺序.json"))
+    found = [w.word.lower() for w in model.confusable_words("principal", 10)]
+    assert found == ["principle"]
+    found = [w.word.lower() for w in model.confusable_words("effect", 10)]
+    assert found and "effect" not in found
+    assert all(edit_distance("effect", w) <= 2 for w in found)
+    assert differing_positions("affect", ["effect"]) == [0]
+    assert differing_positions("adapt", ["adopt"]) == [2]
@@ -0,0 +1,43 @@
+"""流式下载 (downloader.download_to_file、VocabModel.load_words_from_download)，用本地 HTTP 服务器代替 GitHub。"""
+import os
+import threading
+from urllib.parse import quote
+
+import pytest
+
+from conftest import WORDLIST_DIR
+from downloader import DownloadCancelled, download_to_file
+from vocab_model import VocabModel
+
+NAME = "1-初中-顺序.json"
+
+
+def part_files():
+    return [n for n in os.listdir("data") if n.endswith(".part")]
+
+
+def test_streamed_download_imports_same_words(workdir, serve):
+    server = serve(WORDLIST_DIR)
+    size = os.path.getsize(os.path.join(WORDLIST_DIR, NAME))
+    updates = []
+    path = download_to_file(server.url(quote(NAME)), progress=lambda received, total: updates.append((received, total)))
+    words = VocabModel().load_words_from_download(path, NAME)
+
+    expected = VocabModel().load_words_from_json(os.path.join(WORDLIST_DIR, NAME))
+    assert [(w.word, w.definition, w.pos) for w in words] == [(w.word, w.definition, w.pos) for w in expected]
+    assert updates[0] == (0, size) and updates[-1] == (size, size)
+    assert part_files() == []
+
+
+def test_cancel_removes_partial_file(workdir, serve):
+    server = serve(WORDLIST_DIR, rate=1024 * 1024)
+    size = os.path.getsize(os.path.join(WORDLIST_DIR, NAME))
+    cancel = threading.Event()
+
+    def progress(received, total):
+        if received >= size // 4:
+            cancel.set()
+
+    with pytest.raises(DownloadCancelled):
+        download_to_file(server.url(quote(NAME)), progress=progress, cancel_event=cancel)
+    assert part_files() == []
@@ -0,0 +1,68 @@
+"""共享网络层 (http_client.fetch) 的条件请求缓存，用本地 HTTP 服务器代替 GitHub。"""
+import json, os, shutil
+
+import pytest
+
+import http_client
+from conftest import ROOT
+
+FILES = ("update_manifest.json", "announcement.json")
+
+
+@pytest.fixture
+def remote(workdir, serve, monkeypatch):
+    """提供更新清单和公告的服务器；每个测试使用新的连接池和统计。"""
+    directory = workdir / "remote"
+    directory.mkdir()
+    for name in FILES:
+        shutil.copy(os.path.join(ROOT, name), directory)
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(http_client, "stats", dict.fromkeys(http_client.stats, 0))
+    return serve(str(directory))
+
+
+def launch(server):
+    """模拟一次启动 (新的连接池)，按程序中的方式获取更新清单和公告，返回本次的缓存统计。"""
+    http_client._session = None
+    for key in http_client.stats:
+        http_client.stats[key] = 0
+    http_client.fetch(server.url("update_manifest.json")).json()
+    http_client.fetch(server.url("announcement.json"), max_age=http_client.ANNOUNCEMENT_MAX_AGE).json()
+    return dict(http_client.stats)
+
+
+def test_second_launch_does_not_download_again(remote):
+    assert launch(remote) == {"full": 2, "not_modified": 0, "fresh": 0, "offline": 0}
+    requests_before = remote.stats["requests"]
+    # 公告在有效期内不访问网络，更新清单由 304 重新验证
+    assert launch(remote) == {"full": 0, "not_modified": 1, "fresh": 1, "offline": 0}
+    assert remote.stats["requests"] == requests_before + 1
+
+    # 公告缓存过期后也只发送条件请求
+    for name in os.listdir(http_client.CACHE_DIR):
+        if name.endswith(".json"):
+            path = os.path.join(http_client.CACHE_DIR, name)
+            with open(path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["fetched"] -= http_client.ANNOUNCEMENT_MAX_AGE
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+    assert launch(remote) == {"full": 0, "not_modified": 2, "fresh": 0, "offline": 0}
+
+
+def test_changed_file_is_downloaded_again(remote, workdir):
+    launch(remote)
+    manifest = {"version": "9.9.9", "wordlists": []}
+    with open(workdir / "remote" / "update_manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    assert launch(remote)["full"] == 1
+    assert http_client.fetch(remote.url("update_manifest.json")).json() == manifest
+
+
+def test_offline_uses_cached_content(remote):
+    launch(remote)
+    expected = http_client.fetch(remote.url("update_manifest.json")).json()
+    remote.shutdown()
+    remote.server_close()
+    assert launch(remote) == {"full": 0, "not_modified": 0, "fresh": 1, "offline": 1}
+    assert http_client.fetch(remote.url("update_manifest.json")).json() == expected
@@ -0,0 +1,55 @@
+"""VocabModel 的增量索引 (状态行集合、计数、到期时间索引、抽取权重、单词索引) 与全表扫描一致。"""
+import os
+import random
+
+from conftest import WORDLIST_DIR
+import session
+from simulator import DAY_SECONDS, SIM_EPOCH, Responder
+from vocab_model import VocabModel
+
+WORDLIST = os.path.join(WORDLIST_DIR, "1-初中-顺序.json")
+
+
+def states(model):
+    return [(w.stage, w.attempts, w.flags, w.due) for w in model.words]
+
+
+def run(flow, responder):
+    question = flow.next_question()
+    while question is not None:
+        flow.answer(responder.respond(question, responder.decide(question)))
+        question = flow.next_question()
+
+
+def test_indexes_stay_consistent(workdir):
+    model = VocabModel()
+    model.settings.update(async_save=False, learn_weighted=True)
+    assert model.load_words_from_json(WORDLIST)
+    model.save_progress()
+    assert model.check_indexes() == []
+
+    rng = random.Random(7)
+    responder = Responder("average", rng)
+    for day in range(6):
+        now = SIM_EPOCH + day * DAY_SECONDS
+        run(session.LearnSession(model, 15, rng=rng, now=now), responder)
+        assert model.check_indexes() == []
+        run(session.ReviewSession(model, 15, rng=rng, now=now), responder)
+        assert model.check_indexes() == []
+        run(session.TestSession(model, 10, rng=rng), responder)
+        assert model.check_indexes() == []
+    assert model.count_words("learned") and model.count_words("tested")
+
+    # 未写检查点：重新启动时由快照 + 日志回放恢复进度
+    assert os.path.getsize(model.journal_path) > 0
+    reloaded = VocabModel()
+    assert reloaded.load_all_data(allow_network=False) and reloaded.startup_source == "progress"
+    assert states(reloaded) == states(model)
+    assert reloaded.check_indexes() == []
+
+    # 写检查点后再次加载
+    model.checkpoint()
+    reloaded = VocabModel()
+    assert reloaded.load_all_data(allow_network=False)
+    assert states(reloaded) == states(model)
+    assert reloaded.check_indexes() == []
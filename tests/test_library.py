@@ -0,0 +1,121 @@
+"""本地词库库的断点续传、SHA-256 校验 (library.install) 和并发同步 (library.sync_library)，用本地 HTTP 服务器代替 GitHub。"""
+import hashlib, json, os, shutil, threading
+
+import pytest
+
+import downloader
+import library
+import storage_codec
+from conftest import WORDLIST_DIR
+from vocab_model import VocabModel
+
+NAME = "1-初中-顺序.json"
+
+
+@pytest.fixture
+def remote(workdir):
+    directory = workdir / "remote"
+    directory.mkdir()
+    shutil.copy(os.path.join(WORDLIST_DIR, NAME), directory)
+    return str(directory / NAME)
+
+
+def published(path):
+    return {"sha256": downloader.file_sha256(path), "size": os.path.getsize(path)}
+
+
+def stored_sha256(path):
+    """库中文件 (可能已压缩) 解压后内容的 SHA-256。"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(storage_codec.decompress(f.read())).hexdigest()
+
+
+def library_files():
+    if not os.path.isdir(library.LIBRARY_DIR):
+        return []
+    return sorted(n for n in os.listdir(library.LIBRARY_DIR) if n != library.MANIFEST_NAME)
+
+
+def test_dropped_connections_resume_with_range(remote, serve, monkeypatch):
+    monkeypatch.setattr(downloader, "RETRY_DELAY", 0)
+    size = os.path.getsize(remote)
+    server = serve(os.path.dirname(remote), drop_after=256 * 1024)
+    result = library.install(VocabModel(), NAME, published(remote), server.url(""))
+    assert result == "downloaded"
+    assert server.stats["partial"] >= 3 and server.stats["dropped"] >= 3
+    assert server.stats["bytes"] == size  # 续传只请求剩余部分，总共发送一份文件大小
+    assert stored_sha256(library.library_path(NAME)) == downloader.file_sha256(remote)
+    assert library_files() == [NAME]
+
+
+def test_sha256_mismatch_is_rejected(remote, serve):
+    server = serve(os.path.dirname(remote))
+    result = library.install(VocabModel(), NAME, {"sha256": "0" * 64}, server.url(""))
+    assert result.startswith("failed")
+    assert library_files() == []
+    assert not os.path.exists(library.library_path(NAME) + ".part")
+
+
+def test_changed_remote_file_is_downloaded_in_full(remote, serve):
+    size = os.path.getsize(remote)
+    server = serve(os.path.dirname(remote))
+    model = VocabModel()
+    cancel_event = threading.Event()
+
+    def cancel_midway(received, total):
+        if received >= size // 2:
+            cancel_event.set()
+
+    result = library.install(model, NAME, published(remote), server.url(""), cancel_midway, cancel_event)
+    assert result == "cancelled" and os.path.getsize(library.library_path(NAME) + ".part") >= size // 2
+
+    # 保留的部分文件与远程的新文件不符：If-Range 不匹配，服务器返回完整的新文件
+    with open(remote, "a", encoding="utf-8") as f:
+        f.write("\n")
+    before = dict(server.stats)
+    received = []
+    result = library.install(model, NAME, published(remote), server.url(""),
+                             lambda done, total: received.append(done))
+    assert result == "downloaded"
+    assert server.stats["full"] == before["full"] + 1 and server.stats["partial"] == before["partial"]
+    assert received[-1] - received[0] == os.path.getsize(remote)
+    assert stored_sha256(library.library_path(NAME)) == downloader.file_sha256(remote)
+    assert library_files() == [NAME]
+
+
+def test_sync_installs_each_list_and_isolates_failures(workdir, serve, monkeypatch):
+    monkeypatch.setattr(downloader, "RETRY_DELAY", 0)
+    directory = workdir / "remote"
+    directory.mkdir()
+    shutil.copy(os.path.join(WORDLIST_DIR, NAME), directory)
+    shutil.copy(os.path.join(WORDLIST_DIR, "六级-乱序.csv"), directory)
+    shutil.copy(os.path.join(WORDLIST_DIR, "7-SAT-顺序.json"), directory / "corrupt.json")
+    manifest_path = str(workdir / "update_manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        # missing.json 在清单中而服务器上没有 (404)
+        json.dump({"wordlists": ["corrupt.json", NAME, "missing.json", "六级-乱序.csv"]}, f)
+    entries = library.publish(str(directory), manifest_path)
+    shutil.copy(manifest_path, directory)
+    with open(directory / "corrupt.json", "a", encoding="utf-8") as f:
+        f.write("\n")  # 发布后内容被改动：SHA-256 与清单不一致
+
+    server = serve(str(directory))
+    monkeypatch.setattr(library, "MANIFEST_URL", server.url("update_manifest.json"))
+    model = VocabModel()
+    results = library.sync_library(model, base_url=server.url(""))
+    assert list(results) == ["corrupt.json", NAME, "missing.json", "六级-乱序.csv"]
+    assert results[NAME] == results["六级-乱序.csv"] == "downloaded"
+    assert results["corrupt.json"].startswith("failed") and results["missing.json"].startswith("failed")
+    assert library_files() == [NAME, "六级-乱序.csv"]
+    manifest = library.load_manifest()
+    for name in (NAME, "六级-乱序.csv"):
+        assert manifest[name]["sha256"] == entries[name]["sha256"] and manifest[name]["version"] == 1
+        assert stored_sha256(library.library_path(name)) == entries[name]["sha256"]
+        assert library.local_file(name) == library.library_path(name)
+
+    # 再次同步：已是发布的版本的词库不访问网络，失败的词库重新尝试
+    before = dict(server.stats)
+    results = library.sync_library(model, base_url=server.url(""))
+    assert results[NAME] == results["六级-乱序.csv"] == "unchanged"
+    assert results["corrupt.json"].startswith("failed") and results["missing.json"].startswith("failed")
+    assert server.stats["bytes"] - before["bytes"] == os.path.getsize(directory / "corrupt.json")
@@ -0,0 +1,41 @@
+"""后台保存 (SaveWorker、VocabModel.save_progress 的异步路径)。"""
+import os
+import threading
+
+from conftest import WORDLIST_DIR
+from vocab_model import VocabModel
+
+
+def states(model):
+    return [(w.word, w.stage, w.attempts, w.learned, w.due) for w in model.words]
+
+
+def test_worker_only_writes_data_captured_on_the_calling_thread(workdir):
+    model = VocabModel()
+    model.settings.update(async_save=True, save_delay_ms=50, journal_checkpoint_every=7)
+    captured_on = []
+    capture = model._capture_snapshot
+
+    def capture_snapshot():
+        captured_on.append(threading.current_thread())
+        return capture()
+
+    model._capture_snapshot = capture_snapshot
+
+    assert model.load_words_from_json(os.path.join(WORDLIST_DIR, "1-初中-顺序.json"))
+    model.save_progress()
+    for i, w in enumerate(model.words[:30]):
+        w.stage, w.attempts = 2, i + 1
+        model.save_progress()  # 超过 journal_checkpoint_every 时写完整快照
+    # 保存尚未写入时替换词库：后台线程写出的仍是调用 save_progress 时的数据
+    assert model.load_words_from_json(os.path.join(WORDLIST_DIR, "4-CET6-顺序.json"))
+    model.save_progress()
+    for w in model.words[:5]:
+        w.stage, w.learned, w.due = 4, True, 1_700_000_000
+        model.save_progress()
+    model.flush()
+
+    assert len(captured_on) > 2 and all(t is threading.main_thread() for t in captured_on)
+    reloaded = VocabModel()
+    assert reloaded.load_all_data(allow_network=False) and reloaded.startup_source == "progress"
+    assert states(reloaded) == states(model)
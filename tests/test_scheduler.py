@@ -0,0 +1,94 @@
+"""SM-2 复习计划 (scheduler.py)：难度系数和间隔的更新，以及到期时间索引 DueIndex。"""
+import random
+
+import pytest
+
+import scheduler
+from scheduler import DAY_SECONDS, DEFAULT_EASE, MAX_INTERVAL, MIN_EASE, RELEARN_DELAY, DueIndex
+
+LEARNED = 1
+
+
+class Columns:
+    """DueIndex 只读取列式存储的 flags、due 和行数。"""
+
+    def __init__(self, n):
+        self.flags = [0] * n
+        self.due = [0] * n
+
+    def __len__(self):
+        return len(self.due)
+
+
+class Item:
+    def __init__(self, ease=DEFAULT_EASE, interval=0, due=0):
+        self.ease, self.interval, self.due = ease, interval, due
+
+
+def test_ease_update_and_floor():
+    assert scheduler.next_ease(DEFAULT_EASE, 5) == pytest.approx(2.6)
+    assert scheduler.next_ease(DEFAULT_EASE, 4) == pytest.approx(2.5)
+    assert scheduler.next_ease(DEFAULT_EASE, 3) == pytest.approx(2.36)
+    ease = DEFAULT_EASE
+    for _ in range(20):
+        ease = scheduler.next_ease(ease, 0)
+        assert ease >= MIN_EASE
+    assert ease == MIN_EASE
+
+
+def test_interval_growth():
+    intervals = [0]
+    ease = DEFAULT_EASE
+    for _ in range(30):
+        intervals.append(scheduler.next_interval(intervals[-1], ease, 4))
+    assert intervals[1:4] == [1, 6, 15]
+    assert all(b > a for a, b in zip(intervals, intervals[1:]) if a < MAX_INTERVAL)
+    assert intervals[-1] == MAX_INTERVAL
+    # ease 很小时间隔仍至少增加 1 天
+    assert scheduler.next_interval(2, MIN_EASE, 3) == 3
+    # 遗忘：间隔清零
+    assert scheduler.next_interval(40, DEFAULT_EASE, 2) == 0
+
+
+def test_review_sets_due():
+    now = 1_700_000_000
+    item = Item()
+    scheduler.review(item, 4, now)
+    assert (item.interval, item.due) == (1, now + DAY_SECONDS)
+    scheduler.review(item, 4, now)
+    assert (item.interval, item.due) == (6, now + 6 * DAY_SECONDS)
+    scheduler.review(item, 1, now)
+    assert item.interval == 0 and item.due == now + RELEARN_DELAY and item.ease < DEFAULT_EASE
+
+
+def test_due_index_order_after_reschedule_and_remove():
+    rng = random.Random(5)
+    n = 200
+    columns = Columns(n)
+    for i in range(0, n, 2):
+        columns.flags[i] = LEARNED
+        columns.due[i] = rng.randrange(1000)
+    index = DueIndex(columns, LEARNED)
+
+    def expected(count, until=None):
+        rows = sorted((columns.due[i], i) for i in range(n) if columns.flags[i] & LEARNED)
+        return [i for due, i in rows if until is None or due <= until][:count]
+
+    for step in range(3000):
+        i = rng.randrange(n)
+        op = rng.random()
+        if op < 0.6:  # 重新排期 (可能与其他单词同一时间)
+            columns.flags[i] |= LEARNED
+            columns.due[i] = rng.randrange(1000)
+            index.push(i)
+        elif op < 0.8:  # 不再是已学完：旧条目惰性删除
+            columns.flags[i] &= ~LEARNED
+        else:  # 重新标记为已学完，due 不变
+            columns.flags[i] |= LEARNED
+            index.push(i)
+        if step % 50 == 0:
+            until = rng.randrange(1000)
+            assert index.earliest(20) == expected(20)
+            assert index.earliest(n, until) == expected(n, until)
+            assert index.earliest(20) == expected(20)  # 查询不改变索引
+    assert len(index._heap) <= 2 * n + 64 + 1  # 失效条目过多时整体重建
@@ -0,0 +1,156 @@
+"""不依赖界面的学习 / 复习 / 测试流程 (session.py)：按题目类型的阶段变化、复习计划和测试得分。"""
+import json
+import random
+from collections import deque
+
+import pytest
+
+import session
+from scheduler import DAY_SECONDS, DEFAULT_EASE
+from simulator import SIM_EPOCH
+from vocab_model import VocabModel
+
+WORDS = ["apple", "banana", "cherry", "grape", "lemon", "mango", "peach", "pear"]
+
+
+@pytest.fixture
+def model(workdir):
+    model = VocabModel()
+    model.settings.update(async_save=False)
+    content = json.dumps([{"word": w, "translations": [{"translation": f"{w} 的释义", "type": "n"}]}
+                          for w in WORDS], ensure_ascii=False)
+    assert len(model.load_words_from_json_content(content)) == len(WORDS)
+    return model
+
+
+def by_word(model):
+    return {w.word: w for w in model.words}
+
+
+def test_choice_stage_changes(model):
+    flow = session.LearnSession(model, 4, hard=False, rng=random.Random(1), now=SIM_EPOCH)
+    q = flow.next_question()
+    assert q.kind == session.CHOICE and len(q.options) == 4
+    assert session.option_text(q.item) in q.options
+    assert flow.next_question() is q  # 未回答时返回同一道题
+
+    feedback = flow.answer(session.option_text(q.item))
+    assert feedback.correct and q.item.stage == 2 and flow.queue[-1] is q.item
+
+    q = flow.next_question()
+    wrong = next(o for o in q.options if o != session.option_text(q.item))
+    feedback = flow.answer(wrong)
+    assert not feedback.correct and feedback.expected == session.option_text(q.item)
+    assert (q.item.stage, q.item.attempts) == (1, 1) and flow.queue[-1] is q.item
+    assert (flow.answered, flow.correct) == (2, 1)
+    with pytest.raises(RuntimeError):
+        flow.answer(wrong)
+
+
+def test_self_check_stage_changes_and_rotation(model):
+    words = by_word(model)
+    for word, stage in [("apple", 2), ("banana", 2), ("cherry", 3), ("grape", 1), ("lemon", 2)]:
+        words[word].stage = stage
+    flow = session.LearnSession(model, 0, hard=False, rng=random.Random(2), now=SIM_EPOCH)
+
+    flow.queue = deque([words["apple"]])
+    q = flow.next_question()
+    assert q.kind == session.SELF_CHECK
+    assert flow.answer(True).correct and words["apple"].stage == 3
+
+    # 不认识：退回阶段 1，并轮转队列直到阶段 1 的单词排在队首
+    flow.queue = deque(words[w] for w in ["banana", "cherry", "grape", "lemon"])
+    flow.queue.appendleft(words["apple"])
+    words["apple"].stage = 2
+    q = flow.next_question()
+    assert q.item is words["apple"]
+    assert not flow.answer(False).correct
+    assert (words["apple"].stage, words["apple"].attempts) == (1, 1)
+    assert [w.word for w in flow.queue] == ["grape", "lemon", "apple", "banana", "cherry"]
+
+
+def test_spelling_marks_learned_and_schedules(model):
+    words = by_word(model)
+    words["peach"].stage = 3
+    flow = session.LearnSession(model, 0, hard=False, rng=random.Random(3), now=SIM_EPOCH)
+
+    flow.queue = deque([words["peach"]])
+    q = flow.next_question()
+    assert q.kind == session.SPELL and q.cloze.replace(" ", "") != "peach"
+    flow.answer("peech")
+    assert (words["peach"].stage, words["peach"].attempts, words["peach"].learned) == (1, 1, False)
+
+    flow.queue = deque([words["peach"]])
+    words["peach"].stage = 3
+    flow.next_question()
+    flow.answer(None)  # 我不会：不计尝试次数
+    assert (words["peach"].stage, words["peach"].attempts) == (1, 1)
+
+    flow.queue = deque([words["peach"]])
+    words["peach"].stage = 3
+    flow.next_question()
+    assert flow.answer("  PEACH ").correct
+    assert words["peach"].learned and words["peach"].interval == 1
+    assert words["peach"].due == SIM_EPOCH + DAY_SECONDS
+    assert flow.finished and flow.next_question() is None
+    assert model.due_words(10, SIM_EPOCH) == []
+    assert model.due_words(10, SIM_EPOCH + DAY_SECONDS) == [words["peach"]]
+
+
+def test_learn_session_runs_to_completion(model):
+    flow = session.LearnSession(model, 3, hard=False, rng=random.Random(4), now=SIM_EPOCH)
+    q = flow.next_question()
+    while q is not None:
+        if q.kind == session.CHOICE:
+            flow.answer(session.option_text(q.item))
+        elif q.kind == session.SELF_CHECK:
+            flow.answer(True)
+        else:
+            flow.answer(q.item.word)
+        q = flow.next_question()
+    assert model.count_words("learned") == 3 and flow.answered == 9 == flow.correct
+
+
+def test_review_session(model):
+    words = by_word(model)
+    for word in ["apple", "banana"]:
+        words[word].learned = True
+        model.review_word(words[word], 4, SIM_EPOCH)
+    flow = session.ReviewSession(model, 5, hard=False, rng=random.Random(5), now=SIM_EPOCH + DAY_SECONDS)
+    assert len(flow.queue) == 2
+
+    q = flow.next_question()
+    assert q.kind == session.RECOGNIZE
+    first = q.item
+    assert flow.answer(True).correct
+    q = flow.next_question()
+    assert q.kind == session.SPELL and q.item is first
+    assert flow.answer(first.word).correct
+    assert first.reviewed and first.interval == 6 and first.ease == pytest.approx(DEFAULT_EASE)
+
+    # 不认识：重新出现，之后答对只按“困难”评分
+    q = flow.next_question()
+    second = q.item
+    assert not flow.answer(False).correct and second.interval == 0 and second.stage == 1
+    q = flow.next_question()
+    assert q.item is second and q.kind == session.RECOGNIZE
+    flow.answer(True)
+    flow.next_question()
+    assert flow.answer(second.word).correct
+    assert second.interval == 1 and second.ease < DEFAULT_EASE
+    assert flow.finished
+
+
+def test_test_session_score(model):
+    flow = session.TestSession(model, 5, rng=random.Random(6))
+    asked = []
+    q = flow.next_question()
+    while q is not None:
+        assert q.kind == session.SPELL
+        asked.append(q.item)
+        flow.answer(q.item.word if len(asked) % 2 else "wrong")  # 答错不重复出题
+        q = flow.next_question()
+    assert len(asked) == len({w.word for w in asked}) == 5
+    assert (flow.answered, flow.correct) == (5, 3)
+    assert {w.word for w in model.select_words("tested")} == {w.word for w in asked[::2]}
+    assert len(session.TestSession(model, 10).queue) == len(WORDS) - 3
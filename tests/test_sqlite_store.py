@@ -0,0 +1,94 @@
+"""SQLite 存储后端 (SQLiteVocabModel) 与默认后端的一致性，以及旧进度文件的迁移。"""
+import os
+import random
+
+import session
+from conftest import WORDLIST_DIR
+from simulator import DAY_SECONDS, SIM_EPOCH, Responder
+from sqlite_store import SQLiteVocabModel, migrate_progress_json
+from vocab_model import VocabModel
+
+WORDLIST = os.path.join(WORDLIST_DIR, "1-初中-顺序.json")
+STATUSES = ("unlearned", "learned", "reviewed", "tested", "untested", "all")
+
+
+def states(model):
+    return [(w.word, w.stage, w.attempts, w.learned, w.reviewed, w.tested, w.ease, w.interval, w.due)
+            for w in model.words]
+
+
+def selections(model):
+    return {status: ([w.word for w in model.select_words(status)], model.count_words(status))
+            for status in STATUSES}
+
+
+def study(model, days=4, seed=3):
+    """用固定的随机种子让模型完成几天的学习、复习和测试 (同一种子给出同样的答题结果)。"""
+    random.seed(seed)  # 模型内部的选词使用全局 random
+    rng = random.Random(seed)
+    responder = Responder("average", rng)
+    for day in range(days):
+        now = SIM_EPOCH + day * DAY_SECONDS
+        for make in (session.LearnSession, session.ReviewSession, session.TestSession):
+            flow = make(model, 20, rng=rng) if make is session.TestSession else make(model, 20, rng=rng, now=now)
+            question = flow.next_question()
+            while question is not None:
+                flow.answer(responder.respond(question, responder.decide(question)))
+                question = flow.next_question()
+
+
+def load(model):
+    model.settings["async_save"] = False
+    assert model.load_words_from_json(WORDLIST)
+    model.save_progress()
+    return model
+
+
+def test_backends_agree_on_the_same_answers(workdir):
+    memory = load(VocabModel())
+    database = load(SQLiteVocabModel(os.path.join("data", "vocab.db")))
+    study(memory)
+    study(database)
+
+    assert states(database) == states(memory)
+    assert selections(database) == selections(memory)
+    assert database.get_stats() == memory.get_stats()
+    now = SIM_EPOCH + 10 * DAY_SECONDS
+    assert [w.word for w in database.due_words(50, now)] == [w.word for w in memory.due_words(50, now)]
+
+    # 重新打开数据库：状态与内存中一致
+    database._conn.close()
+    reopened = SQLiteVocabModel(os.path.join("data", "vocab.db"))
+    assert reopened.load_all_data(allow_network=False) and reopened.startup_source == "database"
+    assert states(reopened) == states(memory)
+    reopened._conn.close()
+
+
+def test_sampling_follows_the_seed(workdir):
+    memory = load(VocabModel())
+    database = load(SQLiteVocabModel(os.path.join("data", "vocab.db")))
+    study(memory, days=2)
+    study(database, days=2)
+    for status in STATUSES:
+        random.seed(11)
+        expected = [w.word for w in memory.sample_words(status, 15)]
+        random.seed(11)
+        assert [w.word for w in database.sample_words(status, 15)] == expected
+    database._conn.close()
+
+
+def test_migrate_progress_round_trip(workdir):
+    memory = load(VocabModel())
+    memory.settings["learn_count"] = 12
+    memory.save_settings()
+    study(memory, days=2)
+    assert os.path.getsize(memory.journal_path) > 0  # 迁移时也要回放增量日志
+
+    db_path = os.path.join("data", "migrated.db")
+    assert migrate_progress_json(memory.progress_path, db_path) == len(memory.words)
+    migrated = SQLiteVocabModel(db_path)
+    assert migrated.load_all_data(allow_network=False)
+    assert states(migrated) == states(memory)
+    assert migrated.current_wordlist_name == memory.current_wordlist_name
+    assert migrated.settings["learn_count"] == 12
+    migrated._conn.close()
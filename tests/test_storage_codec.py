@@ -0,0 +1,67 @@
+"""压缩存储 (storage_codec.py) 与使用它的词库导入。"""
+import contextlib, io, json, os
+
+import storage_codec
+from conftest import WORDLIST_DIR
+from vocab_model import VocabModel
+
+NAME = "1-初中-顺序.json"
+
+
+def test_import_from_compressed_library_keeps_plain_backup(workdir):
+    src = os.path.join(WORDLIST_DIR, NAME)
+    os.makedirs("data")
+    stored = os.path.join("data", "stored.json")
+    storage_codec.compress_file(src, stored, "gzip")
+
+    model = VocabModel()
+    words = model.load_words_from_json(stored)
+    assert words
+    # data 目录中的词库备份是普通文本，与原文件相同
+    with open(model.last_json_path, "r", encoding="utf-8") as backup, open(src, "r", encoding="utf-8") as f:
+        assert json.load(backup) == json.load(f)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        reloaded = VocabModel().load_last_words()
+    assert "词库缓存命中" in output.getvalue()
+    assert [(w.word, w.definition) for w in reloaded] == [(w.word, w.definition) for w in words]
+
+
+def test_round_trip_and_detection():
+    data = "".join(f"word{i},n.,释义 {i},\n" for i in range(20000)).encode("utf-8")
+    for codec in storage_codec.CODECS:
+        packed = storage_codec.compress(data, codec)
+        assert storage_codec.detect(packed[:storage_codec.DETECT_SIZE]) == codec
+        assert storage_codec.decompress(packed) == data
+    assert storage_codec.compress(data, storage_codec.NONE) == data
+    assert storage_codec.decompress(data) == data
+
+
+def test_plain_text_starting_with_magic_is_not_decompressed(workdir):
+    # bz2 的魔数 "BZh" 是普通字母：以它开头的未压缩文件仍按普通文本读取
+    for text in ("BZh91AY&SY", "BZhang,n.,释义,\n" + "".join(f"word{i},n.,释义 {i},\n" for i in range(20000))):
+        data = text.encode("utf-8")
+        assert storage_codec.decompress(data) == data
+        path = str(workdir / "words.csv")
+        with open(path, "wb") as f:
+            f.write(data)
+        assert storage_codec.file_codec(path) == storage_codec.NONE
+        with storage_codec.open_text(path) as f:
+            assert f.read() == text
+
+    words = VocabModel().load_words_from_csv(path)
+    assert words[0].word == "BZhang" and len(words) == 20001
+
+
+def test_file_and_bytes_detection_agree_at_the_size_boundary(workdir):
+    # 恰好 DETECT_SIZE 字节时两种入口都只检查开头：截断的压缩数据按文件和按 bytes 识别的结果相同
+    data = os.urandom(3 * storage_codec.DETECT_SIZE)
+    path = str(workdir / "stored.bin")
+    for codec in storage_codec.CODECS:
+        packed = storage_codec.compress(data, codec)
+        for size in (storage_codec.DETECT_SIZE - 1, storage_codec.DETECT_SIZE, storage_codec.DETECT_SIZE + 1):
+            with open(path, "wb") as f:
+                f.write(packed[:size])
+            expected = storage_codec.NONE if size < storage_codec.DETECT_SIZE else codec
+            assert storage_codec.file_codec(path) == storage_codec.detect_prefix(packed[:size]) == expected
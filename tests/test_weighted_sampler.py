@@ -0,0 +1,59 @@
+"""按权重抽样的树状数组 (weighted_sampler.py)：修改权重、按前缀和查找和抽样比例。"""
+import random
+from collections import Counter
+
+from weighted_sampler import FenwickSampler
+
+
+def test_update_and_total():
+    rng = random.Random(1)
+    weights = [rng.randrange(5) for _ in range(37)]
+    sampler = FenwickSampler(weights)
+    assert sampler.total == sum(weights)
+    for _ in range(500):
+        i = rng.randrange(len(weights))
+        weights[i] = rng.randrange(5)
+        sampler.update(i, weights[i])
+        assert sampler.total == sum(weights)
+    assert [sampler.weight(i) for i in range(len(sampler))] == weights
+
+
+def test_find_matches_prefix_sums():
+    weights = [3, 0, 1, 0, 0, 4, 2, 0]
+    sampler = FenwickSampler(weights)
+    expected = [i for i, w in enumerate(weights) for _ in range(w)]
+    assert [sampler.find(t) for t in range(sampler.total)] == expected
+
+
+def test_zero_weights_never_sampled():
+    rng = random.Random(2)
+    sampler = FenwickSampler([0, 5, 0, 0, 1, 0])
+    for _ in range(2000):
+        assert sampler.sample(1, rng)[0] in (1, 4)
+    # 不放回：k 大于可抽取的个数时只返回权重非零的下标
+    assert sorted(sampler.sample(10, rng)) == [1, 4]
+    assert sampler.total == 6  # 抽样后权重恢复
+    assert FenwickSampler([0, 0]).sample(3, rng) == []
+    assert FenwickSampler().sample(3, rng) == []
+
+
+def test_sample_proportions():
+    rng = random.Random(3)
+    weights = [1, 2, 3, 4, 0, 10]
+    sampler = FenwickSampler(weights)
+    draws = 60000
+    counts = Counter(sampler.sample(1, rng)[0] for _ in range(draws))
+    total = sum(weights)
+    chi2 = sum((counts[i] - draws * w / total) ** 2 / (draws * w / total)
+               for i, w in enumerate(weights) if w)
+    assert counts[4] == 0
+    assert chi2 < 20.5  # 自由度 4，p = 0.0004
+
+
+def test_sample_without_replacement():
+    rng = random.Random(4)
+    sampler = FenwickSampler([1] * 10 + [0] * 5)
+    for _ in range(200):
+        picked = sampler.sample(6, rng)
+        assert len(picked) == len(set(picked)) == 6
+        assert all(i < 10 for i in picked)
@@ -0,0 +1,70 @@
+"""流式词库解析与原先整体读入的解析结果一致 (随仓库附带的 词库 目录中的全部文件)。"""
+import csv, io, json, os
+
+import pytest
+
+import vocab_model
+from conftest import WORDLIST_DIR
+from vocab_model import VocabModel
+
+WORDLISTS = sorted(os.listdir(WORDLIST_DIR))
+
+
+def reference_json(path):
+    """原先的解析方式：json.loads 整个文件，逐个元素取出单词、释义和词性。"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.loads(f.read())
+    entries = []
+    for item in data:
+        word = item.get('word', '').strip()
+        translations = item.get('translations', [])
+        if not word or not translations:
+            continue
+        definition_parts = []
+        pos_parts = []
+        for t in translations:
+            part_of_speech = t.get('type', 'n/a')
+            translation = t.get('translation', '')
+            if translation:
+                definition_parts.append(translation)
+                if part_of_speech != 'n/a':
+                    pos_parts.append(part_of_speech)
+        entries.append((word, "; ".join(definition_parts), ", ".join(sorted(set(pos_parts))), ""))
+    return entries
+
+
+def reference_csv(path):
+    """原先的解析方式：读入整个文件的全部行，有表头时跳过第一行。"""
+    with open(path, "r", encoding="utf-8") as f:
+        rows = list(csv.reader(io.StringIO(f.read())))
+    start = 1 if rows and any('单词' in c or 'word' in c.lower() for c in rows[0]) else 0
+    entries = []
+    for row in rows[start:]:
+        if not row:
+            continue
+        w = row[0].strip()
+        if w:
+            entries.append((w, row[2].strip() if len(row) > 2 else "", row[1].strip() if len(row) > 1 else "",
+                            row[3].strip() if len(row) > 3 else ""))
+    return entries
+
+
+def entries_of(words):
+    return [(w.word, w.definition, w.pos, w.example) for w in words]
+
+
+@pytest.mark.parametrize("name", WORDLISTS)
+def test_streaming_parser_matches_whole_file_parser(workdir, name):
+    path = os.path.join(WORDLIST_DIR, name)
+    expected = reference_json(path) if name.endswith(".json") else reference_csv(path)
+    assert expected
+    # 解析缓存为空，走流式解析
+    assert entries_of(VocabModel().parse_wordlist_file(path, name)) == expected
+
+
+def test_small_read_chunks(workdir, monkeypatch):
+    # 每次只读入很少的字符，元素和转义序列都会跨越读取边界
+    monkeypatch.setattr(vocab_model, "STREAM_CHUNK_SIZE", 61)
+    path = os.path.join(WORDLIST_DIR, "1-初中-顺序.json")
+    with open(path, "r", encoding="utf-8") as f:
+        assert entries_of(VocabModel()._parse_json_stream(f)) == reference_json(path)
@@ -0,0 +1,118 @@
+"""词库增量补丁 (wordlist_patch.py) 的生成和应用，以及增量更新后按单词 id 保留学习进度。"""
+import json, os, random
+
+import pytest
+
+import library
+import wordlist_patch
+from vocab_model import VocabModel, assign_word_ids
+
+NAME = "patch-test.json"
+OLD = [("bank", "银行", "n", ""), ("apple", "苹果", "n", ""), ("bank", "河岸", "n", ""), ("run", "跑", "v", ""),
+       ("bank", "堆积", "v", ""), ("light", "光", "n", ""), ("light", "轻的", "adj", ""), ("zoo", "动物园", "n", "")]
+# 删除 run 和 bank#3，修改 bank#2 和 zoo，新增 kite 和 light#3，把 apple 移到末尾
+NEW = [("bank", "银行", "n", ""), ("bank", "河岸；岸边", "n", ""), ("kite", "风筝", "n", ""), ("light", "光", "n", ""),
+       ("light", "轻的", "adj", ""), ("light", "点亮", "v", ""), ("zoo", "动物园", "n", "the city zoo"),
+       ("apple", "苹果", "n", "")]
+
+
+def test_round_trip():
+    patch = wordlist_patch.make_patch(OLD, NEW)
+    assert wordlist_patch.apply_patch(OLD, patch) == NEW
+    assert sorted(patch["removed"]) == ["apple", "bank#3", "run"]
+    assert sorted(c[0] for c in patch["changed"]) == ["bank#2", "zoo"]
+    assert [a[:2] for a in patch["added"]] == [[2, "kite"], [5, "light"], [7, "apple"]]
+    # 补丁经过 JSON 序列化后同样可以应用
+    assert wordlist_patch.apply_patch(OLD, json.loads(json.dumps(patch))) == NEW
+    assert wordlist_patch.apply_patch(OLD, wordlist_patch.make_patch(OLD, OLD)) == OLD
+    assert wordlist_patch.apply_patch([], wordlist_patch.make_patch([], NEW)) == NEW
+    assert wordlist_patch.apply_patch(NEW, wordlist_patch.make_patch(NEW, [])) == []
+
+
+def test_random_round_trips():
+    rng = random.Random(9)
+    vocabulary = ["a", "b", "c", "d", "e", "f"]  # 词汇很少，重复的单词很多
+    for _ in range(300):
+        old = [(rng.choice(vocabulary), str(rng.randrange(3)), "n", "") for _ in range(rng.randrange(12))]
+        new = list(old)
+        for _ in range(rng.randrange(6)):
+            op = rng.randrange(3)
+            if op == 0 and new:
+                new.pop(rng.randrange(len(new)))
+            elif op == 1 and new:
+                i = rng.randrange(len(new))
+                new[i] = (new[i][0], str(rng.randrange(3)), "v", "")
+            else:
+                new.insert(rng.randrange(len(new) + 1), (rng.choice(vocabulary), "x", "n", ""))
+        assert wordlist_patch.apply_patch(old, wordlist_patch.make_patch(old, new)) == new
+
+
+def test_mismatched_base_is_rejected():
+    patch = wordlist_patch.make_patch(OLD, NEW)
+    other = list(OLD)
+    other[3] = ("run", "奔跑", "v", "")  # 词条数相同，内容不同
+    with pytest.raises(wordlist_patch.PatchError):
+        wordlist_patch.apply_patch(other, patch)
+    with pytest.raises(wordlist_patch.PatchError):
+        wordlist_patch.apply_patch(OLD[:-1], patch)
+    with pytest.raises(wordlist_patch.PatchError):
+        wordlist_patch.apply_patch(OLD, dict(patch, **{"from": dict(patch["from"], entries="0" * 64)}))
+    with pytest.raises(wordlist_patch.PatchError):  # 应用结果与新版本的摘要不一致
+        wordlist_patch.apply_patch(OLD, dict(patch, changed=[]))
+    with pytest.raises(wordlist_patch.PatchError):
+        wordlist_patch.apply_patch(OLD, dict(patch, format=2))
+
+
+def write_wordlist(path, entries):
+    with open(path, "wb") as f:
+        f.write(wordlist_patch.dump_wordlist(entries, "json"))
+
+
+def published(manifest_path):
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return library.catalog_entries(json.load(f)["wordlists"])[NAME]
+
+
+def test_update_wordlist_keeps_progress_by_id(workdir, serve):
+    remote = workdir / "remote"
+    remote.mkdir()
+    remote_path = str(remote / NAME)
+    manifest_path = str(remote / "update_manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"wordlists": [NAME]}, f)
+    write_wordlist(remote_path, OLD)
+    library.publish(str(remote), manifest_path)
+    server = serve(str(remote))
+
+    model = VocabModel()
+    model.settings["async_save"] = False
+    assert library.install(model, NAME, published(manifest_path), server.url("")) == "downloaded"
+    assert model.load_words_from_json(library.library_path(NAME))
+    for i, w in enumerate(model.words):
+        w.stage, w.attempts, w.learned, w.due = i % 3 + 1, i + 1, i % 2 == 0, 1_700_000_000 + i
+    model.save_progress()
+    before = {wid: (w.stage, w.attempts, w.learned, w.due)
+              for wid, w in zip(assign_word_ids(w.word for w in model.words), model.words)}
+
+    # 发布版本 2 的补丁，增量更新本地词库库后把当前词库切换到新版本
+    old_path = str(workdir / "old.json")
+    os.replace(remote_path, old_path)
+    write_wordlist(remote_path, NEW)
+    library.publish_patch(VocabModel(), old_path, remote_path, manifest_path)
+    assert library.install(model, NAME, published(manifest_path), server.url("")) == "patched"
+    assert model.update_wordlist(library.library_path(NAME))
+
+    # JSON 词库文件不保存例句，只比较单词、释义和词性
+    assert [(w.word, w.definition, w.pos) for w in model.words] == [e[:3] for e in NEW]
+    after = {wid: (w.stage, w.attempts, w.learned, w.due)
+             for wid, w in zip(assign_word_ids(w.word for w in model.words), model.words)}
+    for wid in ("bank", "bank#2", "light", "light#2", "zoo", "apple"):
+        assert after[wid] == before[wid]  # 仍存在的单词 (包括内容变化和移动了位置的) 保留进度
+    assert after["kite"] == after["light#3"] == (1, 0, False, 0)  # 新增的单词为默认状态
+    assert not {"run", "bank#3"} & set(after)  # 删除的单词的状态被丢弃
+
+    model.save_progress()
+    reloaded = VocabModel()
+    assert reloaded.load_all_data(allow_network=False)
+    assert [(w.word, w.stage, w.attempts, w.learned, w.due) for w in reloaded.words] == \
+        [(w.word, w.stage, w.attempts, w.learned, w.due) for w in model.words]
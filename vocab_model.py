@@ -1,29 +1,327 @@
-import csv, json, os, shutil
-from dataclasses import dataclass, asdict
+import csv, hashlib, json, os, shutil, threading, time, uuid
+from array import array
+from itertools import compress
 from typing import List
 import requests
 import random  # 导入 random 用于后面构建选项
 from io import StringIO  # 新增：用于处理内存中的 CSV 字符串
+from save_worker import SaveWorker
+from downloader import download_to_file
+from distractor_pool import BKTree, DistractorPool, differing_positions, option_text
+import progress_snapshot
+import scheduler
+import storage_codec
+import wordlist_cache
+from weighted_sampler import FenwickSampler
+
+# 单词的可变状态字段：修改这些字段会被记录为待保存的变化
+STATE_FIELDS = ("stage", "learned", "attempts", "reviewed", "tested", "ease", "interval", "due")
+BOOL_FIELDS = ("learned", "reviewed", "tested")
+# 流式读取词库文件时每次读取的大小 (字符/字节)
+STREAM_CHUNK_SIZE = 1 << 16
+# 词库解析器版本：解析逻辑变化时加一，使旧的解析缓存失效
+PARSER_VERSION = 1
+
+# 启动时本地没有任何词库时依次尝试的默认词库
+DEFAULT_JSON_PATH = "4-CET6-顺序.json"
+DEFAULT_CSV_PATH = "六级.csv"
+# 使用 raw.githubusercontent.com 获取原始文件内容
+DEFAULT_CSV_URL = "https://raw.githubusercontent.com/Junpgle/LearnWord/master/%E8%AF%8D%E5%BA%93/%E5%85%AD%E7%BA%A7-%E4%B9%B1%E5%BA%8F.csv"
+
+
+def _atomic_write(path, text):
+    """先写入临时文件再替换目标文件，避免程序中途退出留下半个文件。"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _atomic_write_bytes(path, data):
+    """_atomic_write 的字节版本。"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# 列式存储中 learned / reviewed / tested 的标志位，与二进制进度快照中的取值一致，读写快照时可直接复制
+FLAG_LEARNED = progress_snapshot.FLAG_LEARNED
+FLAG_REVIEWED = progress_snapshot.FLAG_REVIEWED
+FLAG_TESTED = progress_snapshot.FLAG_TESTED
+
+# 加权抽取待学单词时 attempts 的计算上限，避免个别反复出错的单词占满每次的学习队列
+LEARN_WEIGHT_ATTEMPTS_CAP = 10
+
+# 列式存储中难度系数的默认千分值
+DEFAULT_EASE_PERMILLE = int(scheduler.DEFAULT_EASE * 1000)
+
+# 标志字节 -> 0/1 的转换表，配合 bytes.translate 在 C 层面批量判断标志位，用于整表筛选和计数
+_selector_tables = {}
+
+
+def _selector_table(mask, value):
+    """value 为 True 时 mask 中的位全部置位的字节映射为 1，为 False 时全部未置位的字节映射为 1。"""
+    table = _selector_tables.get((mask, value))
+    if table is None:
+        if value:
+            table = bytes(1 if b & mask == mask else 0 for b in range(256))
+        else:
+            table = bytes(0 if b & mask else 1 for b in range(256))
+        _selector_tables[(mask, value)] = table
+    return table
+
+
+# 单词状态 -> (标志位掩码, 取值)，含义同 WordColumns.flag_selector；"all" 不需要索引
+STATUS_MASKS = {
+    "unlearned": (FLAG_LEARNED, False),  # 未学完
+    "learned": (FLAG_LEARNED, True),  # 已学完
+    "reviewed": (FLAG_LEARNED | FLAG_REVIEWED, True),  # 已学完且已复习
+    "tested": (FLAG_TESTED, True),  # 已测试
+    "untested": (FLAG_TESTED, False),  # 未测试
+}
+
+
+class WordColumns:
+    """
+    列式单词存储：词条文本按列保存在 list 中，学习状态保存在紧凑数组中
+    (stage、attempts 为整数数组，learned/reviewed/tested 合并为一个标志字节)。
+    items 是与各列一一对应的 WordItem 视图。
+    status_rows 是各状态的行号集合，首次查询时由标志列建立，之后在标志位变化时增量维护，
+    按状态选词和计数时无需扫描整个词库。
+    复习计划 (scheduler.py) 保存在 ease (千分值)、interval (天)、due (Unix 秒) 三列中，
+    due_index 是已学完单词的到期时间索引，同样在首次查询时建立。
+    """
+    __slots__ = ("word", "definition", "pos", "example", "stage", "attempts", "flags", "ease", "interval", "due",
+                 "items", "tracker", "status_rows", "due_index")
+
+    def __init__(self):
+        self.word = []
+        self.definition = []
+        self.pos = []
+        self.example = []
+        self.stage = array("H")
+        self.attempts = array("I")
+        self.flags = array("B")
+        self.ease = array("H")
+        self.interval = array("I")
+        self.due = array("I")
+        self.items = []  # WordItem 视图，items[i] 对应第 i 行
+        self.tracker = None  # 状态变化回调 (由 VocabModel 设置)
+        self.status_rows = None  # 状态 -> 行号集合；None 表示尚未建立
+        self.due_index = None  # scheduler.DueIndex；None 表示尚未建立
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, word, definition="", pos="", example="", stage=1, attempts=0, flags=0, ease=DEFAULT_EASE_PERMILLE,
+            interval=0, due=0, item=None):
+        """追加一行并返回对应的 WordItem 视图 (传入 item 时把它绑定到这一行)。"""
+        self.word.append(word)
+        self.definition.append(definition)
+        self.pos.append(pos)
+        self.example.append(example)
+        self.stage.append(stage)
+        self.attempts.append(attempts)
+        self.flags.append(flags)
+        self.ease.append(ease)
+        self.interval.append(interval)
+        self.due.append(due)
+        if item is None:
+            item = object.__new__(WordItem)
+        item._store = self
+        item._index = len(self.items)
+        self.items.append(item)
+        if self.status_rows is not None:
+            for status, (mask, value) in STATUS_MASKS.items():
+                if _selector_table(mask, value)[flags]:
+                    self.status_rows[status].add(item._index)
+        if self.due_index is not None and flags & FLAG_LEARNED:
+            self.due_index.push(item._index)
+        return item
+
+    def set_state(self, index, stage, attempts, flags, ease=DEFAULT_EASE_PERMILLE, interval=0, due=0):
+        """直接写入一行的状态 (不触发变化回调)，用于批量加载进度。"""
+        self.stage[index] = stage
+        self.attempts[index] = attempts
+        self.ease[index] = ease
+        self.interval[index] = interval
+        self.set_due(index, due)
+        self.set_flags(index, flags)
+
+    def set_due(self, index, due):
+        """写入一行的下次复习时间，并同步更新到期时间索引。"""
+        if self.due[index] == due:
+            return
+        self.due[index] = due
+        if self.due_index is not None and self.flags[index] & FLAG_LEARNED:
+            self.due_index.push(index)
+
+    def set_flags(self, index, flags):
+        """写入一行的标志字节，并同步更新状态行号集合。"""
+        old = self.flags[index]
+        if old == flags:
+            return
+        self.flags[index] = flags
+        if self.status_rows is not None:
+            for status, (mask, value) in STATUS_MASKS.items():
+                table = _selector_table(mask, value)
+                if table[old] != table[flags]:
+                    if table[flags]:
+                        self.status_rows[status].add(index)
+                    else:
+                        self.status_rows[status].discard(index)
+        if self.due_index is not None and flags & FLAG_LEARNED and not old & FLAG_LEARNED:
+            self.due_index.push(index)
+
+    def rows_with_status(self, status):
+        """返回处于指定状态的行号集合 (调用方不得修改)；首次调用时一次性建立所有状态的集合。"""
+        if self.status_rows is None:
+            rows = range(len(self.items))
+            self.status_rows = {s: set(compress(rows, self.flag_selector(mask, value)))
+                                for s, (mask, value) in STATUS_MASKS.items()}
+        return self.status_rows[status]
+
+    def earliest_due(self, count, until=None):
+        """已学完的单词中最早到期的最多 count 个行号 (见 scheduler.DueIndex.earliest)。"""
+        if self.due_index is None:
+            self.due_index = scheduler.DueIndex(self, FLAG_LEARNED)
+        return self.due_index.earliest(count, until)
+
+    def flag_selector(self, mask, value=True):
+        """
+        返回每行一个字节的 0/1 选择串，可用于 itertools.compress：
+        value 为 True 时 mask 中的标志位全部置位的行为 1，为 False 时全部未置位的行为 1。
+        """
+        return self.flags.tobytes().translate(_selector_table(mask, value))
+
+
+def _text_property(column, doc):
+    def fget(self):
+        return getattr(self._store, column)[self._index]
+
+    def fset(self, value):
+        getattr(self._store, column)[self._index] = value
+
+    return property(fget, fset, doc=doc)
+
+
+def _int_property(column, doc):
+    def fget(self):
+        return getattr(self._store, column)[self._index]
+
+    def fset(self, value):
+        store = self._store
+        values = getattr(store, column)
+        value = int(value)
+        if values[self._index] != value:
+            values[self._index] = value
+            if store.tracker is not None:
+                store.tracker(self, column)
+
+    return property(fget, fset, doc=doc)
+
+
+def _flag_property(name, bit, doc):
+    def fget(self):
+        return bool(self._store.flags[self._index] & bit)
+
+    def fset(self, value):
+        store = self._store
+        old = store.flags[self._index]
+        new = old | bit if value else old & ~bit
+        if new != old:
+            store.set_flags(self._index, new)
+            if store.tracker is not None:
+                store.tracker(self, name)
+
+    return property(fget, fset, doc=doc)
+
+
+def _ease_property(doc):
+    # 列中保存千分值，属性读写实际的难度系数 (例如 2.5)
+    def fget(self):
+        return self._store.ease[self._index] / 1000
+
+    def fset(self, value):
+        store = self._store
+        value = min(int(round(float(value) * 1000)), 0xFFFF)
+        if store.ease[self._index] != value:
+            store.ease[self._index] = value
+            if store.tracker is not None:
+                store.tracker(self, "ease")
+
+    return property(fget, fset, doc=doc)
+
+
+def _due_property(doc):
+    def fget(self):
+        return self._store.due[self._index]
+
+    def fset(self, value):
+        store = self._store
+        value = int(value)
+        if store.due[self._index] != value:
+            store.set_due(self._index, value)
+            if store.tracker is not None:
+                store.tracker(self, "due")
+
+    return property(fget, fset, doc=doc)
 
 
-@dataclass
 class WordItem:
     """
-    单词数据结构：使用 dataclass 简化定义，存储单词的全部状态和信息。
+    单词数据结构：WordColumns 中一行的轻量视图 (只有所属存储和行号两个槽位)，
+    通过属性读写单词的全部状态和信息。修改状态字段时会通知所属的 VocabModel，用于只保存变化的单词。
     """
-    word: str
-    definition: str = ""  # 释义
-    pos: str = ""  # 词性
-    example: str = ""  # 例句
-    stage: int = 1  # 学习阶段 (1: 选择题, 2: 自测, 3: 拼写)
-    learned: bool = False  # 是否已完成学习 (通过 Stage 3 拼写)
-    attempts: int = 0  # 尝试次数 (用于统计和调整难度)
-    reviewed: bool = False  # 是否已在复习模式中复习过
-    tested: bool = False  # 是否已在测试模式中测试过
+    __slots__ = ("_store", "_index")
+
+    word = _text_property("word", "单词")
+    definition = _text_property("definition", "释义")
+    pos = _text_property("pos", "词性")
+    example = _text_property("example", "例句")
+    stage = _int_property("stage", "学习阶段 (1: 选择题, 2: 自测, 3: 拼写)")
+    learned = _flag_property("learned", FLAG_LEARNED, "是否已完成学习 (通过 Stage 3 拼写)")
+    attempts = _int_property("attempts", "尝试次数 (用于统计和调整难度)")
+    reviewed = _flag_property("reviewed", FLAG_REVIEWED, "是否已在复习模式中复习过")
+    tested = _flag_property("tested", FLAG_TESTED, "是否已在测试模式中测试过")
+    ease = _ease_property("复习计划的难度系数 (SM-2 ease factor)")
+    interval = _int_property("interval", "复习间隔 (天)，0 表示尚未通过复习或刚刚遗忘")
+    due = _due_property("下次复习时间 (Unix 秒)，0 表示尚未排复习计划")
+
+    def __init__(self, word, definition="", pos="", example="", stage=1, learned=False, attempts=0,
+                 reviewed=False, tested=False, ease=scheduler.DEFAULT_EASE, interval=0, due=0):
+        # 单独创建的单词使用自己的单行存储，赋值给 VocabModel.words 时会被并入模型的列式存储
+        WordColumns().add(word, definition, pos, example, int(stage), int(attempts),
+                          pack_word_flags(learned, reviewed, tested), int(round(float(ease) * 1000)),
+                          int(interval), int(due), item=self)
+
+    def __repr__(self):
+        return (f"WordItem(word={self.word!r}, definition={self.definition!r}, pos={self.pos!r}, "
+                f"example={self.example!r}, stage={self.stage!r}, learned={self.learned!r}, "
+                f"attempts={self.attempts!r}, reviewed={self.reviewed!r}, tested={self.tested!r}, "
+                f"ease={self.ease!r}, interval={self.interval!r}, due={self.due!r})")
+
+    @property
+    def flags(self):
+        """learned / reviewed / tested 合并后的标志字节。"""
+        return self._store.flags[self._index]
+
+    @staticmethod
+    def from_entry(word, definition="", pos="", example=""):
+        """创建默认状态的 WordItem。批量加载词库时请使用 build_word_items，让所有单词共享一个存储。"""
+        return WordColumns().add(word, definition, pos, example)
 
     def to_dict(self):
         """将 WordItem 实例转换为字典，用于 JSON 序列化保存。"""
-        return asdict(self)
+        return {"word": self.word, "definition": self.definition, "pos": self.pos, "example": self.example,
+                "stage": self.stage, "learned": self.learned, "attempts": self.attempts,
+                "reviewed": self.reviewed, "tested": self.tested,
+                "ease": self.ease, "interval": self.interval, "due": self.due}
 
     @staticmethod
     def from_dict(d):
@@ -43,32 +341,290 @@ class WordItem:
             # 确保 learned, reviewed, tested 是布尔值
             learned=bool(d.get("learned", False)),
             reviewed=bool(d.get("reviewed", False)),
-            tested=bool(d.get("tested", False))
+            tested=bool(d.get("tested", False)),
+            # 旧版进度文件没有复习计划字段：使用默认难度系数，due 为 0 表示尚未排计划 (已学完的单词立即可复习)
+            ease=float(d.get("ease", scheduler.DEFAULT_EASE)),
+            interval=int(d.get("interval", 0)),
+            due=int(d.get("due", 0))
         )
         return item
 
 
+def pack_word_flags(learned, reviewed, tested):
+    """把 learned / reviewed / tested 合成列式存储中的标志字节。"""
+    return (FLAG_LEARNED if learned else 0) | (FLAG_REVIEWED if reviewed else 0) | (FLAG_TESTED if tested else 0)
+
+
+def build_word_items(entries) -> List[WordItem]:
+    """由 (word, definition, pos, example) 词条批量创建共享同一列式存储、状态为默认值的 WordItem。"""
+    columns = WordColumns()
+    add = columns.add
+    for e in entries:
+        add(*e)
+    return columns.items
+
+
+def fold_word(word) -> str:
+    """单词索引使用的键：去掉首尾空白并做大小写折叠。"""
+    return word.strip().casefold()
+
+
+def assign_word_ids(words) -> List[str]:
+    """
+    为单词分配稳定 id：首次出现的单词直接使用单词本身，
+    同一词库中重复出现的单词依次加上 "#2"、"#3" 后缀。
+    """
+    seen = {}
+    ids = []
+    for word in words:
+        n = seen.get(word, 0) + 1
+        seen[word] = n
+        ids.append(word if n == 1 else f"{word}#{n}")
+    return ids
+
+
+class WordDictionary:
+    """
+    只读词典：当前单词库的来源文件、文件内容摘要，以及按顺序排列的词条文本和稳定 id。
+    进度文件只按 id 保存学习状态，词条文本始终来自词库文件本身。
+    """
+
+    def __init__(self, path, digest, words: List[WordItem]):
+        self.path = path  # 词库文件 (data/last_words.json 或 data/last_words.csv)
+        self.digest = digest  # 词库文件内容的 sha1
+        self.entries = tuple((w.word, w.definition, w.pos, w.example) for w in words)
+        self.ids = assign_word_ids(e[0] for e in self.entries)
+
+    def build_words(self) -> List[WordItem]:
+        """按词典顺序创建一组状态为默认值的 WordItem。"""
+        return build_word_items(self.entries)
+
+
+def _file_digest(path):
+    """分块计算文件内容的 sha1 摘要。"""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def iter_json_array(fp, chunk_size=None):
+    """
+    逐个产出文件对象 fp 中 JSON 顶层数组的元素，每次只在内存中保留当前元素附近的文本。
+    根元素不是数组时抛出 ValueError，内容不完整或格式错误时抛出 json.JSONDecodeError。
+    """
+    chunk_size = chunk_size or STREAM_CHUNK_SIZE
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill(size):
+        # 丢弃已解析的部分，再读入新数据
+        nonlocal buf, pos, eof
+        data = fp.read(size)
+        if not data:
+            eof = True
+        buf = buf[pos:] + data
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill(chunk_size)
+
+    skip_whitespace()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("根元素不是列表")
+    pos += 1
+
+    first = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buf):
+            raise json.JSONDecodeError("数组未结束", buf, pos)
+        if buf[pos] == "]":
+            return
+        if not first:
+            if buf[pos] != ",":
+                raise json.JSONDecodeError("缺少逗号分隔符", buf, pos)
+            pos += 1
+            skip_whitespace()
+        first = False
+
+        read_size = chunk_size
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                # 只有看到后面的 "," 或 "]" 才能确认元素已读完整 (例如数字 "3.5e2" 可能被截断成 "3.5e")
+                nxt = end
+                while nxt < len(buf) and buf[nxt] in " \t\r\n":
+                    nxt += 1
+                if eof or (nxt < len(buf) and buf[nxt] in ",]"):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # 元素跨越了缓冲区边界：继续读入，单个元素很大时逐步加大读取量
+            fill(read_size)
+            read_size *= 2
+        pos = end
+        yield obj
+
+
 class VocabModel:
     """
     词汇数据模型：管理单词列表、文件路径、设置以及数据的加载和保存。
     """
 
     def __init__(self):
+        # 自上次保存以来状态发生变化的单词：id(WordItem) -> (WordItem, 变化的字段集合)
+        self._dirty = {}
+        self._tracker = self._track_change  # 绑定到单词列式存储上的变化回调
+        self._columns = None  # self.words 所在的列式存储 (WordColumns)
+        # 不区分大小写的单词索引：fold_word(单词) -> WordItem，词库中重复出现的单词对应按出现顺序排列的列表
+        self._word_index = {}
+        self._distractor_pool = None  # 选择题干扰项池 (DistractorPool)
+        self._distractor_pool_for = None  # 干扰项池是基于哪个 words 列表建立的
+        self._confusable_tree = None  # 形近词索引 (BKTree，键为 fold_word 后的单词)
+        self._confusable_tree_for = None  # 形近词索引是基于哪个 words 列表建立的
+        self._learn_sampler = None  # 待学单词的加权抽样树 (FenwickSampler)，按行号保存权重
+        self._learn_sampler_for = None  # (words 列表, 权重设置)，任一变化时重建
         self.words: List[WordItem] = []  # 存储 WordItem 对象的列表
         self.current_wordlist_name = "未加载"  # 用于跟踪当前加载的词库文件名
+        # load_all_data 使用的加载途径：progress / last_words / local_default / network / database / failed
+        self.startup_source = None
 
         # 文件路径配置
         self.last_words_path = os.path.join("data", "last_words.csv")  # 最近一次导入的 CSV 文件的拷贝路径
         # 新增一个路径来保存上次导入的 JSON 文件名，以便下次启动时尝试加载
         self.last_json_path = os.path.join("data", "last_words.json")
-        self.progress_path = os.path.join("data", "progress.json")  # 学习进度保存路径
+        self.progress_path = os.path.join("data", "progress.bin")  # 学习进度保存路径 (二进制快照)
+        # 旧版本保存的 JSON 进度文件：没有 progress.bin 时读取一次，之后的快照都写入 progress.bin
+        self.json_progress_path = os.path.join("data", "progress.json")
         self.settings_path = os.path.join("data", "settings.json")  # 应用设置保存路径
+        # 进度增量日志：每次答题只追加一条小记录，定期再合并回进度快照
+        self.journal_path = os.path.join("data", "progress.journal")
 
         # 默认设置
-        self.settings = {"learn_count": 10, "review_count": 15, "test_count": 20}
+        self.settings = {"learn_count": 10, "review_count": 15, "test_count": 20,
+                         "journal_checkpoint_every": 200, "async_save": True, "save_delay_ms": 300,
+                         "hard_distractors": False, "learn_weighted": True, "learn_weight_attempts": 1,
+                         "learn_weight_stage": 1, "library_codec": "gzip", "progress_codec": "gzip"}
+
+        self._journal_epoch = ""  # 当前快照对应的日志批次，日志只回放到同一批次的快照上
+        self._journal_count = 0  # 自上次合并以来追加的日志记录数
+        self._journal_words = None  # 日志批次对应的 words 列表，词库被替换后必须先写完整快照
+        self._journal_name = None  # 快照中保存的词库名称，名称变化时同样需要写完整快照
+
+        # 后台保存：答题线程只登记待写内容，由 SaveWorker 合并后写入磁盘
+        self._save_worker = None
+        self._pending_lock = threading.Lock()  # 保护下面两个待写字段
+        self._pending_journal = []  # 尚未写入的增量日志行 (在快照之后写入)
+        self._pending_snapshot = None  # 尚未写入的完整快照 (_capture_snapshot 取出的数据)
+        self._io_lock = threading.Lock()  # 保证同一时刻只有一个线程写进度文件
+
+        self.dictionary = None  # 当前单词库对应的只读词典 (WordDictionary)
+        self._dictionary_words = None  # dictionary 对应的 words 列表
+        self._loaded_fingerprint = None  # 内存数据对应的进度文件指纹，未变化时 load_progress 直接跳过
+        self._last_words_digest = None  # 上次同步到 last_words.csv 的词库内容摘要
 
         self.load_settings()  # 应用启动时，自动加载用户上次保存的设置
 
+    @property
+    def words(self) -> List[WordItem]:
+        return self._words
+
+    @words.setter
+    def words(self, items: List[WordItem]):
+        """
+        替换单词列表：把单词并入同一个列式存储 (已经按顺序共享一个存储时直接沿用)，
+        挂上变化回调，并清空旧列表的变化记录。
+        """
+        columns = items[0]._store if items else WordColumns()
+        if len(columns) != len(items) or any(w._store is not columns or w._index != i for i, w in enumerate(items)):
+            # 单词来自不同的存储 (例如逐个创建或从多个列表拼接)：复制到新的存储，WordItem 对象保持不变
+            columns = WordColumns()
+            for w in items:
+                store, i = w._store, w._index
+                columns.add(w.word, w.definition, w.pos, w.example, w.stage, w.attempts, w.flags,
+                            store.ease[i], store.interval[i], store.due[i], item=w)
+
+        old = getattr(self, "_columns", None)
+        if old is not None and old is not columns:
+            old.tracker = None
+        columns.tracker = self._tracker
+        self._columns = columns
+        self._words = items
+        self._word_index = self._build_word_index(columns)
+        self._dirty.clear()
+
+    @staticmethod
+    def _build_word_index(columns):
+        """建立 fold_word(单词) -> WordItem 的索引；重复的单词保存为列表，保持在词库中的先后顺序。"""
+        index = {}
+        for word, item in zip(columns.word, columns.items):
+            key = fold_word(word)
+            found = index.get(key)
+            if found is None:
+                index[key] = item
+            elif isinstance(found, list):
+                found.append(item)
+            else:
+                index[key] = [found, item]
+        return index
+
+    def find_words(self, word) -> List[WordItem]:
+        """按单词查找 (不区分大小写，忽略首尾空白)，返回所有同名的 WordItem；找不到时返回空列表。"""
+        found = self._word_index.get(fold_word(word))
+        if found is None:
+            return []
+        return list(found) if isinstance(found, list) else [found]
+
+    def find_word(self, word, definition=None, prefer=None):
+        """
+        按单词查找 (不区分大小写)，返回对应的 WordItem，找不到时返回 None。
+        同一单词在词库中出现多次时：候选中包含 prefer 本身则返回它；
+        否则传入 definition 可选中释义相同的那一个；都不满足时返回第一个。
+        """
+        found = self._word_index.get(fold_word(word))
+        if not isinstance(found, list):
+            return found
+        if prefer is not None and any(w is prefer for w in found):
+            return prefer
+        if definition is not None:
+            for w in found:
+                if w.definition == definition:
+                    return w
+        return found[0]
+
+    def _track_change(self, item, name):
+        """WordItem 状态字段被修改时调用，记录变化的单词和字段。"""
+        entry = self._dirty.get(id(item))
+        if entry is None:
+            self._dirty[id(item)] = (item, {name})
+        else:
+            entry[1].add(name)
+        if self._learn_sampler is not None and name in ("stage", "attempts", "learned") \
+                and self._learn_sampler_for[0] is self.words:
+            self._learn_sampler.update(item._index, self._learn_weight(item.stage, item.attempts, item.flags))
+
+    def _take_changes(self, changed=None):
+        """
+        取出并清空自上次保存以来的变化：返回 [(WordItem, 变化字段集合), ...]。
+        显式传入的 changed 单词视为全部状态字段都已变化。
+        """
+        changes = dict(self._dirty)
+        self._dirty.clear()
+        for w in changed or ():
+            changes[id(w)] = (w, set(STATE_FIELDS))
+        return list(changes.values())
+
     # =============== 设置相关 ===============
     def save_settings(self):
         """将当前设置保存到 settings.json 文件。"""
@@ -87,13 +643,141 @@ class VocabModel:
 
     # =============== 单词库相关 - 基于文件路径 ===============
 
+    def _parse_wordlist(self, content: str, kind: str) -> List[WordItem]:
+        """
+        解析内存中的词库内容 (kind 为 "json" 或 "csv")，返回 WordItem 列表。
+        解析结果按内容摘要和解析器版本缓存在 data/cache 中，内容未变化时直接读取缓存。
+        """
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        if kind == "json":
+            return self._cached_parse(digest, kind, lambda: self._parse_json_content(content))
+        return self._cached_parse(digest, kind, lambda: self._parse_csv_content(content))
+
+    def parse_wordlist_file(self, path: str, filename=None) -> List[WordItem]:
+        """
+        解析词库文件但不替换当前单词，用于校验下载的词库。按 filename (默认为 path) 的扩展名区分 JSON / CSV。
+        解析结果同样写入解析缓存，之后导入该文件时直接命中缓存。
+        """
+        kind = "json" if (filename or path).lower().endswith(".json") else "csv"
+        return self._parse_wordlist_file(path, kind)
+
+    def _parse_wordlist_file(self, path: str, kind: str, digest=None) -> List[WordItem]:
+        """
+        流式解析词库文件，不把整个文件读入内存 (压缩的文件同样流式解压)；同样优先使用解析缓存。
+        """
+        digest = digest or _file_digest(path)
+
+        def parse():
+            # 压缩存储的文件 (storage_codec) 边解压边解析
+            if kind == "json":
+                with storage_codec.open_text(path) as f:
+                    return self._parse_json_stream(f)
+            with storage_codec.open_text(path, newline="") as f:
+                return self._parse_csv_rows(csv.reader(f))
+
+        return self._cached_parse(digest, kind, parse)
+
+    def _cached_parse(self, digest, kind, parse) -> List[WordItem]:
+        """按内容摘要读取解析缓存；未命中时调用 parse() 解析并写入缓存。"""
+        start = time.perf_counter()
+        key = wordlist_cache.cache_key(digest, kind, PARSER_VERSION)
+        entries = wordlist_cache.load(key)
+        if entries is not None:
+            words = build_word_items(entries)
+            print(f"词库缓存命中: {len(words)} 个单词，用时 {(time.perf_counter() - start) * 1000:.1f} ms")
+            return words
+
+        words = parse()
+        if words:
+            try:
+                wordlist_cache.store(key, [(w.word, w.definition, w.pos, w.example) for w in words])
+            except OSError as e:
+                print(f"写入词库缓存失败: {e}")
+        print(f"词库缓存未命中: 解析 {len(words)} 个单词，用时 {(time.perf_counter() - start) * 1000:.1f} ms")
+        return words
+
+    def cache_parsed_wordlist(self, path, entries, filename=None):
+        """
+        把已知的词条 [(word, definition, pos, example), ...] 记为词库文件 path 的解析结果 (写入解析缓存)，
+        之后导入该文件时直接命中缓存。用于内容已解析过、但文件字节发生变化的情况 (压缩存储、增量更新)。
+        返回文件内容的摘要。
+        """
+        kind = "json" if (filename or path).lower().endswith(".json") else "csv"
+        digest = _file_digest(path)
+        try:
+            wordlist_cache.store(wordlist_cache.cache_key(digest, kind, PARSER_VERSION), entries)
+        except OSError as e:
+            print(f"写入词库缓存失败: {e}")
+        return digest
+
+    def _copy_wordlist(self, path, target, digest):
+        """
+        把导入的词库文件 path (摘要为 digest) 复制为 data 目录中的词库备份 target，返回备份的摘要。
+        压缩存储的文件 (本地词库库) 解压为普通文本，备份始终可以直接打开；解压后的解析结果写入解析缓存。
+        """
+        if storage_codec.file_codec(path) == storage_codec.NONE:
+            shutil.copy(path, target)
+            return digest
+        storage_codec.decompress_file(path, target)
+        return self.cache_parsed_wordlist(target, [(w.word, w.definition, w.pos, w.example) for w in self.words],
+                                          target)
+
+    @staticmethod
+    def _entry_from_json(item):
+        """把 JSON 词库中的一个元素转换为 (word, definition, pos, example) 词条；缺少单词或释义时返回 None。"""
+        word = item.get('word', '').strip()
+        translations = item.get('translations', [])
+
+        if not word or not translations:
+            return None
+
+        definition_parts = []
+        pos_parts = []
+        for t in translations:
+            part_of_speech = t.get('type', 'n/a')
+            translation = t.get('translation', '')
+
+            if translation:
+                definition_parts.append(translation)
+                if part_of_speech != 'n/a':
+                    pos_parts.append(part_of_speech)
+
+        pos = ", ".join(sorted(list(set(pos_parts))))
+        definition = "; ".join(definition_parts)
+
+        return word, definition, pos, ""
+
+    def _parse_json_stream(self, fp) -> List[WordItem]:
+        """
+        从 JSON 文件对象逐个元素解析单词列表，内存中只保留当前元素和已生成的 WordItem。
+        结果与 _parse_json_content 相同。
+        """
+        columns = WordColumns()
+        try:
+            for item in iter_json_array(fp):
+                entry = self._entry_from_json(item)
+                if entry is not None:
+                    columns.add(*entry)
+            return columns.items
+
+        except ValueError as e:
+            # json.JSONDecodeError 也是 ValueError 的子类
+            if isinstance(e, json.JSONDecodeError):
+                print(f"解析 JSON 内容时发生错误: {e}")
+            else:
+                print("JSON 内容格式错误: 根元素不是列表。")
+            return []
+        except Exception as e:
+            print(f"处理 JSON 单词数据时发生未知错误: {e}")
+            return []
+
     # **新增辅助函数：从 JSON 字符串内容解析并加载单词**
     def _parse_json_content(self, content: str) -> List[WordItem]:
         """
         从 JSON 字符串内容解析单词列表。
         返回解析出的 WordItem 列表。
         """
-        words_list = []
+        columns = WordColumns()
         try:
             data = json.loads(content)
 
@@ -102,33 +786,10 @@ class VocabModel:
                 return []
 
             for item in data:
-                word = item.get('word', '').strip()
-                translations = item.get('translations', [])
-
-                if not word or not translations:
-                    continue
-
-                definition_parts = []
-                pos_parts = []
-                for t in translations:
-                    part_of_speech = t.get('type', 'n/a')
-                    translation = t.get('translation', '')
-
-                    if translation:
-                        definition_parts.append(translation)
-                        if part_of_speech != 'n/a':
-                            pos_parts.append(part_of_speech)
-
-                pos = ", ".join(sorted(list(set(pos_parts))))
-                definition = "; ".join(definition_parts)
-
-                words_list.append(WordItem(
-                    word=word,
-                    definition=definition,
-                    pos=pos,
-                    example=""
-                ))
-            return words_list
+                entry = self._entry_from_json(item)
+                if entry is not None:
+                    columns.add(*entry)
+            return columns.items
 
         except json.JSONDecodeError as e:
             print(f"解析 JSON 内容时发生错误: {e}")
@@ -143,18 +804,20 @@ class VocabModel:
         从 CSV 字符串内容解析单词列表。
         返回解析出的 WordItem 列表。
         """
-        words_list = []
+        # 使用 StringIO 将字符串内容模拟成文件
+        return self._parse_csv_rows(csv.reader(StringIO(content)))
+
+    def _parse_csv_rows(self, reader) -> List[WordItem]:
+        """从 csv.reader 逐行解析单词列表 (可直接读取文件，无需先读入全部内容)。"""
+        columns = WordColumns()
         try:
-            # 使用 StringIO 将字符串内容模拟成文件
-            f = StringIO(content)
-            reader = csv.reader(f)
-            rows = list(reader)
-            start = 0
-            # 尝试识别是否有表头，如果有 '单词' 或 'word' 字段，则跳过第一行
-            if rows and any('单词' in c or 'word' in c.lower() for c in rows[0]):
-                start = 1
-
-            for row in rows[start:]:
+            first = True
+            for row in reader:
+                # 尝试识别是否有表头，如果有 '单词' 或 'word' 字段，则跳过第一行
+                if first:
+                    first = False
+                    if any('单词' in c or 'word' in c.lower() for c in row):
+                        continue
                 if not row: continue
                 # 单词在第 0 列 词性在第 1 列，释义在第 2 列，例句在第 3 列
                 w = row[0].strip()
@@ -164,8 +827,8 @@ class VocabModel:
 
                 if w:
                     # 创建新的 WordItem 实例 (所有状态都将是默认值)
-                    words_list.append(WordItem(word=w, definition=d, pos=pos, example=ex))
-            return words_list
+                    columns.add(w, d, pos, ex)
+            return columns.items
 
         except Exception as e:
             print(f"解析 CSV 内容时发生错误: {e}")
@@ -176,7 +839,7 @@ class VocabModel:
         """
         从 JSON 字符串内容加载单词，替换现有数据。用于网络下载导入。
         """
-        self.words = self._parse_json_content(content)
+        self.words = self._parse_wordlist(content, "json")
 
         # 成功加载后，将内容保存到 last_json_path 作为持久化备份
         if self.words:
@@ -186,6 +849,7 @@ class VocabModel:
             # 清理 CSV 备份
             if os.path.exists(self.last_words_path):
                 os.remove(self.last_words_path)
+            self._set_dictionary(self.last_json_path)
             print(f"成功从 JSON 内容加载 {len(self.words)} 个单词。")
             return self.words
         return []
@@ -195,7 +859,7 @@ class VocabModel:
         """
         从 CSV 字符串内容加载单词，替换现有数据。用于网络下载导入。
         """
-        self.words = self._parse_csv_content(content)
+        self.words = self._parse_wordlist(content, "csv")
 
         # 成功加载后，将内容保存到 last_words_path 作为持久化备份
         if self.words:
@@ -205,10 +869,67 @@ class VocabModel:
             # 清理 JSON 备份
             if os.path.exists(self.last_json_path):
                 os.remove(self.last_json_path)
+            self._set_dictionary(self.last_words_path)
             print(f"成功从 CSV 内容加载 {len(self.words)} 个单词。")
             return self.words
         return []
 
+    def load_words_from_download(self, path: str, filename: str) -> List[WordItem]:
+        """
+        导入下载到临时文件 path 的词库 (filename 为远程文件名，用于判断格式)，替换现有数据。
+        流式解析临时文件，成功后把它原子地移动为 data 目录中的词库备份 (临时文件应位于 data 目录)；
+        解析失败时保留原有词库和备份，临时文件由调用方删除。
+        """
+        kind = "json" if filename.lower().endswith(".json") else "csv"
+        digest = _file_digest(path)
+        words = self._parse_wordlist_file(path, kind, digest)
+        if not words:
+            return []
+
+        self.words = words
+        target, other = ((self.last_json_path, self.last_words_path) if kind == "json"
+                         else (self.last_words_path, self.last_json_path))
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        os.replace(path, target)
+        if os.path.exists(other):
+            os.remove(other)
+        self._set_dictionary(target, digest)
+        print(f"成功从下载的文件加载 {len(self.words)} 个单词。")
+        return self.words
+
+    def update_wordlist(self, path: str) -> List[WordItem]:
+        """
+        把当前词库替换为同一词库的新版本 path (例如增量更新后的词库库文件)，按单词 id 保留学习进度：
+        新版本中仍存在的单词沿用原来的状态，新增的单词为默认状态，已删除的单词丢弃。
+        增量更新时已把新版本的词条写入解析缓存，这里不需要重新解析文件。之后由调用方保存进度。
+        """
+        kind = "json" if path.lower().endswith(".json") else "csv"
+        digest = _file_digest(path)
+        words = self._parse_wordlist_file(path, kind, digest)
+        if not words:
+            return []
+
+        if self.words:
+            positions = {wid: i for i, wid in enumerate(self._ensure_dictionary(self.words).ids)}
+            old, new = self._columns, words[0]._store
+            for i, wid in enumerate(assign_word_ids(w.word for w in words)):
+                j = positions.get(wid)
+                if j is not None:
+                    new.set_state(i, old.stage[j], old.attempts[j], old.flags[j], old.ease[j], old.interval[j],
+                                  old.due[j])
+
+        self.words = words
+        target, other = ((self.last_json_path, self.last_words_path) if kind == "json"
+                         else (self.last_words_path, self.last_json_path))
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        if os.path.abspath(path) != os.path.abspath(target):
+            digest = self._copy_wordlist(path, target, digest)
+        if os.path.exists(other):
+            os.remove(other)
+        self._set_dictionary(target, digest)
+        print(f"词库已更新为新版本: {len(self.words)} 个单词。")
+        return self.words
+
     # 从 json 文件加载单词
     def load_words_from_json(self, path: str) -> List[WordItem]:
         """
@@ -221,20 +942,20 @@ class VocabModel:
         print(f"尝试从 JSON 文件加载: {path}")
 
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            self.words = self._parse_json_content(content)
+            # 流式解析，不把整个文件读入内存；未压缩的文件复制到 data 目录后内容不变，摘要可直接复用
+            digest = _file_digest(path)
+            self.words = self._parse_wordlist_file(path, "json", digest)
 
             # 成功加载后，执行文件复制和名称更新
             if self.words:
                 os.makedirs("data", exist_ok=True)
                 # 复制导入的文件到 data 目录，作为下次启动的默认词库
                 if os.path.abspath(path) != os.path.abspath(self.last_json_path):
-                    shutil.copy(path, self.last_json_path)
+                    digest = self._copy_wordlist(path, self.last_json_path, digest)
                 # 移除上次导入的 CSV 文件的记录，以 JSON 为准
                 if os.path.exists(self.last_words_path):
                     os.remove(self.last_words_path)
+                self._set_dictionary(self.last_json_path, digest)
 
                 # 成功加载后，更新词库名称
                 self.current_wordlist_name = os.path.basename(path)
@@ -259,10 +980,9 @@ class VocabModel:
         print(f"尝试从 CSV 文件加载: {path}")
 
         try:
-            with open(path, newline='', encoding='utf-8') as f:
-                content = f.read()
-
-            self.words = self._parse_csv_content(content)
+            # 流式解析，不把整个文件读入内存；未压缩的文件复制到 data 目录后内容不变，摘要可直接复用
+            digest = _file_digest(path)
+            self.words = self._parse_wordlist_file(path, "csv", digest)
 
             # 成功加载后，执行文件复制和名称更新
             if self.words:
@@ -272,7 +992,8 @@ class VocabModel:
                     # 移除上次导入的 JSON 文件的记录，以 CSV 为准
                     if os.path.exists(self.last_json_path):
                         os.remove(self.last_json_path)
-                    shutil.copy(path, self.last_words_path)
+                    digest = self._copy_wordlist(path, self.last_words_path, digest)
+                self._set_dictionary(self.last_words_path, digest)
 
                 # 成功加载后，更新词库名称
                 self.current_wordlist_name = os.path.basename(path)
@@ -296,44 +1017,304 @@ class VocabModel:
         return []
 
     # =============== 学习进度相关 ===============
-    def save_progress(self, path=None):
+    def save_progress(self, path=None, changed=None):
         """
-        将当前单词列表的所有状态 (stage, learned, attempts 等) 保存到 JSON 文件。
-        如果 path 为 None，则保存到默认路径。
+        将当前单词列表的所有状态 (stage, learned, attempts 等) 保存到进度文件。
+        如果 path 为 None，则保存到默认路径 (二进制快照)；其他路径导出为 JSON 文件。
+        保存到默认路径时只向增量日志追加自上次保存以来变化的字段 (由 WordItem 自动记录，
+        也可通过 changed 显式指定单词)，不再重写整个快照；
+        词库被替换或词库名称变化时才写完整快照。
+        保存到默认路径时由后台线程合并写入 (设置项 async_save)，调用会立即返回；
+        要写入的日志记录和快照数据都在调用线程中取出，后台线程不读取 words 和列式存储。
         """
         # 确保保存路径有效，如果传入 None 则使用默认路径
         path = path or self.progress_path
 
+        if path != self.progress_path:
+            # 导出到其他文件：同步写出完整快照
+            self._write_snapshot(path)
+            return
+
+        changes = self._take_changes(changed)
+        with self._pending_lock:
+            snapshot = True
+            if (self._journal_epoch and self._journal_words is self.words
+                    and self._journal_name == self.current_wordlist_name
+                    and (self._pending_snapshot is not None or os.path.exists(path))):
+                if not changes:
+                    return
+                # 在当前线程记下变化，后台线程只负责写文件
+                lines = self._journal_lines(changes)
+                checkpoint_every = int(self.settings.get("journal_checkpoint_every", 200))
+                snapshot = self._journal_count + len(self._pending_journal) + len(lines) >= checkpoint_every
+                if not snapshot:
+                    self._pending_journal.extend(lines)
+            if snapshot:
+                # 日志过长或词库已替换：写完整快照，快照已包含之前所有待写的日志
+                self._pending_snapshot = self._capture_snapshot()
+                self._pending_journal = []
+                words, meta = self._pending_snapshot[:2]
+                # 之后的变化记入新批次的日志，在快照写入后追加
+                self._journal_epoch = meta["journal_epoch"]
+                self._journal_words = words
+                self._journal_name = meta["current_wordlist_name"]
+
+        if self.settings.get("async_save", True):
+            self._get_save_worker().notify()
+        else:
+            self._persist()
+
+    def flush(self):
+        """等待后台保存线程写完所有未保存的修改。窗口关闭和程序退出时调用。"""
+        if self._save_worker is not None:
+            self._save_worker.flush()
+
+    def checkpoint(self):
+        """将增量日志合并进进度快照，并清空日志。应用退出时调用。"""
+        self.flush()
+        with self._io_lock:
+            if self._journal_count == 0:
+                return
+            self._write_snapshot(self.progress_path)
+
+    def save_stats(self):
+        """返回后台保存的统计信息 (通知次数、实际写入次数、写入耗时等)。"""
+        if self._save_worker is None:
+            return {"notifications": 0, "saves": 0, "coalesced": 0, "errors": 0,
+                    "last_ms": 0.0, "max_ms": 0.0, "avg_ms": 0.0}
+        return self._save_worker.stats()
+
+    def _get_save_worker(self):
+        """首次异步保存时才启动后台保存线程。"""
+        if self._save_worker is None:
+            delay = int(self.settings.get("save_delay_ms", 300)) / 1000
+            self._save_worker = SaveWorker(self._persist, delay)
+        return self._save_worker
+
+    def _persist(self):
+        """
+        把待保存的修改写入磁盘 (可在后台线程中执行)：有待写的快照时先写快照，再追加之后记下的增量日志。
+        只使用 save_progress 在调用线程中取出的数据。
+        """
+        with self._io_lock:
+            with self._pending_lock:
+                snapshot = self._pending_snapshot
+                lines = self._pending_journal
+                self._pending_snapshot = None
+                self._pending_journal = []
+
+            if snapshot is not None:
+                self._write_snapshot(self.progress_path, snapshot)
+
+            if lines:
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                self._journal_count += len(lines)
+                # 日志是由内存数据写出的，内存依然是最新的
+                self._loaded_fingerprint = self._progress_fingerprint()
+
+    def _write_snapshot(self, path, snapshot=None):
+        """
+        完整写出进度快照 (先写临时文件再替换)。
+        默认路径写二进制快照 (progress_snapshot)：只包含非默认状态单词的定长记录，同时开启新的日志批次，
+        并按设置项 progress_codec 压缩 (storage_codec)；snapshot 为 _capture_snapshot 取出的数据，
+        默认在当前线程中取出。
+        其他路径 (导出) 写包含全部词条的完整格式，便于在其他设备上直接导入。
+        """
+        if path != self.progress_path:
+            data = {
+                "words": [w.to_dict() for w in self.words],  # 序列化单词列表
+                "settings": dict(self.settings),  # 附带保存当前设置，便于兼容和恢复
+                "current_wordlist_name": self.current_wordlist_name,  # 保存当前词库名称
+            }
+            _atomic_write(path, json.dumps(data, ensure_ascii=False, indent=2))
+            return
+
+        words, meta, records, ids = snapshot or self._capture_snapshot()
         # 如果是默认路径，确保 data 目录存在
-        if path == self.progress_path:
-            os.makedirs("data", exist_ok=True)
+        os.makedirs("data", exist_ok=True)
+        codec = meta["settings"].get("progress_codec", storage_codec.NONE)
+        _atomic_write_bytes(path, storage_codec.compress(progress_snapshot.dumps(meta, records, ids), codec))
+
+        # 快照已包含全部状态，旧日志作废
+        self._start_journal(meta["journal_epoch"], words, meta["current_wordlist_name"])
+        self._loaded_fingerprint = self._progress_fingerprint()
 
-        data = {
-            "words": [w.to_dict() for w in self.words],  # 序列化单词列表
-            "settings": self.settings,  # 附带保存当前设置，便于兼容和恢复
-            "current_wordlist_name": self.current_wordlist_name  # 保存当前词库名称
+    def _capture_snapshot(self):
+        """
+        取出写二进制快照所需的数据 (words, meta, records, ids)：各单词的状态记录、词典信息和设置的副本。
+        在修改单词的线程中调用，之后写文件时不再读取 words、列式存储和词典。
+        """
+        words = self.words
+        dictionary = self._ensure_dictionary(words)
+        records = []
+        ids = []
+        columns = self._columns
+        for i, (wid, w) in enumerate(zip(dictionary.ids, words)):
+            # 只保存状态不是默认值的单词
+            stage, attempts, flags = w.stage, w.attempts, w.flags
+            ease, interval, due = columns.ease[i], columns.interval[i], columns.due[i]
+            if stage != 1 or attempts or flags or due or interval or ease != DEFAULT_EASE_PERMILLE:
+                records.append((i, stage, attempts, flags, ease, interval, due))
+                ids.append(wid)
+        meta = {
+            "dictionary": {"path": dictionary.path, "sha1": dictionary.digest, "count": len(words)},
+            "current_wordlist_name": self.current_wordlist_name,
+            "settings": dict(self.settings),
+            "journal_epoch": uuid.uuid4().hex,
         }
+        return words, meta, records, ids
+
+    def _set_dictionary(self, path, digest=None):
+        """以词库文件 path 作为当前 words 的只读词典。"""
+        self.dictionary = WordDictionary(path, digest or _file_digest(path), self.words)
+        self._dictionary_words = self.words
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def _ensure_dictionary(self, words):
+        """
+        返回 words 对应的词典。words 不是从词库文件加载的 (例如旧版进度文件中的单词)，
+        则先把词条导出到 last_words.csv 作为词典文件。
+        """
+        if self.dictionary is None or self._dictionary_words is not words:
+            self._sync_last_words(words)
+        return self.dictionary
+
+    def _load_dictionary(self, info):
+        """
+        按紧凑进度文件中记录的词典信息读取词库文件，返回默认状态的 WordItem 列表。
+        同一词库文件在本次运行中只解析一次。
+        """
+        path = info.get("path", "")
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError(f"进度文件对应的词库文件未找到: {path}")
+        digest = _file_digest(path)
+        if digest != info.get("sha1"):
+            print(f"词库文件 {path} 已发生变化，将按单词匹配恢复学习状态。")
+
+        if self.dictionary is not None and self.dictionary.path == path and self.dictionary.digest == digest:
+            return self.dictionary, self.dictionary.build_words()
+
+        kind = "json" if path.lower().endswith(".json") else "csv"
+        words = self._parse_wordlist_file(path, kind, digest)
+        return WordDictionary(path, digest, words), words
+
+    def _start_journal(self, epoch, words, name):
+        """以给定批次号重新开始一个空的增量日志。"""
+        _atomic_write(self.journal_path, json.dumps({"epoch": epoch}) + "\n")
+        self._journal_epoch = epoch
+        self._journal_count = 0
+        self._journal_words = words
+        self._journal_name = name
+
+    def _word_position(self, item):
+        """返回 item 在 self.words 中的下标 (即在列式存储中的行号)；不属于当前单词列表时返回 None。"""
+        if item._store is self._columns:
+            return item._index
+        return None
+
+    def _journal_lines(self, changes):
+        """生成增量日志记录：每行一个 JSON，包含下标、单词和发生变化的状态字段。"""
+        lines = []
+        for w, names in changes:
+            i = self._word_position(w)
+            if i is None:
+                continue
+            rec = {"i": i, "w": w.word}
+            for name in names:
+                rec[name] = getattr(w, name)
+            lines.append(json.dumps(rec, ensure_ascii=False))
+        return lines
+
+    def _replay_journal(self, epoch):
+        """把与快照同批次的增量日志回放到 self.words 上。"""
+        self._journal_epoch = epoch
+        self._journal_count = 0
+        self._journal_words = self.words
+        self._journal_name = self.current_wordlist_name
+        if not epoch or not os.path.exists(self.journal_path):
+            return
+
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except json.JSONDecodeError:
+            header = {}
+        if header.get("epoch") != epoch:
+            # 日志属于另一份快照 (例如写快照后未来得及清空日志)，直接丢弃
+            return
+
+        for line in lines[1:]:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                # 最后一行可能因异常退出而只写了一半，忽略即可
+                continue
+            i = rec.get("i", -1)
+            word = rec.get("w", "")
+            if 0 <= i < len(self.words) and self.words[i].word == word:
+                w = self.words[i]
+            else:
+                # 下标对不上 (例如词库文件在两次启动之间有增删)：单词在词库中唯一时按单词索引找回
+                matches = [m for m in self.find_words(word) if m.word == word]
+                w = matches[0] if len(matches) == 1 else None
+            if w is not None:
+                for name in STATE_FIELDS:
+                    if name in rec:
+                        setattr(w, name, rec[name])
+            self._journal_count += 1
 
     def load_progress(self, path=None):
         """
-        从 progress.json 文件加载单词状态和进度。
+        从进度文件加载单词状态和进度 (二进制快照或 JSON 格式，按文件内容自动识别)。
         如果 path 为 None，则从默认路径加载。
         """
         path = path or self.progress_path
+        # 先等待后台保存完成，避免读到比内存更旧的进度
+        self.flush()
         if not os.path.exists(path):
             return []
 
+        # 默认进度文件自上次加载/保存后没有被外部修改：内存中的数据就是最新的，无需重新解析
+        if path == self.progress_path and self.words and self._progress_fingerprint() == self._loaded_fingerprint:
+            return self.words
+
         # 检查文件是否存在，如果不存在则引发异常，由调用方处理
         if not os.path.exists(path):
             raise FileNotFoundError(f"进度文件未找到: {path}")
 
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if isinstance(data, list):
+        with open(path, "rb") as f:
+            raw = storage_codec.decompress(f.read())  # 按设置压缩存储的快照
+
+        compact = False
+        if progress_snapshot.is_snapshot(raw):
+            # 二进制快照：词条来自词库文件，一次读入后按定长记录恢复状态
+            snapshot = progress_snapshot.loads(raw)
+            data = snapshot.meta
+            dictionary, words = self._load_dictionary(data.get("dictionary", {}))
+            self._apply_snapshot(snapshot, dictionary, words)
+            compact = True
+        else:
+            data = json.loads(raw.decode("utf-8"))
+            if isinstance(data, dict) and "state" in data:
+                # 旧版紧凑 JSON 格式：进度文件只保存按单词 id 索引的状态
+                dictionary, words = self._load_dictionary(data.get("dictionary", {}))
+                columns = data.get("columns", list(STATE_FIELDS))
+                state = data.get("state", {})
+                for wid, w in zip(dictionary.ids, words):
+                    row = state.get(wid)
+                    if row:
+                        for name, value in zip(columns, row):
+                            setattr(w, name, bool(value) if name in BOOL_FIELDS else int(value))
+                compact = True
+
+        if compact:
+            self.words = words
+            self.dictionary = dictionary
+            self._dictionary_words = words
+            self.settings.update(data.get("settings", {}))
+            self.current_wordlist_name = data.get("current_wordlist_name", "来自进度文件")
+        elif isinstance(data, list):
             # 兼容旧版本只保存 list 的情况
             self.words = [WordItem.from_dict(d) for d in data]
         else:
@@ -344,52 +1325,293 @@ class VocabModel:
             # 新增：加载词库名称
             self.current_wordlist_name = data.get("current_wordlist_name", "来自进度文件")
 
-        # 兼容旧版本进度文件，确保每个 WordItem 都有 reviewed 和 tested 属性
-        for w in self.words:
-            if not hasattr(w, "reviewed"):
-                w.reviewed = False
-            if not hasattr(w, "tested"):
-                w.tested = False
+        # 默认进度文件 (包括旧版 progress.json) 需要回放增量日志，得到最新状态
+        if path in (self.progress_path, self.json_progress_path):
+            epoch = data.get("journal_epoch", "") if isinstance(data, dict) else ""
+            self._replay_journal(epoch)
+            # 回放产生的修改已经在磁盘上，不需要再次保存
+            self._dirty.clear()
 
-        # 保持词库同步：将加载的进度文件中的单词库内容同步到 last_words.csv 或 last_words.json
-        if self.words:
+        # 旧版进度文件自带词条：同步到 last_words.csv，作为之后紧凑进度文件的词典
+        if self.words and not compact:
+            self._sync_last_words()
+
+        if path == self.progress_path:
+            self._loaded_fingerprint = self._progress_fingerprint()
+        return self.words
+
+    def _apply_snapshot(self, snapshot, dictionary, words):
+        """把二进制快照中的定长状态记录写回 words (words 尚未绑定变化回调，直接写入列式存储)。"""
+        info = snapshot.meta.get("dictionary", {})
+        records = snapshot.records
+        if dictionary.digest == info.get("sha1") and len(words) == info.get("count"):
+            # 词库文件未变化：记录中的下标直接对应 words
+            targets = (words[r[0]] for r in records)
+        else:
+            # 词库文件已变化：按单词 id 匹配，新词库中已不存在的单词忽略
+            positions = {wid: i for i, wid in enumerate(dictionary.ids)}
+            targets = (words[positions[wid]] if wid in positions else None for wid in snapshot.ids())
+
+        # 快照与列式存储的标志位取值相同，标志字节可直接写入
+        for w, (_, stage, attempts, flags, ease, interval, due) in zip(targets, records):
+            if w is not None:
+                w._store.set_state(w._index, stage, attempts, flags, ease, interval, due)
+
+    def _progress_fingerprint(self):
+        """默认进度文件及其增量日志的 (大小, 修改时间) 指纹，用于判断文件是否被外部修改。"""
+        fingerprint = []
+        for p in (self.progress_path, self.journal_path):
+            try:
+                st = os.stat(p)
+                fingerprint.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                fingerprint.append(None)
+        return tuple(fingerprint)
+
+    def _sync_last_words(self, words=None):
+        """
+        将单词库内容导出到 last_words.csv 并设为当前词典，同时移除 last_words.json。
+        只有词库内容 (单词、词性、释义、例句) 与上次同步时不同才会写文件。
+        """
+        words = self.words if words is None else words
+        buf = StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(["单词", "词性", "释义", "例句"])
+        for w in words:
+            writer.writerow([w.word, getattr(w, "pos", ""), getattr(w, "definition", ""), getattr(w, "example", "")])
+        content = buf.getvalue()
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+        if digest != self._last_words_digest:
             os.makedirs("data", exist_ok=True)
-            # 统一同步到 CSV 格式，方便下一次 load_all_data 的逻辑
-            with open(self.last_words_path, "w", encoding="utf-8", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow(["单词", "词性", "释义", "例句"])
-                for w in self.words:
-                    writer.writerow(
-                        [w.word, getattr(w, "pos", ""), getattr(w, "definition", ""), getattr(w, "example", "")])
+            # 统一同步到 CSV 格式，方便下一次 load_all_data 的逻辑；内容相同则不重写
+            existing = None
+            if os.path.exists(self.last_words_path):
+                with storage_codec.open_text(self.last_words_path, newline="") as f:
+                    existing = f.read()
+            if existing != content:
+                with open(self.last_words_path, "w", encoding="utf-8", newline="") as f:
+                    f.write(content)
 
             # 如果是成功加载了进度，就移除上次记录的 JSON 文件，避免冲突
             if os.path.exists(self.last_json_path):
                 os.remove(self.last_json_path)
+            self._last_words_digest = digest
 
-        return self.words
+        self.dictionary = WordDictionary(self.last_words_path, digest, words)
+        self._dictionary_words = words
 
     def get_stats(self):
         """获取学习统计数据。"""
         total = len(self.words)
         # 计算已学习 (learned=True) 的单词数量
-        learned = sum(1 for w in self.words if w.learned)
+        learned = self.count_words("learned")
         return learned, total
 
-    def load_all_data(self):
+    # =============== 单词筛选 ===============
+    def select_words(self, status):
+        """
+        返回指定状态的单词列表 (按词库顺序)。
+        status: "unlearned" (未学完) / "learned" (已学完) / "reviewed" (已学完且已复习) /
+                "tested" (已测试) / "untested" (未测试) / "all" (全部)
+        由增量维护的状态索引得到，耗时只与选中的单词数量有关。
+        """
+        if status == "all":
+            return list(self.words)
+        items = self._columns.items
+        return [items[i] for i in sorted(self._status_rows(status))]
+
+    def count_words(self, status):
+        """统计指定状态的单词数量 (状态取值同 select_words)，直接读取状态索引的大小。"""
+        if status == "all":
+            return len(self.words)
+        return len(self._status_rows(status))
+
+    def sample_words(self, status, count):
+        """
+        从指定状态的单词中随机抽取最多 count 个，返回的列表顺序是随机的。
+        候选按词库顺序排列后再抽取，同一随机种子得到的结果与状态索引的内部顺序无关。
+        """
+        if status == "all":
+            return random.sample(self.words, min(count, len(self.words)))
+        rows = sorted(self._status_rows(status))
+        items = self._columns.items
+        return [items[i] for i in random.sample(rows, min(count, len(rows)))]
+
+    def sample_learn_words(self, count) -> List[WordItem]:
+        """
+        抽取本次要学习的单词 (最多 count 个未学完的单词)。
+        设置项 learn_weighted 为 True 时按权重抽取：尝试次数越多、学习阶段越靠后的单词越容易被选中，
+        权重保存在树状数组中并随答题增量更新，抽取耗时为 O(count log n)；否则等概率随机抽取。
+        """
+        if not self.settings.get("learn_weighted", True):
+            return self.sample_words("unlearned", count)
+        items = self._columns.items
+        return [items[i] for i in self._get_learn_sampler().sample(count)]
+
+    def _learn_weight(self, stage, attempts, flags):
+        """单词的抽取权重：已学完为 0，否则为 (1 + 尝试次数 × a) × (1 + (阶段 - 1) × s)。"""
+        if flags & FLAG_LEARNED:
+            return 0
+        a = int(self.settings.get("learn_weight_attempts", 1))
+        s = int(self.settings.get("learn_weight_stage", 1))
+        return (1 + min(attempts, LEARN_WEIGHT_ATTEMPTS_CAP) * a) * (1 + (max(stage, 1) - 1) * s)
+
+    def _get_learn_sampler(self):
+        """当前单词列表的加权抽样树；单词列表或权重设置变化后首次使用时重建。"""
+        key = (int(self.settings.get("learn_weight_attempts", 1)), int(self.settings.get("learn_weight_stage", 1)))
+        if self._learn_sampler_for is None or self._learn_sampler_for[0] is not self.words \
+                or self._learn_sampler_for[1] != key:
+            columns = self._columns
+            weight = self._learn_weight
+            self._learn_sampler = FenwickSampler(
+                weight(stage, attempts, flags)
+                for stage, attempts, flags in zip(columns.stage, columns.attempts, columns.flags))
+            self._learn_sampler_for = (self.words, key)
+        return self._learn_sampler
+
+    # =============== 复习计划 ===============
+    def due_words(self, count, now=None, ahead=False) -> List[WordItem]:
+        """
+        返回已学完的单词中到期 (due <= now) 的最多 count 个，按到期时间从早到晚排列；
+        从未排过复习计划的单词 (due 为 0) 视为最早到期。
+        ahead 为 True 时不限制到期时间，用于没有到期单词时提前复习。
+        由到期时间索引取出，耗时为 O(count log n)。
+        """
+        now = int(time.time() if now is None else now)
+        items = self._columns.items
+        return [items[i] for i in self._columns.earliest_due(count, None if ahead else now)]
+
+    def review_word(self, item, quality, now=None):
+        """按回答质量 (0-5，见 scheduler.QUALITY_*) 更新单词的复习计划 (SM-2)。"""
+        scheduler.review(item, quality, now)
+
+    def _status_rows(self, status):
+        """当前单词列表中处于 status 状态的行号集合。"""
+        if status not in STATUS_MASKS:
+            raise ValueError(f"未知的单词状态: {status}")
+        return self._columns.rows_with_status(status)
+
+    def distractor_pool(self) -> DistractorPool:
+        """当前单词列表的选择题干扰项池；单词列表被替换后首次使用时重建。"""
+        if self._distractor_pool_for is not self.words:
+            self._distractor_pool = DistractorPool(self.words)
+            self._distractor_pool_for = self.words
+        return self._distractor_pool
+
+    def sample_distractors(self, item, count=3, hard=False):
+        """
+        为 item 的词义选择题抽取最多 count 个干扰项 (选项文本)，优先与 item 词性相同的释义。
+        hard 为 True 时先使用拼写相近的形近词的释义 (affect / effect)，不够时再从干扰项池补齐。
+        同一单词在词库中其他词条的释义不会作为干扰项。
+        """
+        exclude = [option_text(w) for w in self.find_words(item.word)]
+        picked = []
+        if hard:
+            answer = option_text(item)
+            for w in self.confusable_words(item.word, count * 2):
+                text = option_text(w)
+                if w.definition and text != answer and text not in exclude and text not in picked:
+                    picked.append(text)
+            del picked[count:]
+        if len(picked) < count:
+            picked += self.distractor_pool().sample(item, count - len(picked), exclude + picked)
+        return picked
+
+    def confusable_tree(self) -> BKTree:
+        """当前单词列表的形近词索引 (BK 树)；单词列表被替换后首次使用时重建。"""
+        if self._confusable_tree_for is not self.words:
+            self._confusable_tree = BKTree(self._word_index)
+            self._confusable_tree_for = self.words
+        return self._confusable_tree
+
+    def confusable_words(self, word, count=3, max_distance=2) -> List[WordItem]:
+        """
+        词库中与 word 拼写相近 (编辑距离不超过 max_distance) 的其他单词，按编辑距离从近到远排列，最多 count 个。
+        先只查找距离 1 的单词，不够时才放宽距离，查找范围越小 BK 树剪枝越多。
+        """
+        key = fold_word(word)
+        tree = self.confusable_tree()
+        found = []
+        for distance in range(1, max_distance + 1):
+            found = [w for d, w in sorted(tree.search(key, distance)) if d > 0]
+            if len(found) >= count:
+                break
+        return [self.find_words(w)[0] for w in found[:count]]
+
+    def confusable_positions(self, word):
+        """word 中与最相近的形近词不同的字母位置，填空题挖去这些字母；没有形近词时返回空列表。"""
+        key = fold_word(word)
+        others = [fold_word(w.word) for w in self.confusable_words(word, 1)]
+        if not others or len(key) != len(word):
+            return []
+        return differing_positions(key, others)
+
+    def check_indexes(self):
+        """
+        一致性检查：用一次全表扫描 (逐个读取 WordItem 属性) 校验状态索引、计数、到期时间索引、抽取权重和单词索引。
+        返回发现的问题描述列表，全部一致时返回空列表。
+        """
+        problems = []
+        words = self.words
+        columns = self._columns
+        if len(columns) != len(words) or any(w._store is not columns or w._index != i for i, w in enumerate(words)):
+            problems.append("单词列表与列式存储的行不一致")
+            return problems
+
+        expected = {
+            "unlearned": {i for i, w in enumerate(words) if not w.learned},
+            "learned": {i for i, w in enumerate(words) if w.learned},
+            "reviewed": {i for i, w in enumerate(words) if w.learned and w.reviewed},
+            "tested": {i for i, w in enumerate(words) if w.tested},
+            "untested": {i for i, w in enumerate(words) if not w.tested},
+        }
+        for status, rows in expected.items():
+            indexed = self._status_rows(status)
+            if indexed != rows:
+                problems.append(f"状态 {status} 的索引与全表扫描不一致: 多出 {len(indexed - rows)} 个，"
+                                f"缺少 {len(rows - indexed)} 个")
+            if self.count_words(status) != len(rows):
+                problems.append(f"状态 {status} 的计数为 {self.count_words(status)}，全表扫描为 {len(rows)}")
+
+        due_order = [i for _, i in sorted((columns.due[i], i) for i in expected["learned"])]
+        if [w._index for w in self.due_words(len(due_order), ahead=True)] != due_order:
+            problems.append("到期时间索引与全表扫描不一致")
+
+        if self._learn_sampler is not None and self._learn_sampler_for[0] is words:
+            weights = [self._learn_weight(w.stage, w.attempts, w.flags) for w in words]
+            if any(self._learn_sampler.weight(i) != wt for i, wt in enumerate(weights)) \
+                    or self._learn_sampler.total != sum(weights):
+                problems.append("待学单词的抽取权重与全表扫描不一致")
+
+        index = self._build_word_index(columns)
+        if index.keys() != self._word_index.keys() or any(
+                self.find_words(k) != (v if isinstance(v, list) else [v]) for k, v in index.items()):
+            problems.append("单词索引与单词列表不一致")
+        return problems
+
+    def load_all_data(self, allow_network=True):
         """
         统一加载所有数据：尝试加载进度 -> 尝试加载上次词库 (JSON/CSV) -> 强制加载默认文件 (JSON/CSV)
-        此方法应在应用程序启动时调用。
+        -> 从网络下载默认词库。此方法应在应用程序启动时调用。
+        allow_network 为 False 时只使用本地数据，之后可以在后台调用 fetch_default_wordlist()。
+        实际使用的加载途径记录在 self.startup_source 中。
         """
         self.load_settings()
         self.current_wordlist_name = "未加载"  # 重置名称
 
-        # 1. 尝试加载进度文件 (包含词库和状态)
-        if os.path.exists(self.progress_path):
+        # 1. 尝试加载进度文件 (包含词库和状态)；还没有二进制快照时读取旧版 progress.json
+        progress_path = self.progress_path if os.path.exists(self.progress_path) else self.json_progress_path
+        if os.path.exists(progress_path):
             # load_progress 会更新 self.current_wordlist_name
             try:
-                self.load_progress(self.progress_path)
+                self.load_progress(progress_path)
                 if self.words:
                     print("Data loaded from progress file.")
+                    if progress_path != self.progress_path:
+                        # 旧版进度文件：立即写出二进制快照，之后都从快照加载
+                        self.save_progress()
+                    self.startup_source = "progress"
                     return True
             except Exception as e:
                 print(f"Error loading default progress file: {e}. Attempting next method.")
@@ -397,56 +1619,73 @@ class VocabModel:
         # 2. 尝试加载上次导入的词库文件 (JSON 或 CSV)
         if self.load_last_words():
             print("Data loaded from last used dictionary.")
+            self.startup_source = "last_words"
             return True
 
         # 3. 如果前面都没加载成功, 尝试加载默认文件
-        DEFAULT_JSON_PATH = "4-CET6-顺序.json"
-        default_csv_path = "六级.csv"
-        # 使用 raw.githubusercontent.com 获取原始文件内容
-        DEFAULT_CSV_URL = "https://raw.githubusercontent.com/Junpgle/LearnWord/master/%E8%AF%8D%E5%BA%93/%E5%85%AD%E7%BA%A7-%E4%B9%B1%E5%BA%8F.csv"
-
         # 3a. 尝试加载默认 JSON 文件
         if os.path.exists(DEFAULT_JSON_PATH):
             print(f"Loading default JSON dictionary locally: {DEFAULT_JSON_PATH}")
             # load_words_from_json 会更新 self.current_wordlist_name
             self.load_words_from_json(DEFAULT_JSON_PATH)
             if self.words:
+                self.startup_source = "local_default"
                 return True
 
         # 3b. 尝试加载默认 CSV 文件 (本地)
-        if os.path.exists(default_csv_path):
-            print(f"Loading default CSV dictionary locally: {default_csv_path}")
+        if os.path.exists(DEFAULT_CSV_PATH):
+            print(f"Loading default CSV dictionary locally: {DEFAULT_CSV_PATH}")
             # load_words_from_csv 会更新 self.current_wordlist_name
-            self.load_words_from_csv(default_csv_path)
+            self.load_words_from_csv(DEFAULT_CSV_PATH)
             if self.words:
+                self.startup_source = "local_default"
                 return True
 
         # 3c. 如果本地文件不存在或加载失败，尝试网络下载 CSV
-        if not self.words:
-            print(f"本地文件不存在,尝试从GitHub拉取默认词库")
-            try:
-                # 设置超时 10 秒
-                response = requests.get(DEFAULT_CSV_URL, timeout=10)
-                response.raise_for_status()  # 检查 HTTP 错误
+        if allow_network:
+            return self.fetch_default_wordlist()
 
-                # 成功下载，直接使用内容加载
-                content = response.text
+        self.startup_source = "failed"
+        return False
 
+    def fetch_default_wordlist(self):
+        """从 GitHub 下载默认词库 (CSV) 并导入；可在后台线程中调用。"""
+        print(f"本地文件不存在,尝试从GitHub拉取默认词库")
+        try:
+            # 流式下载到 data 目录的临时文件，再流式导入 (连接和读取超时 10 秒)
+            path = download_to_file(DEFAULT_CSV_URL, timeout=10)
+            try:
                 print(f"Download successful. Loading new dictionary from network content.")
-                # 使用新的 content 方法加载，并设置临时名称
-                self.load_words_from_csv_content(content)
+                self.load_words_from_download(path, DEFAULT_CSV_PATH)
+            finally:
+                if os.path.exists(path):
+                    os.remove(path)
+            if self.words:
                 self.current_wordlist_name = f"[下载] 六级.csv"
 
-            except requests.exceptions.RequestException as e:
-                # 网络连接或 HTTP 错误
-                print(f"Error downloading default dictionary: {e}")
-            except Exception as e:
-                # 其他文件操作错误
-                print(f"Error processing downloaded file: {e}")
+        except requests.exceptions.RequestException as e:
+            # 网络连接或 HTTP 错误
+            print(f"Error downloading default dictionary: {e}")
+        except Exception as e:
+            # 其他文件操作错误
+            print(f"Error processing downloaded file: {e}")
 
         if not self.words:
             print(f"Error: No words loaded. Could not load/download any default file.")
             self.current_wordlist_name = "加载失败"  # 最终失败状态
+            self.startup_source = "failed"
             return False
 
-        return True
\ No newline at end of file
+        self.startup_source = "network"
+        return True
+
+
+def create_model():
+    """
+    创建数据模型：data 目录中存在 SQLite 数据库时使用 SQLite 后端，
+    否则使用默认的进度文件 (data/progress.bin) 存储。
+    """
+    from sqlite_store import SQLiteVocabModel, DEFAULT_DB_PATH
+    if os.path.exists(DEFAULT_DB_PATH):
+        return SQLiteVocabModel(DEFAULT_DB_PATH)
+    return VocabModel()
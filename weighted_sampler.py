@@ -0,0 +1,79 @@
+import random
+
+
+class FenwickSampler:
+    """
+    按权重抽样的树状数组 (Fenwick tree)：每个下标对应一个非负整数权重。
+    修改单个权重和按权重抽取一个下标都是 O(log n)；不放回地抽取 k 个下标为 O(k log n)。
+    权重使用整数，反复增量修改后总和也不会产生浮点误差。
+    """
+
+    def __init__(self, weights=()):
+        self._weights = list(weights)
+        n = len(self._weights)
+        self._tree = [0] * (n + 1)
+        # O(n) 建树：每个节点把自己的部分和累加到父节点
+        for i, w in enumerate(self._weights, start=1):
+            self._tree[i] += w
+            parent = i + (i & -i)
+            if parent <= n:
+                self._tree[parent] += self._tree[i]
+        self._top = 1 << n.bit_length() if n else 0
+
+    def __len__(self):
+        return len(self._weights)
+
+    @property
+    def total(self):
+        """全部权重之和。"""
+        total = 0
+        i = len(self._weights)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def weight(self, index):
+        return self._weights[index]
+
+    def update(self, index, weight):
+        """把下标 index 的权重改为 weight。"""
+        delta = weight - self._weights[index]
+        if not delta:
+            return
+        self._weights[index] = weight
+        i = index + 1
+        n = len(self._weights)
+        while i <= n:
+            self._tree[i] += delta
+            i += i & -i
+
+    def find(self, target):
+        """返回前缀权重和首次超过 target 的下标 (0 <= target < total)。"""
+        pos = 0
+        step = self._top
+        n = len(self._weights)
+        while step:
+            nxt = pos + step
+            if nxt <= n and self._tree[nxt] <= target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return pos
+
+    def sample(self, k, rng=random):
+        """按权重不放回地抽取最多 k 个下标 (权重为 0 的下标不会被抽中)。"""
+        picked = []
+        removed = []
+        total = self.total
+        while len(picked) < k and total > 0:
+            index = self.find(rng.randrange(total))
+            weight = self._weights[index]
+            picked.append(index)
+            removed.append((index, weight))
+            # 暂时把抽中的下标权重置零，抽完后恢复
+            self.update(index, 0)
+            total -= weight
+        for index, weight in removed:
+            self.update(index, weight)
+        return picked
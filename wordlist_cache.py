@@ -0,0 +1,96 @@
+import os, struct
+from array import array
+
+# 缓存目录：每个解析过的词库内容对应一个 .wlc 文件
+CACHE_DIR = os.path.join("data", "cache")
+# 最多保留的缓存文件数量，超出时删除最久未使用的
+MAX_ENTRIES = 8
+
+# 文件格式：魔数 + 格式版本 + 词条数，随后是每个字符串的长度 (uint32，按字符计) 和全部字符串拼接后的 UTF-8 文本。
+# 每个词条固定 4 个字符串：单词、释义、词性、例句。
+MAGIC = b"LWWL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHI")
+FIELDS_PER_ENTRY = 4
+
+
+def cache_key(digest: str, kind: str, parser_version: int) -> str:
+    """由词库内容的 sha1 摘要、词库类型 (json/csv) 和解析器版本组成缓存键。"""
+    return f"{kind}-p{parser_version}-{digest}"
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key + ".wlc")
+
+
+def load(key):
+    """读取缓存的词条列表 [(word, definition, pos, example), ...]；缓存不存在或已损坏时返回 None。"""
+    path = _cache_path(key)
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+
+    try:
+        magic, version, count = HEADER.unpack_from(raw, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return None
+        n = count * FIELDS_PER_ENTRY
+        lengths = array("I")
+        lengths.frombytes(raw[HEADER.size:HEADER.size + n * lengths.itemsize])
+        text = raw[HEADER.size + n * lengths.itemsize:].decode("utf-8")
+    except (struct.error, ValueError, UnicodeDecodeError):
+        return None
+    if len(lengths) != n or sum(lengths) != len(text):
+        return None
+
+    strings = []
+    pos = 0
+    for length in lengths:
+        strings.append(text[pos:pos + length])
+        pos += length
+
+    # 更新访问时间，供清理时判断最近使用
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    it = iter(strings)
+    return list(zip(it, it, it, it))
+
+
+def store(key, entries):
+    """把词条列表写入缓存 (先写临时文件再替换)，并清理多余的旧缓存。"""
+    lengths = array("I")
+    parts = []
+    for entry in entries:
+        for s in entry:
+            lengths.append(len(s))
+            parts.append(s)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(key)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries)))
+        f.write(lengths.tobytes())
+        f.write("".join(parts).encode("utf-8"))
+    os.replace(tmp_path, path)
+    _prune()
+
+
+def _prune():
+    """只保留最近使用的 MAX_ENTRIES 个缓存文件。"""
+    try:
+        names = [n for n in os.listdir(CACHE_DIR) if n.endswith(".wlc")]
+    except OSError:
+        return
+    if len(names) <= MAX_ENTRIES:
+        return
+    paths = sorted((os.path.join(CACHE_DIR, n) for n in names), key=os.path.getmtime, reverse=True)
+    for p in paths[MAX_ENTRIES:]:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
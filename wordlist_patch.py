@@ -0,0 +1,139 @@
+import csv, hashlib, json
+from bisect import bisect_left
+from io import StringIO
+
+from vocab_model import assign_word_ids
+
+# 词库增量补丁：描述同一词库两个版本之间按单词 id (见 vocab_model.assign_word_ids) 的差异，
+# 作用于解析后的词条 (word, definition, pos, example)，应用时不需要重新解析词库文件。
+#
+# {"format": 1,
+#  "from": {"count": 旧版本词条数, "entries": 旧版本词条摘要},
+#  "to": {"count": 新版本词条数, "entries": 新版本词条摘要},
+#  "removed": [单词 id, ...],                            # 删除的词条 (包括移动了位置的词条)
+#  "changed": [[单词 id, 释义, 词性, 例句], ...],           # 位置不变、内容变化的词条
+#  "added": [[新版本中的下标, 单词, 释义, 词性, 例句], ...]}  # 新增的词条 (包括移动了位置的词条)
+# 发布时 (library.publish_patch) 还会在 from / to 中记录版本号，并写入词库名称 name。
+PATCH_FORMAT = 1
+
+
+class PatchError(ValueError):
+    """补丁格式错误，或与要应用的词库版本不一致。"""
+
+
+def entries_digest(entries):
+    """词条列表的 SHA-256 摘要，用于确认补丁应用前后的内容。"""
+    data = json.dumps([list(e) for e in entries], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _longest_increasing(seq):
+    """返回 seq 中一个最长严格递增子序列的下标集合 (O(n log n))。"""
+    tails = []  # tails[k]：长度为 k + 1 的递增子序列的最小结尾值
+    tail_index = []  # 对应结尾在 seq 中的下标
+    previous = [-1] * len(seq)
+    for i, value in enumerate(seq):
+        k = bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[k] = value
+            tail_index[k] = i
+        previous[i] = tail_index[k - 1] if k else -1
+    keep = set()
+    i = tail_index[-1] if tail_index else -1
+    while i >= 0:
+        keep.add(i)
+        i = previous[i]
+    return keep
+
+
+def make_patch(old_entries, new_entries):
+    """
+    生成把 old_entries 变为 new_entries 的补丁。两个版本都有的单词 id 中，保持相对顺序的最长子序列原地保留
+    (内容变化时记为 changed)，其余的记为先删除再新增。
+    """
+    old_entries = [tuple(e) for e in old_entries]
+    new_entries = [tuple(e) for e in new_entries]
+    old_ids = assign_word_ids(e[0] for e in old_entries)
+    new_ids = assign_word_ids(e[0] for e in new_entries)
+    new_positions = {wid: i for i, wid in enumerate(new_ids)}
+
+    common = [wid for wid in old_ids if wid in new_positions]
+    kept = {common[i] for i in _longest_increasing([new_positions[wid] for wid in common])}
+
+    changed = []
+    for wid, entry in zip(old_ids, old_entries):
+        if wid in kept:
+            new_entry = new_entries[new_positions[wid]]
+            if new_entry != entry:
+                changed.append([wid, *new_entry[1:]])
+    return {
+        "format": PATCH_FORMAT,
+        "from": {"count": len(old_entries), "entries": entries_digest(old_entries)},
+        "to": {"count": len(new_entries), "entries": entries_digest(new_entries)},
+        "removed": [wid for wid in old_ids if wid not in kept],
+        "changed": changed,
+        "added": [[i, *new_entries[i]] for i, wid in enumerate(new_ids) if wid not in kept],
+    }
+
+
+def apply_patch(entries, patch):
+    """
+    把补丁应用到词条列表 entries，返回新版本的词条列表 (不修改 entries)。
+    entries 与补丁的旧版本不一致、补丁格式错误或应用结果与新版本的摘要不一致时抛出 PatchError。
+    """
+    if not isinstance(patch, dict) or patch.get("format") != PATCH_FORMAT:
+        raise PatchError("不支持的补丁格式")
+    entries = [tuple(e) for e in entries]
+    source, target = patch.get("from", {}), patch.get("to", {})
+    if len(entries) != source.get("count") or entries_digest(entries) != source.get("entries"):
+        raise PatchError("补丁与本地词库的版本不一致")
+
+    try:
+        removed = set(patch.get("removed", ()))
+        changed = {c[0]: tuple(c[1:]) for c in patch.get("changed", ())}
+        added = sorted((a[0], tuple(a[1:])) for a in patch.get("added", ()))
+    except (TypeError, IndexError) as e:
+        raise PatchError(f"补丁格式错误: {e}")
+
+    kept = []
+    for wid, entry in zip(assign_word_ids(e[0] for e in entries), entries):
+        if wid in removed:
+            continue
+        fields = changed.get(wid)
+        kept.append((entry[0], *fields) if fields else entry)
+
+    # 按新版本中的下标把新增的词条插入保留的词条之间
+    result = []
+    rest = iter(kept)
+    for index, entry in added:
+        while len(result) < index:
+            item = next(rest, None)
+            if item is None:
+                break
+            result.append(item)
+        result.append(entry)
+    result.extend(rest)
+
+    if len(result) != target.get("count") or entries_digest(result) != target.get("entries"):
+        raise PatchError("应用补丁后的词库与发布的版本不一致")
+    return result
+
+
+def dump_wordlist(entries, kind):
+    """
+    把词条列表写成 kind ("json" 或 "csv") 格式的词库文件内容 (bytes)。
+    按 VocabModel 的解析规则重新解析后得到相同的词条：JSON 每个单词一条释义 (type 为词性)，CSV 带表头。
+    """
+    if kind == "json":
+        items = [{"word": word, "translations": [{"translation": definition, "type": pos}]}
+                 for word, definition, pos, _ in entries]
+        return json.dumps(items, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    buf = StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["单词", "词性", "释义", "例句"])
+    for word, definition, pos, example in entries:
+        writer.writerow([word, pos, definition, example])
+    return buf.getvalue().encode("utf-8")